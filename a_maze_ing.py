@@ -3,16 +3,36 @@
 import sys
 from mazegen import MazeGenerator
 
+OPTIONS = ("--stats", "--headless", "--distances")
+
+
+def print_stats(maze_generator: MazeGenerator) -> None:
+    """Print statistics of the generated maze."""
+    from mazegen.stats import canvas_stats, format_stats
+
+    print(format_stats(canvas_stats(maze_generator.canvas)))
+
 
 if __name__ == "__main__":
     """Run main program."""
 
-    if len(sys.argv) != 2:
+    options = sys.argv[2:]
+    if (len(sys.argv) < 2 or sys.argv[1].startswith("--")
+            or any(option not in OPTIONS for option in options)
+            or len(set(options)) != len(options)):
         print("Wrong command format\n"
-              "Usage: python3 a_maze_ing.py <config_file>")
+              "Usage: python3 a_maze_ing.py <config_file> "
+              "[--stats] [--headless] [--distances]")
         sys.exit(0)
+    show_stats = "--stats" in options
+    headless = "--headless" in options
+    distances = "--distances" in options
 
-    maze_generator = MazeGenerator(sys.argv[1])
+    try:
+        maze_generator = MazeGenerator(sys.argv[1])
+    except ValueError as e:
+        print(f"{e}. Exiting.")
+        sys.exit(0)
 
     try:
         maze_generator.set_canvas()
@@ -20,30 +40,42 @@ if __name__ == "__main__":
         print(e)
         sys.exit(0)
 
-    maze_generator.set_renderer()
-    maze_generator.generate_maze()
+    if not headless:
+        maze_generator.set_renderer()
+        if maze_generator.renderer:
+            maze_generator.renderer.install_signal_handlers()
+    try:
+        maze_generator.generate_maze()
+    except ValueError as e:
+        print(e)
+        sys.exit(0)
     maze_generator.solve_maze()
-    maze_generator.fill_output()
+    maze_generator.fill_output(distances)
 
     try:
         if maze_generator.renderer:
             while True:
                 renderer = maze_generator.renderer
                 renderer.render_maze()
-                if not maze_generator.is_size_suitable_ft():
+                if (not maze_generator.stencil
+                        and not maze_generator.is_size_suitable_ft()):
                     print("\n'42' pattern was omitted due to "
                           "the limited maze size.")
+                if show_stats:
+                    print()
+                    print_stats(maze_generator)
                 print("\n=== A-Maze-ing ===")
                 print("1. Re-generate a new maze")
                 print("2. Show/Hide path from entry to exit")
                 print("3. Rotate maze colors")
-                print("4. Quit")
-                choice = input("Choice? (1-4): ")
+                print("4. Scroll the maze")
+                print("5. Quit")
+                choice = input("Choice? (1-5): ")
 
                 if choice == "1":
                     maze_generator.regenerate_maze()
                     maze_generator.solve_maze()
-                    maze_generator.fill_output()
+                    maze_generator.fill_output(distances)
                     renderer.path_animated = False
                 elif choice == "2":
                     renderer.show_path = not renderer.show_path
@@ -54,11 +86,16 @@ if __name__ == "__main__":
                         (renderer.color_index + 1) % len(renderer.wall_colors)
                     )
                 elif choice == "4":
+                    renderer.browse()
+                elif choice == "5":
                     print("Bye!")
                     sys.exit(0)
-        if not maze_generator.is_size_suitable_ft():
+        if (not maze_generator.stencil
+                and not maze_generator.is_size_suitable_ft()):
             print("'42' pattern was omitted due to "
                   "the limited maze size.")
+        if show_stats:
+            print_stats(maze_generator)
         print("No renderer was set. The generated data was stored "
               "in specified output file.")
     except Exception as e:
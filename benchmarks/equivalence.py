@@ -0,0 +1,297 @@
+"""Check that the optimized backends build exactly the reference mazes.
+
+Runs random (size, seed, perfect, algorithm) cases through the
+reference implementation (cell objects, Python generators and the
+object BFS) and through each alternate backend, then compares the
+output file encodings byte for byte. A failing case is shrunk to the
+smallest maze that still fails. Backends:
+
+- packed: packed-grid kernels in plain Python;
+- numpy: packed grid, NumPy BFS whatever the maze size;
+- numba: packed grid, Numba carve kernel whatever the maze size;
+- checkpoint: reference steps, interrupted halfway and resumed from a
+  checkpoint file.
+
+Backends whose optional module is missing are skipped.
+
+Usage: python3 benchmarks/equivalence.py [--cases N] [--max-size N]
+    [--backends packed,numpy,...] [--workers N] [--seed N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator, NamedTuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__
+))))
+
+from mazegen import accel  # noqa: E402
+from mazegen.algorithms import lookup  # noqa: E402
+from mazegen.checkpoint import checkpointed  # noqa: E402
+from mazegen.maze_generator import MazeGenerator  # noqa: E402
+from mazegen.maze_io import to_hex  # noqa: E402
+
+ALGORITHMS = ("dfs", "hunt_and_kill")
+DISABLED = 2 ** 62
+
+
+class Case(NamedTuple):
+    """One generation to compare."""
+    width: int
+    height: int
+    seed: int
+    perfect: bool
+    algorithm: str
+
+    def __str__(self) -> str:
+        return (f"{self.width}x{self.height} seed={self.seed} "
+                f"perfect={self.perfect} algorithm={self.algorithm}")
+
+
+class Result(NamedTuple):
+    """Outcome of a case: time per backend and failing backends."""
+    case: Case
+    seconds: dict[str, float]
+    failed: list[str]
+
+
+def generator(case: Case) -> MazeGenerator:
+    """Create a generator for a case, with the canvas set."""
+    maze = MazeGenerator(config={
+        "WIDTH": case.width, "HEIGHT": case.height, "ENTRY": (0, 0),
+        "EXIT": (case.width - 1, case.height - 1), "PERFECT": case.perfect,
+        "BRAID": None, "SEED": case.seed, "ALGORITHM": case.algorithm,
+        "OUTPUT_FILE": None,
+    })
+    maze.set_canvas()
+    return maze
+
+
+def encode(maze: MazeGenerator) -> str:
+    """Generate and solve, then encode like ``fill_output``."""
+    maze.generate_maze()
+    maze.solve_maze()
+    return to_hex(maze.canvas)
+
+
+def use_accel(enabled: bool, numba: bool = False, numpy: bool = False) -> None:
+    """Select the kernels ``accel`` uses in this process."""
+    accel.enabled = enabled
+    accel.NUMBA_MIN_CELLS = 0 if numba else DISABLED
+    accel.NUMPY_MIN_CELLS = 0 if numpy else DISABLED
+
+
+def reference(case: Case) -> str:
+    """Build a maze with the object-based implementation."""
+    use_accel(False)
+    return encode(generator(case))
+
+
+def packed(case: Case) -> str:
+    """Build a maze with the plain Python packed-grid kernels."""
+    use_accel(True)
+    return encode(generator(case))
+
+
+def numpy(case: Case) -> str:
+    """Build a maze with the NumPy BFS."""
+    use_accel(True, numpy=True)
+    return encode(generator(case))
+
+
+def numba(case: Case) -> str:
+    """Build a maze with the Numba carve kernel."""
+    use_accel(True, numba=True)
+    return encode(generator(case))
+
+
+def checkpoint(case: Case) -> str:
+    """Build a maze interrupted halfway and resumed from a checkpoint."""
+    use_accel(False)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "maze.ckpt")
+        maze = generator(case)
+        every = max(1, case.width * case.height // 2)
+        x, y = maze.entry
+        steps = checkpointed(
+            maze.canvas, lookup(case.algorithm),
+            maze.canvas.cells[y * case.width + x], maze.rng, path,
+            case.seed, every
+        )
+        # Stop right after the first checkpoint was saved.
+        for count, _ in enumerate(steps):
+            if count > every:
+                break
+        steps.close()
+
+        resumed = generator(case)
+        resumed.checkpoint = path
+        return encode(resumed)
+
+
+BACKENDS: dict[str, Callable[[Case], str]] = {
+    "packed": packed,
+    "numpy": numpy,
+    "numba": numba,
+    "checkpoint": checkpoint,
+}
+REQUIRES = {"numpy": "numpy", "numba": "numba"}
+
+
+def run(case: Case, backends: list[str]) -> Result:
+    """Build a case with the reference and every backend, in a worker.
+
+    Returns:
+        Seconds spent per backend, 'reference' included, and the
+        backends whose encoding differs from the reference.
+    """
+    seconds: dict[str, float] = {}
+    outputs: dict[str, str] = {}
+    for name in ["reference"] + backends:
+        build = reference if name == "reference" else BACKENDS[name]
+        start = time.perf_counter()
+        outputs[name] = build(case)
+        seconds[name] = time.perf_counter() - start
+    failed = [
+        name for name in backends if outputs[name] != outputs["reference"]
+    ]
+    return Result(case, seconds, failed)
+
+
+def fails(case: Case, backend: str) -> bool:
+    """Check whether a backend differs from the reference on a case."""
+    return BACKENDS[backend](case) != reference(case)
+
+
+def smaller(case: Case) -> Iterator[Case]:
+    """Candidate cases with a smaller maze, largest cut first."""
+    sizes = [
+        (case.width // 2, case.height), (case.width, case.height // 2),
+        (case.width - 1, case.height), (case.width, case.height - 1),
+    ]
+    for width, height in sizes:
+        if width >= 1 and height >= 1 and width * height >= 2:
+            yield case._replace(width=width, height=height)
+
+
+def shrink(case: Case, backend: str) -> Case:
+    """Reduce a failing case to a smallest maze that still fails."""
+    shrunk = True
+    while shrunk:
+        shrunk = False
+        for candidate in smaller(case):
+            if fails(candidate, backend):
+                case = candidate
+                shrunk = True
+                break
+    return case
+
+
+def first_difference(expected: str, actual: str) -> str:
+    """Describe the first line where two encodings differ."""
+    pairs = zip(expected.splitlines(), actual.splitlines())
+    for line, (left, right) in enumerate(pairs, start=1):
+        if left != right:
+            return f"line {line}: {left!r} != {right!r}"
+    return "different number of lines"
+
+
+def warm_up(backends: list[str]) -> None:
+    """Load every backend once so compile time is not measured."""
+    case = Case(9, 7, 0, False, "dfs")
+    for name in backends:
+        BACKENDS[name](case)
+
+
+def cases(count: int, max_size: int, seed: int) -> Iterator[Case]:
+    """Draw random cases."""
+    rng = random.Random(seed)
+    drawn = 0
+    while drawn < count:
+        width = rng.randint(1, max_size)
+        height = rng.randint(1, max_size)
+        if width * height < 2:
+            continue
+        drawn += 1
+        yield Case(
+            width, height, rng.randrange(2 ** 31), rng.random() < 0.5,
+            rng.choice(ALGORITHMS)
+        )
+
+
+def main() -> None:
+    """Compare the backends and print mismatches and speedups."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=2000,
+                        help="number of random cases")
+    parser.add_argument("--max-size", type=int, default=40,
+                        help="largest maze side")
+    parser.add_argument("--backends", default=",".join(BACKENDS),
+                        help="comma separated backends to compare")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the case generator")
+    args = parser.parse_args()
+
+    backends: list[str] = []
+    for name in args.backends.split(","):
+        if name not in BACKENDS:
+            sys.exit(f"Unknown backend '{name}'. "
+                     f"Available: {', '.join(BACKENDS)}")
+        if name in REQUIRES and not accel.has_backend(REQUIRES[name]):
+            print(f"Skipping {name}: {REQUIRES[name]} is not installed.")
+            continue
+        backends.append(name)
+
+    totals = dict.fromkeys(["reference"] + backends, 0.0)
+    failures: dict[str, list[Case]] = {name: [] for name in backends}
+    with ProcessPoolExecutor(
+            max_workers=args.workers, initializer=warm_up,
+            initargs=(backends,)
+    ) as executor:
+        results = executor.map(
+            run, cases(args.cases, args.max_size, args.seed),
+            [backends] * args.cases, chunksize=16
+        )
+        for result in results:
+            for name, seconds in result.seconds.items():
+                totals[name] += seconds
+            for name in result.failed:
+                failures[name].append(result.case)
+
+    print(f"{args.cases} cases up to {args.max_size}x{args.max_size}")
+    print(f"{'backend':<11} {'mismatches':>10} {'seconds':>9} "
+          f"{'speedup':>8}")
+    print(f"{'reference':<11} {'-':>10} {totals['reference']:>9.2f} "
+          f"{1:>8.2f}")
+    for name in backends:
+        speedup = totals["reference"] / totals[name] if totals[name] else 0
+        print(f"{name:<11} {len(failures[name]):>10} "
+              f"{totals[name]:>9.2f} {speedup:>8.2f}")
+
+    failed = False
+    for name in backends:
+        if not failures[name]:
+            continue
+        failed = True
+        case = min(failures[name], key=lambda c: c.width * c.height)
+        minimal = shrink(case, name)
+        difference = first_difference(
+            reference(minimal), BACKENDS[name](minimal)
+        )
+        print(f"FAIL {name}: {minimal} (shrunk from "
+              f"{case.width}x{case.height}), {difference}")
+    if failed:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Guard the cold-start time of a_maze_ing.py in headless mode.
+
+Runs the program on a tiny maze several times and compares its median
+wall time with a bare interpreter start. Fails when the difference
+exceeds the budget or when headless mode imports terminal modules.
+
+Usage: python3 benchmarks/import_time.py [--runs N] [--budget MS]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROGRAM = os.path.join(ROOT, "a_maze_ing.py")
+
+# Modules only the interactive renderer needs.
+FORBIDDEN = ("mazegen.renderer", "select", "shutil", "signal")
+
+
+def run_times(command: list[str], runs: int) -> list[float]:
+    """Run a command repeatedly and collect wall times in milliseconds."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def imported_modules(command: list[str]) -> set[str]:
+    """Get the modules imported by a command, using -X importtime."""
+    result = subprocess.run(
+        [command[0], "-X", "importtime", *command[1:]],
+        check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        text=True
+    )
+    return {
+        line.rsplit("|", 1)[1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+def main() -> None:
+    """Measure headless startup and exit non-zero on regressions."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=15,
+                        help="number of timed runs")
+    parser.add_argument("--budget", type=float, default=60.0,
+                        help="allowed startup overhead in milliseconds")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = os.path.join(tmp, "config.txt")
+        with open(config, "w") as file:
+            file.write(
+                "WIDTH=3\nHEIGHT=3\nENTRY=0,0\nEXIT=2,2\n"
+                f"OUTPUT_FILE={os.path.join(tmp, 'maze.txt')}\n"
+                "PERFECT=True\nSEED=1\n"
+            )
+        command = [sys.executable, PROGRAM, config, "--headless"]
+
+        baseline = statistics.median(
+            run_times([sys.executable, "-c", "pass"], args.runs)
+        )
+        headless = statistics.median(run_times(command, args.runs))
+        modules = imported_modules(command)
+
+    overhead = headless - baseline
+    print(f"interpreter: {baseline:.1f} ms")
+    print(f"headless run: {headless:.1f} ms "
+          f"(+{overhead:.1f} ms, budget {args.budget:.1f} ms)")
+
+    failed = False
+    loaded = sorted(name for name in FORBIDDEN if name in modules)
+    if loaded:
+        print(f"FAIL: headless mode imported {', '.join(loaded)}")
+        failed = True
+    if overhead > args.budget:
+        print("FAIL: startup overhead is over budget")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
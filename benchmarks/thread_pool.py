@@ -0,0 +1,116 @@
+"""Compare thread and process pools for batch maze generation.
+
+Generates, solves and encodes the same batch of mazes one by one, in a
+ThreadPoolExecutor and in a ProcessPoolExecutor, and checks that every
+pool produced the same mazes. Threads only scale across cores on a
+free-threaded build (e.g. python3.13t) or while the Numba kernel runs;
+processes pay for spawning workers and pickling results instead.
+
+Usage: python3 benchmarks/thread_pool.py [--mazes N] [--size N]
+    [--workers N] [--algorithm dfs|hunt_and_kill]
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import (
+    Executor, ProcessPoolExecutor, ThreadPoolExecutor
+)
+from typing import Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__
+))))
+
+from mazegen.maze_generator import MazeGenerator  # noqa: E402
+from mazegen.maze_io import to_hex  # noqa: E402
+
+
+def build(config: dict[str, Any]) -> str:
+    """Generate and solve a maze, and return a digest of its encoding."""
+    maze = MazeGenerator(config=config)
+    maze.set_canvas()
+    maze.generate_maze()
+    maze.solve_maze()
+    return hashlib.sha256(to_hex(maze.canvas).encode()).hexdigest()
+
+
+def batch(count: int, size: int, algorithm: str) -> list[dict[str, Any]]:
+    """Configurations of a batch of square mazes, one seed each."""
+    return [
+        {
+            "WIDTH": size, "HEIGHT": size, "ENTRY": (0, 0),
+            "EXIT": (size - 1, size - 1), "PERFECT": seed % 2 == 0,
+            "BRAID": None, "SEED": seed, "ALGORITHM": algorithm,
+            "OUTPUT_FILE": None,
+        }
+        for seed in range(count)
+    ]
+
+
+def timed(
+        executor: Executor | None,
+        configs: list[dict[str, Any]]
+) -> tuple[float, list[str]]:
+    """Build a batch, serially when no executor is given.
+
+    Returns:
+        Seconds taken, pool start-up included, and the digests.
+    """
+    start = time.perf_counter()
+    if executor is None:
+        digests = [build(config) for config in configs]
+    else:
+        with executor:
+            digests = list(executor.map(build, configs))
+    return time.perf_counter() - start, digests
+
+
+def main() -> None:
+    """Print the throughput of each way of running the batch."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mazes", type=int, default=64,
+                        help="number of mazes in the batch")
+    parser.add_argument("--size", type=int, default=60,
+                        help="maze side in cells")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="workers per pool (default: CPU count)")
+    parser.add_argument("--algorithm", default="dfs",
+                        choices=("dfs", "hunt_and_kill"))
+    args = parser.parse_args()
+
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    gil = "enabled" if is_gil_enabled is None or is_gil_enabled() else (
+        "disabled"
+    )
+    print(f"Python {sys.version.split()[0]}, GIL {gil}, "
+          f"{args.workers} workers, {args.mazes} mazes of "
+          f"{args.size}x{args.size} ({args.algorithm})")
+
+    configs = batch(args.mazes, args.size, args.algorithm)
+    # Warm up imports and kernels outside of the measurements.
+    build(configs[0])
+
+    runs: list[tuple[str, Executor | None]] = [
+        ("serial", None),
+        ("threads", ThreadPoolExecutor(max_workers=args.workers)),
+        ("processes", ProcessPoolExecutor(max_workers=args.workers)),
+    ]
+    print(f"{'pool':<10} {'seconds':>8} {'mazes/s':>8} {'speedup':>8}")
+    expected: list[str] = []
+    serial = 0.0
+    for name, executor in runs:
+        seconds, digests = timed(executor, configs)
+        if not expected:
+            expected, serial = digests, seconds
+        elif digests != expected:
+            sys.exit(f"FAIL: the {name} pool built different mazes")
+        print(f"{name:<10} {seconds:>8.2f} {args.mazes / seconds:>8.1f} "
+              f"{serial / seconds:>8.2f}")
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
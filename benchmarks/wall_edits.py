@@ -0,0 +1,107 @@
+"""Compare incremental solution tracking with re-solving after each edit.
+
+Generates imperfect mazes of growing size, then toggles random doors:
+a wall is opened and closed again, or closed and opened again. Each edit
+goes through a SolutionTracker, and is timed against a full solve of
+the edited maze. The tracker's solution is checked against the solver.
+
+Usage: python3 benchmarks/wall_edits.py [--edits N] [--sizes 32,64,...]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__
+))))
+
+from mazegen.maze_generator import MazeGenerator  # noqa: E402
+from mazegen.solver import solve  # noqa: E402
+from mazegen.tracker import SolutionTracker  # noqa: E402
+
+
+def build(size: int) -> MazeGenerator:
+    """Generate and solve a square imperfect maze."""
+    generator = MazeGenerator(config={
+        "WIDTH": size, "HEIGHT": size, "ENTRY": (0, 0),
+        "EXIT": (size - 1, size - 1), "PERFECT": False, "BRAID": None,
+        "SEED": size, "ALGORITHM": "dfs", "OUTPUT_FILE": None,
+    })
+    generator.set_canvas()
+    generator.generate_maze()
+    generator.solve_maze()
+    return generator
+
+
+def measure(
+        size: int,
+        edits: int
+) -> tuple[list[float], list[float], list[float], int]:
+    """Time door toggles on a maze of the given size.
+
+    Returns:
+        Per-edit tracker times for opened and for closed walls, full
+        solve times, all in microseconds, and the number of searches
+        the tracker ran.
+    """
+    canvas = build(size).canvas
+    tracker = SolutionTracker(canvas)
+    searches = tracker.searches
+    rng = random.Random(size)
+    opened: list[float] = []
+    closed: list[float] = []
+    solved: list[float] = []
+
+    while len(solved) < edits:
+        cell = rng.choice(canvas.cells)
+        side = rng.choice((1, 2, 4, 8))
+        if cell.direction.value & side:
+            steps = ((tracker.open_wall, opened), (tracker.close_wall, closed))
+        else:
+            steps = ((tracker.close_wall, closed), (tracker.open_wall, opened))
+        for edit, times in steps:
+            start = time.perf_counter()
+            changed = edit(cell, side)
+            elapsed = time.perf_counter() - start
+            if not changed:
+                break
+            times.append(elapsed * 1e6)
+
+            start = time.perf_counter()
+            solution = solve(canvas)
+            solved.append((time.perf_counter() - start) * 1e6)
+            if len(solution) != len(canvas.solution):
+                sys.exit(f"FAIL: tracker solution is not the shortest "
+                         f"({size}x{size})")
+
+    return opened, closed, solved, tracker.searches - searches
+
+
+def main() -> None:
+    """Print per-edit costs for each maze size."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--edits", type=int, default=400,
+                        help="number of edits per maze")
+    parser.add_argument("--sizes", default="32,64,128,256",
+                        help="comma separated maze sides")
+    args = parser.parse_args()
+
+    print("Median microseconds per edit; 'mean' includes re-searches.")
+    print(f"{'size':>9} {'open':>8} {'close':>8} {'mean':>8} "
+          f"{'solve':>9} {'searches':>9}")
+    for size in map(int, args.sizes.split(",")):
+        opened, closed, solved, searches = measure(size, args.edits)
+        print(f"{size:>4}x{size:<4} {statistics.median(opened):>8.1f} "
+              f"{statistics.median(closed):>8.1f} "
+              f"{statistics.mean(opened + closed):>8.1f} "
+              f"{statistics.median(solved):>9.1f} "
+              f"{searches:>5}/{len(solved):<4}")
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,54 @@
-"""Maze generator package."""
+"""Maze generator package.
 
-from mazegen.maze_generator import MazeGenerator
-from mazegen.canvas import Canvas
-from mazegen.cell import Cell
-from mazegen.direction import Direction
-from mazegen.config_parser import ConfigParser
-from mazegen.renderer import Renderer
+Public names are imported on first access, so importing the package
+does not load the renderer or the config parser unless they are used.
+"""
+
+import importlib
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from mazegen.maze_generator import MazeGenerator
+    from mazegen.canvas import Canvas
+    from mazegen.cell import Cell
+    from mazegen.direction import Direction
+    from mazegen.config_parser import ConfigError, ConfigParser
+    from mazegen.renderer import Renderer
+
+# Public name -> module defining it.
+LAZY_IMPORTS = {
+    "MazeGenerator": "mazegen.maze_generator",
+    "Canvas": "mazegen.canvas",
+    "Cell": "mazegen.cell",
+    "Direction": "mazegen.direction",
+    "ConfigError": "mazegen.config_parser",
+    "ConfigParser": "mazegen.config_parser",
+    "Renderer": "mazegen.renderer",
+}
 
 __all__ = [
     "MazeGenerator",
     "Canvas",
     "Cell",
     "Direction",
+    "ConfigError",
     "ConfigParser",
     "Renderer",
 ]
 
 __version__ = "1.0.0"
+
+
+def __getattr__(name: str) -> object:
+    """Import a public name on first access."""
+    module_name = LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module 'mazegen' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List module attributes including the lazily imported names."""
+    return sorted(set(globals()) | set(__all__))
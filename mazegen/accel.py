@@ -0,0 +1,498 @@
+"""Accelerated kernels working on the packed wall grid.
+
+The kernels replace the per-cell object loops of the dfs carve and of
+the BFS solver, for callers that do not need per-step events. They give
+byte-identical results to the reference implementations:
+
+* The carve kernel draws the random numbers it needs as a block of
+  32-bit words and turns them into choices exactly like
+  ``random.Random.choice`` does. Afterwards the generator state is set
+  to where the reference loop would have left it.
+* The NumPy solver expands the BFS one level at a time and keeps the
+  frontier in discovery order, so it picks the same parents as a FIFO
+  queue would.
+
+Optional backends are only looked up, and imported, the first time a
+canvas is large enough to repay the import: Numba compiles the carve
+kernel and NumPy vectorizes the BFS. Without
+them both kernels run as plain Python on the packed grid, which is
+still several times faster than the object based loops.
+"""
+
+import importlib
+import random
+import threading
+from array import array
+from collections import deque
+from typing import Any, Callable, Sequence
+
+from mazegen.canvas import Canvas
+from mazegen.cell import Cell
+from mazegen.streams import choice_compatible, draw_words
+
+# Smallest canvases (in cells) for which the optional backends are used.
+NUMBA_MIN_CELLS = 250_000
+NUMPY_MIN_CELLS = 100_000
+
+# Distance of cells a BFS did not reach.
+UNREACHABLE = 2 ** 32 - 1
+
+# Set to False to always run the reference implementations.
+enabled = True
+
+compiled_kernel: Callable[..., tuple[int, int]] | None = None
+compile_lock = threading.Lock()
+detected: dict[str, bool] = {}
+
+
+def has_backend(name: str) -> bool:
+    """Check once per process whether an optional module is installed.
+
+    Args:
+        name: Module name, 'numpy' or 'numba'.
+    """
+    if name not in detected:
+        import importlib.util
+
+        detected[name] = importlib.util.find_spec(name) is not None
+    return detected[name]
+
+
+def carve_kernel(
+        width: int,
+        height: int,
+        walls: Any,
+        visited: Any,
+        blocked: Any,
+        start: int,
+        words: Any,
+        stack: Any,
+        choices: Any,
+        dead_ends: Any
+) -> tuple[int, int]:
+    """Carve a dfs maze on a packed wall grid.
+
+    Mirrors ``mazegen.algorithms.dfs`` step by step. Written with plain
+    indexing only, so Numba can compile it unchanged.
+
+    Args:
+        width: Maze width in cells.
+        height: Maze height in cells.
+        walls: Wall values in row-major order, updated in place.
+        visited: Visited flags per cell, updated in place.
+        blocked: Non-zero for cells that cannot be opened ('42' cells).
+        start: Row-major index of the start cell.
+        words: Pre-drawn 32-bit random words.
+        stack: Scratch buffer with room for one entry per cell.
+        choices: Scratch buffer with room for four cell indexes.
+        dead_ends: Output buffer with room for two entries per cell,
+            receives (cell, neighbour behind wall) index pairs.
+
+    Returns:
+        Consumed words (-1 if ``words`` ran out) and the number of dead
+        end pairs written.
+    """
+    size = width * height
+    used = 0
+    count = 0
+    top = 0
+    stack[0] = start
+    visited[start] = 1
+
+    while top >= 0:
+        cell = stack[top]
+        x = cell % width
+
+        # Candidates in get_neighbours order: west, east, north, south.
+        found = 0
+        dead_end = False
+        if x > 0 and not visited[cell - 1]:
+            choices[found] = cell - 1
+            found += 1
+        if x < width - 1 and not visited[cell + 1]:
+            choices[found] = cell + 1
+            found += 1
+        if cell >= width and not visited[cell - width]:
+            choices[found] = cell - width
+            found += 1
+        if cell < size - width and not visited[cell + width]:
+            choices[found] = cell + width
+            found += 1
+
+        if found == 0:
+            dead_end = True
+            value = walls[cell]
+            if x > 0 and not blocked[cell - 1] and (
+                    value & 8 or walls[cell - 1] & 2):
+                choices[found] = cell - 1
+                found += 1
+            if x < width - 1 and not blocked[cell + 1] and (
+                    value & 2 or walls[cell + 1] & 8):
+                choices[found] = cell + 1
+                found += 1
+            if cell >= width and not blocked[cell - width] and (
+                    value & 1 or walls[cell - width] & 4):
+                choices[found] = cell - width
+                found += 1
+            if cell < size - width and not blocked[cell + width] and (
+                    value & 4 or walls[cell + width] & 1):
+                choices[found] = cell + width
+                found += 1
+            top -= 1
+            if found == 0:
+                continue
+
+        bits = 0
+        rest = found
+        while rest:
+            bits += 1
+            rest >>= 1
+        index = found
+        while index >= found:
+            if used == len(words):
+                return -1, count
+            index = words[used] >> (32 - bits)
+            used += 1
+        neighbour = choices[index]
+
+        if dead_end:
+            dead_ends[2 * count] = cell
+            dead_ends[2 * count + 1] = neighbour
+            count += 1
+            continue
+
+        # Vertical first: with a width of 1 they are also at distance 1.
+        if neighbour == cell - width:
+            walls[cell] &= 14
+            walls[neighbour] &= 11
+        elif neighbour == cell + width:
+            walls[cell] &= 11
+            walls[neighbour] &= 14
+        elif neighbour == cell - 1:
+            walls[cell] &= 7
+            walls[neighbour] &= 13
+        else:
+            walls[cell] &= 13
+            walls[neighbour] &= 7
+        visited[neighbour] = 1
+        top += 1
+        stack[top] = neighbour
+
+    return used, count
+
+
+def load_compiled_kernel() -> Callable[..., tuple[int, int]]:
+    """Compile the carve kernel with Numba, once per process.
+
+    The compiled kernel releases the GIL, so threads carving different
+    canvases run it in parallel.
+    """
+    global compiled_kernel
+    with compile_lock:
+        if compiled_kernel is None:
+            numba = importlib.import_module("numba")
+            compiled_kernel = numba.njit(cache=True, nogil=True)(
+                carve_kernel
+            )
+    return compiled_kernel
+
+
+def carve_dfs(canvas: Canvas, start_cell: Cell, rng: random.Random) -> None:
+    """Generate a dfs maze without per-step events.
+
+    Produces the same walls, visited flags, dead ends and generator
+    state as running ``mazegen.algorithms.dfs.generate_maze`` to the
+    end.
+
+    Args:
+        canvas: The maze canvas to generate on.
+        start_cell: Starting cell for generation.
+        rng: Random number generator for reproducibility.
+    """
+    if not enabled or not choice_compatible():
+        from mazegen.algorithms.dfs import generate_maze
+
+        for _ in generate_maze(canvas, start_cell, rng):
+            pass
+        return
+
+    size = canvas.width * canvas.height
+    x, y = start_cell.coordinate
+    start = y * canvas.width + x
+    walls = canvas.wall_grid()
+    visited = bytearray(cell.is_visited for cell in canvas.cells)
+    blocked = canvas.mask.to_bytes()
+    use_numba = (
+        size >= NUMBA_MIN_CELLS
+        and has_backend("numpy") and has_backend("numba")
+    )
+
+    pairs: Sequence[int]
+    state = rng.getstate()
+    budget = 4 * size + 64
+    while True:
+        # Every attempt starts from the same state and the same grid.
+        rng.setstate(state)
+        words = draw_words(rng, budget)
+        grid = bytearray(walls)
+        seen = bytearray(visited)
+        if use_numba:
+            used, count, pairs = run_compiled(
+                canvas.width, canvas.height, grid, seen, blocked, start,
+                words
+            )
+        else:
+            buffer = array("i", bytes(8 * size))
+            used, count = carve_kernel(
+                canvas.width, canvas.height, grid, seen, blocked, start,
+                words, array("i", bytes(4 * size)), [0, 0, 0, 0], buffer
+            )
+            pairs = buffer
+        if used >= 0:
+            break
+        budget *= 2
+
+    rng.setstate(state)
+    draw_words(rng, used)
+
+    canvas.set_walls(grid)
+    for cell, flag in zip(canvas.cells, seen):
+        cell.is_visited = bool(flag)
+    cells = canvas.cells
+    canvas.dead_ends.extend(
+        (cells[pairs[i]], cells[pairs[i + 1]]) for i in range(0, 2 * count, 2)
+    )
+
+
+def run_compiled(
+        width: int,
+        height: int,
+        walls: bytearray,
+        visited: bytearray,
+        blocked: bytearray,
+        start: int,
+        words: "array[int]"
+) -> tuple[int, int, list[int]]:
+    """Run the Numba compiled carve kernel on NumPy views of the grid.
+
+    Returns:
+        Consumed words, number of dead end pairs and the pairs.
+    """
+    np = importlib.import_module("numpy")
+    size = width * height
+    pairs = np.empty(2 * size, dtype=np.int32)
+    used, count = load_compiled_kernel()(
+        width, height,
+        np.frombuffer(walls, dtype=np.uint8),
+        np.frombuffer(visited, dtype=np.uint8),
+        np.frombuffer(blocked, dtype=np.uint8),
+        start,
+        np.frombuffer(words, dtype=np.uint32).astype(np.int64),
+        np.empty(size, dtype=np.int64),
+        np.empty(4, dtype=np.int64),
+        pairs
+    )
+    return int(used), int(count), pairs[:2 * count].tolist()
+
+
+def solve_grid(
+        walls: bytes | bytearray | memoryview,
+        width: int,
+        entry: int,
+        exit: int
+) -> str:
+    """Find the shortest path on a wall grid.
+
+    Picks the same path as ``mazegen.solver.solve``.
+
+    Args:
+        walls: Wall values in row-major order.
+        width: Maze width in cells.
+        entry: Row-major index of the entry cell.
+        exit: Row-major index of the exit cell.
+
+    Returns:
+        Path as a string of directions (N, E, S, W), or an empty string
+        if the exit cannot be reached.
+    """
+    _, parents = bfs_tree(walls, width, entry, exit)
+    return path_to(parents, width, entry, exit)
+
+
+def path_to(
+        parents: Sequence[int],
+        width: int,
+        entry: int,
+        target: int
+) -> str:
+    """Walk BFS parent links back from a target and encode the path.
+
+    Args:
+        parents: Parent index per cell, as returned by ``bfs_tree``.
+        width: Maze width in cells.
+        entry: Row-major index of the BFS start cell.
+        target: Row-major index of the last cell of the path.
+
+    Returns:
+        Path as a string of directions (N, E, S, W), or an empty string
+        if the target was not reached.
+    """
+    if parents[target] < 0:
+        return ""
+
+    directions: list[str] = []
+    cell = target
+    while cell != entry:
+        parent = parents[cell]
+        step = cell - parent
+        # Vertical first: with a width of 1 they are also at distance 1.
+        if step == -width:
+            directions.append("N")
+        elif step == width:
+            directions.append("S")
+        elif step == -1:
+            directions.append("W")
+        else:
+            directions.append("E")
+        cell = parent
+
+    return "".join(reversed(directions))
+
+
+def bfs_tree(
+        walls: bytes | bytearray | memoryview,
+        width: int,
+        entry: int,
+        exit: int = -1
+) -> tuple["array[int]", "array[int]"]:
+    """Run a BFS from the entry over a wall grid.
+
+    Uses the NumPy search for large grids when NumPy is installed and a
+    packed FIFO search otherwise; both give the same result.
+
+    Args:
+        walls: Wall values in row-major order.
+        width: Maze width in cells.
+        entry: Row-major index of the start cell.
+        exit: Row-major index of a cell to stop at, or -1 to reach
+            every cell.
+
+    Returns:
+        Distances from the entry (``UNREACHABLE`` for cells that were
+        not reached) and the parent index per cell (the entry being its
+        own parent, -1 for cells that were not reached).
+    """
+    if len(walls) >= NUMPY_MIN_CELLS and has_backend("numpy"):
+        return bfs_tree_numpy(walls, width, entry, exit)
+    return bfs_tree_python(walls, width, entry, exit)
+
+
+def bfs_tree_python(
+        walls: bytes | bytearray | memoryview,
+        width: int,
+        entry: int,
+        exit: int = -1
+) -> tuple["array[int]", "array[int]"]:
+    """Run a FIFO BFS on a wall grid, see ``bfs_tree``.
+
+    Neighbours are visited in west, east, north, south order, like
+    ``Canvas.get_accessible_neighbours`` returns them.
+    """
+    size = len(walls)
+    distances = array("I", [UNREACHABLE]) * size
+    parents = array("i", [-1]) * size
+    distances[entry] = 0
+    parents[entry] = entry
+    queue = deque([entry])
+
+    while queue:
+        cell = queue.popleft()
+        if cell == exit:
+            break
+        value = walls[cell]
+        step = distances[cell] + 1
+        x = cell % width
+        west, east = cell - 1, cell + 1
+        north, south = cell - width, cell + width
+        if (x > 0 and not value & 8 and not walls[west] & 2
+                and parents[west] < 0):
+            parents[west] = cell
+            distances[west] = step
+            queue.append(west)
+        if (x < width - 1 and not value & 2 and not walls[east] & 8
+                and parents[east] < 0):
+            parents[east] = cell
+            distances[east] = step
+            queue.append(east)
+        if (north >= 0 and not value & 1 and not walls[north] & 4
+                and parents[north] < 0):
+            parents[north] = cell
+            distances[north] = step
+            queue.append(north)
+        if (south < size and not value & 4 and not walls[south] & 1
+                and parents[south] < 0):
+            parents[south] = cell
+            distances[south] = step
+            queue.append(south)
+
+    return distances, parents
+
+
+def bfs_tree_numpy(
+        walls: bytes | bytearray | memoryview,
+        width: int,
+        entry: int,
+        exit: int = -1
+) -> tuple["array[int]", "array[int]"]:
+    """Run a level-synchronous BFS on a wall grid with NumPy.
+
+    The frontier of each level is expanded as a whole: the four
+    neighbour candidates of every frontier cell are tested at once and
+    the first discovery of each cell wins. Keeping the frontier in
+    discovery order gives the same parents as ``bfs_tree_python``.
+    """
+    np = importlib.import_module("numpy")
+    grid = np.frombuffer(walls, dtype=np.uint8).astype(np.int64)
+    size = len(grid)
+    distances = np.full(size, UNREACHABLE, dtype=np.uint32)
+    parents = np.full(size, -1, dtype=np.int64)
+    distances[entry] = 0
+    parents[entry] = entry
+    frontier = np.array([entry], dtype=np.int64)
+    offsets = np.array([-1, 1, -width, width], dtype=np.int64)
+    # Wall bit of the cell and of the neighbour, per candidate direction.
+    own = np.array([8, 2, 1, 4], dtype=np.int64)
+    facing = np.array([2, 8, 4, 1], dtype=np.int64)
+    level = 0
+
+    while frontier.size and (exit < 0 or parents[exit] < 0):
+        level += 1
+        x = frontier % width
+        inside = np.stack([
+            x > 0,
+            x < width - 1,
+            frontier >= width,
+            frontier < size - width,
+        ], axis=1)
+        candidates = frontier[:, None] + offsets
+        safe = np.where(inside, candidates, frontier[:, None])
+        passable = (
+            inside
+            & ((grid[frontier][:, None] & own) == 0)
+            & ((grid[safe] & facing) == 0)
+        )
+        passable &= parents[safe] < 0
+
+        found = candidates[passable]
+        origins = np.broadcast_to(frontier[:, None], passable.shape)[passable]
+        _, first = np.unique(found, return_index=True)
+        first.sort()
+        frontier = found[first]
+        parents[frontier] = origins[first]
+        distances[frontier] = level
+
+    distance_array = array("I")
+    distance_array.frombytes(distances.tobytes())
+    parent_array = array("i")
+    parent_array.frombytes(parents.astype(np.int32).tobytes())
+    return distance_array, parent_array
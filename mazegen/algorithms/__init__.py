@@ -1,6 +1,288 @@
-"""Maze generation algorithms."""
+"""Maze generation algorithms.
 
-from mazegen.algorithms import dfs
-from mazegen.algorithms import hunt_and_kill
+Algorithms are kept in a registry and imported on first use. Besides
+the built-in ones, other packages can provide algorithms through the
+``mazegen.algorithms`` entry point group::
 
-__all__ = ["dfs", "hunt_and_kill"]
+    [project.entry-points."mazegen.algorithms"]
+    prim = "mazegen_prim:generate_maze"
+
+An entry point refers either to a ``generate_maze`` function or to a
+module defining one. Capabilities are declared with a ``CAPABILITIES``
+set on the module or a ``capabilities`` attribute on the function.
+
+An algorithm may also name a kernel: a function with the same arguments
+that carves the whole maze at once, without events. It is used instead
+of the generator when nobody consumes the events, and must leave the
+canvas and the random generator exactly as the generator would.
+
+Algorithms with the ``checkpoint`` capability keep their state in an
+array that can be saved between two events. Their module defines
+``start_state(canvas, start_cell)``, which returns the state before the
+first step, and ``resume(canvas, state, rng)``, which carves from a
+state like ``generate_maze`` and updates it before each event.
+"""
+
+import importlib
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Generator, Iterable
+
+if TYPE_CHECKING:
+    import random
+    from array import array
+
+    from mazegen.canvas import Canvas
+    from mazegen.cell import Cell
+    from mazegen.events import Event
+
+GenerateFunc = Callable[
+    ["Canvas", "Cell", "random.Random"], Generator["Event", None, None]
+]
+KernelFunc = Callable[["Canvas", "Cell", "random.Random"], None]
+StartFunc = Callable[["Canvas", "Cell"], "array[int]"]
+ResumeFunc = Callable[
+    ["Canvas", "array[int]", "random.Random"],
+    Generator["Event", None, None]
+]
+
+ENTRY_POINT_GROUP = "mazegen.algorithms"
+
+# Capabilities an algorithm can declare.
+EVENTS = "events"          # yields carve/backtrack/hunt events
+CHECKPOINT = "checkpoint"  # can save its state and resume
+KNOWN_CAPABILITIES = frozenset({EVENTS, CHECKPOINT})
+
+
+class Algorithm:
+    """A registered generation algorithm, loaded on first use."""
+
+    def __init__(
+            self,
+            name: str,
+            target: str | Callable[[], Any],
+            capabilities: Iterable[str] | None = None,
+            kernel: str | None = None
+    ) -> None:
+        """Initialize the registry entry.
+
+        Args:
+            name: Name used in the ALGORITHM configuration key.
+            target: 'module' or 'module:attribute' path, or a callable
+                returning the function or module (e.g. an entry point's
+                ``load``).
+            capabilities: Declared capabilities. When None, they are read
+                from the loaded algorithm.
+            kernel: Optional 'module:attribute' path of a function that
+                carves the same maze without events.
+        """
+        self.name = name
+        self.target = target
+        self.declared = (
+            None if capabilities is None else frozenset(capabilities)
+        )
+        self.function: GenerateFunc | None = None
+        self.loaded: Any = None
+        self.loaded_capabilities: frozenset[str] = frozenset()
+        self.kernel = kernel
+
+    def load(self) -> GenerateFunc:
+        """Import the algorithm if needed and return its function.
+
+        Raises:
+            ValueError: If the target does not provide ``generate_maze``.
+        """
+        if self.function:
+            return self.function
+
+        loaded: Any
+        if isinstance(self.target, str):
+            module_name, _, attribute = self.target.partition(":")
+            loaded = importlib.import_module(module_name)
+            if attribute:
+                loaded = getattr(loaded, attribute)
+        else:
+            loaded = self.target()
+
+        function: GenerateFunc = getattr(loaded, "generate_maze", loaded)
+        if not callable(function):
+            raise ValueError(
+                f"Algorithm '{self.name}' does not provide generate_maze"
+            )
+
+        capabilities: Iterable[str] = (
+            getattr(loaded, "CAPABILITIES", None)
+            or getattr(function, "capabilities", None)
+            or ()
+        )
+        self.loaded_capabilities = frozenset(capabilities)
+        self.loaded = loaded
+        self.function = function
+        return function
+
+    def load_resume(self) -> tuple[StartFunc, ResumeFunc]:
+        """Import the checkpoint functions of the algorithm.
+
+        Returns:
+            Its ``start_state`` and ``resume`` functions.
+
+        Raises:
+            ValueError: If the algorithm cannot be checkpointed.
+        """
+        self.load()
+        start = getattr(self.loaded, "start_state", None)
+        resume = getattr(self.loaded, "resume", None)
+        if CHECKPOINT not in self.capabilities or not (start and resume):
+            raise ValueError(
+                f"Algorithm '{self.name}' cannot be checkpointed"
+            )
+        return start, resume
+
+    def load_kernel(self) -> KernelFunc | None:
+        """Import the kernel of the algorithm, if it has one."""
+        if not self.kernel:
+            return None
+        module_name, _, attribute = self.kernel.partition(":")
+        kernel: KernelFunc = getattr(
+            importlib.import_module(module_name), attribute
+        )
+        return kernel
+
+    @property
+    def capabilities(self) -> frozenset[str]:
+        """Capabilities of the algorithm, loading it if needed."""
+        if self.declared is not None:
+            return self.declared
+        self.load()
+        return self.loaded_capabilities
+
+
+REGISTRY: dict[str, Algorithm] = {}
+entry_points_loaded = False
+registry_lock = threading.Lock()
+
+
+def register(
+        name: str,
+        target: str | Callable[[], Any],
+        capabilities: Iterable[str] | None = None,
+        replace: bool = False,
+        kernel: str | None = None
+) -> Algorithm:
+    """Add an algorithm to the registry.
+
+    Args:
+        name: Name used in the ALGORITHM configuration key.
+        target: See ``Algorithm``.
+        capabilities: See ``Algorithm``.
+        replace: Allow replacing an algorithm with the same name.
+        kernel: See ``Algorithm``.
+
+    Returns:
+        The registry entry.
+
+    Raises:
+        ValueError: If the name is taken or a capability is unknown.
+    """
+    if name in REGISTRY and not replace:
+        raise ValueError(f"Algorithm '{name}' is already registered")
+    unknown = set(capabilities or ()) - KNOWN_CAPABILITIES
+    if unknown:
+        raise ValueError(
+            f"Unknown capabilities: {', '.join(sorted(unknown))}"
+        )
+    REGISTRY[name] = Algorithm(name, target, capabilities, kernel)
+    return REGISTRY[name]
+
+
+def load_entry_points() -> None:
+    """Register algorithms advertised by installed packages.
+
+    Built-in and explicitly registered algorithms take precedence over
+    entry points with the same name. Only runs once.
+    """
+    global entry_points_loaded
+    with registry_lock:
+        if entry_points_loaded:
+            return
+
+        from importlib.metadata import entry_points
+
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            if entry_point.name not in REGISTRY:
+                REGISTRY[entry_point.name] = Algorithm(
+                    entry_point.name, entry_point.load
+                )
+        # Set last, so other threads never see a partial registry.
+        entry_points_loaded = True
+
+
+def lookup(name: str) -> Algorithm:
+    """Find a registered algorithm.
+
+    Entry points are only scanned when the name is not registered yet.
+
+    Args:
+        name: Algorithm name.
+
+    Returns:
+        The registry entry.
+
+    Raises:
+        ValueError: If no algorithm has that name.
+    """
+    if name not in REGISTRY:
+        load_entry_points()
+    if name not in REGISTRY:
+        raise ValueError(
+            f"Unknown algorithm '{name}'. "
+            f"Available: {', '.join(available())}"
+        )
+    return REGISTRY[name]
+
+
+def available() -> list[str]:
+    """List the names of all registered and advertised algorithms."""
+    load_entry_points()
+    return sorted(REGISTRY)
+
+
+def get_algorithm(name: str) -> GenerateFunc:
+    """Load the generation function of an algorithm.
+
+    Args:
+        name: Algorithm name.
+
+    Returns:
+        The algorithm's ``generate_maze`` function.
+
+    Raises:
+        ValueError: If the algorithm is unknown.
+    """
+    return lookup(name).load()
+
+
+register(
+    "dfs", "mazegen.algorithms.dfs", {EVENTS, CHECKPOINT},
+    kernel="mazegen.accel:carve_dfs"
+)
+register(
+    "hunt_and_kill", "mazegen.algorithms.hunt_and_kill",
+    {EVENTS, CHECKPOINT}
+)
+
+BUILTIN = ("dfs", "hunt_and_kill")
+
+__all__ = [
+    "Algorithm", "REGISTRY", "register", "lookup", "available",
+    "get_algorithm", "EVENTS", "CHECKPOINT",
+    "dfs", "hunt_and_kill",
+]
+
+
+def __getattr__(name: str) -> object:
+    """Import a built-in algorithm module on first attribute access."""
+    if name in BUILTIN:
+        return importlib.import_module(f"mazegen.algorithms.{name}")
+    raise AttributeError(
+        f"module 'mazegen.algorithms' has no attribute '{name}'"
+    )
@@ -1,17 +1,34 @@
 """Depth-first search (dfs) maze generation algorithm."""
 
 import random
+from array import array
 from typing import Generator
 
 from mazegen.canvas import Canvas
 from mazegen.cell import Cell
+from mazegen.events import Event, backtrack, carve
+
+
+def start_state(canvas: Canvas, start_cell: Cell) -> "array[int]":
+    """Build the state of a generation that has not carved anything.
+
+    Args:
+        canvas: The maze canvas to generate on.
+        start_cell: Starting cell for generation.
+
+    Returns:
+        The stack of cell indexes, holding the starting cell.
+    """
+    start_cell.is_visited = True
+    x, y = start_cell.coordinate
+    return array("i", [y * canvas.width + x])
 
 
 def generate_maze(
         canvas: Canvas,
         start_cell: Cell,
         rng: random.Random
-) -> Generator[str, None, None]:
+) -> Generator[Event, None, None]:
     """Generate a maze using dfs algorithm.
 
     Args:
@@ -20,16 +37,38 @@ def generate_maze(
         rng: Random number generator for reproducibility.
 
     Yields:
-        Empty string for each step (for progress tracking).
+        An event for each step (carve, backtrack or hunt).
     """
     if not canvas or not start_cell:
         return
+    yield from resume(canvas, start_state(canvas, start_cell), rng)
 
-    stack = [start_cell]
-    start_cell.is_visited = True
+
+def resume(
+        canvas: Canvas,
+        stack: "array[int]",
+        rng: random.Random
+) -> Generator[Event, None, None]:
+    """Carve from a stack of cell indexes until it is empty.
+
+    The stack is updated before each event, so together with the canvas
+    and the random generator it can be saved between any two events and
+    passed back here to finish the same maze.
+
+    Args:
+        canvas: The maze canvas to generate on.
+        stack: Indexes of the cells being explored, the current one
+            last. Updated in place.
+        rng: Random number generator for reproducibility.
+
+    Yields:
+        An event for each step (carve or backtrack).
+    """
+    cells = canvas.cells
+    width = canvas.width
 
     while stack:
-        cell = stack[-1]
+        cell = cells[stack[-1]]
         neighbours = canvas.get_neighbours(cell)
         unvisited = [n for n in neighbours if not n.is_visited]
 
@@ -37,16 +76,17 @@ def generate_maze(
             neighbour = rng.choice(unvisited)
             canvas.remove_wall(cell, neighbour)
             neighbour.is_visited = True
-            stack.append(neighbour)
+            x, y = neighbour.coordinate
+            stack.append(y * width + x)
+            yield carve(*cell.coordinate, canvas.wall_side(cell, neighbour))
         else:
             accessible = set(canvas.get_accessible_neighbours(cell))
             inaccessible = [
                 n for n in neighbours
-                if n not in accessible and n not in canvas.ft_cells
+                if n not in accessible and not canvas.is_blocked(n)
             ]
             if inaccessible:
                 neighbour_behind_wall = rng.choice(inaccessible)
                 canvas.dead_ends.append((cell, neighbour_behind_wall))
             stack.pop()
-
-        yield ""
+            yield backtrack(*cell.coordinate)
@@ -1,17 +1,37 @@
 """Hunt and kill maze generation algorithm."""
 
 import random
+from array import array
 from typing import Generator
 
 from mazegen.canvas import Canvas
 from mazegen.cell import Cell
+from mazegen.events import Event, backtrack, carve, hunt_scan
+
+# First state value while the next step is a hunt.
+HUNTING = -1
+
+
+def start_state(canvas: Canvas, start_cell: Cell) -> "array[int]":
+    """Build the state of a generation that has not carved anything.
+
+    Args:
+        canvas: The maze canvas to generate on.
+        start_cell: Starting cell for generation.
+
+    Returns:
+        The index of the current cell and the hunt cursor, see
+        ``resume``.
+    """
+    x, y = start_cell.coordinate
+    return array("i", [y * canvas.width + x, 0])
 
 
 def generate_maze(
         canvas: Canvas,
         start_cell: Cell,
         rng: random.Random
-) -> Generator[str, None, None]:
+) -> Generator[Event, None, None]:
     """Generate a maze using hunt and kill algorithm.
 
     Args:
@@ -20,14 +40,62 @@ def generate_maze(
         rng: Random number generator for reproducibility.
 
     Yields:
-        Empty string for each step (for progress tracking).
+        An event for each step (carve, backtrack or hunt).
     """
-    cell = start_cell
-
-    if not canvas or not cell:
+    if not canvas or not start_cell:
         return
+    yield from resume(canvas, start_state(canvas, start_cell), rng)
+
+
+def resume(
+        canvas: Canvas,
+        state: "array[int]",
+        rng: random.Random
+) -> Generator[Event, None, None]:
+    """Walk and hunt from a saved state until every cell is visited.
+
+    The state is updated before each event, so together with the canvas
+    and the random generator it can be saved between any two events and
+    passed back here to finish the same maze.
+
+    Args:
+        canvas: The maze canvas to generate on.
+        state: Index of the current cell, or ``HUNTING``, then the hunt
+            cursor: every cell before it is visited, so hunts start
+            there. Updated in place.
+        rng: Random number generator for reproducibility.
+
+    Yields:
+        An event for each step (carve, backtrack or hunt).
+    """
+    cells = canvas.cells
+    width = canvas.width
 
     while True:
+        if state[0] == HUNTING:
+            while state[1] < len(cells) and cells[state[1]].is_visited:
+                state[1] += 1
+            for index in range(state[1], len(cells)):
+                hunt_cell = cells[index]
+                if hunt_cell.is_visited:
+                    continue
+                neighbours = canvas.get_neighbours(hunt_cell)
+                visited = [
+                    n for n in neighbours
+                    if n.is_visited and not canvas.is_blocked(n)
+                ]
+                if visited:
+                    neighbour = rng.choice(visited)
+                    canvas.remove_wall(hunt_cell, neighbour)
+                    state[0] = index
+                    x, y = hunt_cell.coordinate
+                    yield hunt_scan(x, y)
+                    yield carve(x, y, canvas.wall_side(hunt_cell, neighbour))
+                    break
+            else:
+                return
+
+        cell = cells[state[0]]
         cell.is_visited = True
         neighbours = canvas.get_neighbours(cell)
         unvisited = [n for n in neighbours if not n.is_visited]
@@ -35,37 +103,17 @@ def generate_maze(
         if unvisited:
             neighbour = rng.choice(unvisited)
             canvas.remove_wall(cell, neighbour)
-            cell = neighbour
+            x, y = neighbour.coordinate
+            state[0] = y * width + x
+            yield carve(*cell.coordinate, canvas.wall_side(cell, neighbour))
         else:
             accessible = set(canvas.get_accessible_neighbours(cell))
             inaccessible = [
                 n for n in neighbours
-                if n not in accessible and n not in canvas.ft_cells
+                if n not in accessible and not canvas.is_blocked(n)
             ]
             if inaccessible:
                 neighbour_behind_wall = rng.choice(inaccessible)
                 canvas.dead_ends.append((cell, neighbour_behind_wall))
-
-            found = False
-            for y in range(canvas.height):
-                for x in range(canvas.width):
-                    hunt_cell = canvas.get_cell(x, y)
-                    if hunt_cell and not hunt_cell.is_visited:
-                        neighbours = canvas.get_neighbours(hunt_cell)
-                        visited = [
-                            n for n in neighbours
-                            if n.is_visited and n not in canvas.ft_cells
-                        ]
-                        if visited:
-                            neighbour = rng.choice(visited)
-                            canvas.remove_wall(hunt_cell, neighbour)
-                            cell = hunt_cell
-                            found = True
-                            break
-                if found:
-                    break
-
-            if not found:
-                break
-
-        yield ""
+            state[0] = HUNTING
+            yield backtrack(*cell.coordinate)
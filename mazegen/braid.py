@@ -0,0 +1,227 @@
+"""Braiding: opening dead ends to add loops to a perfect maze.
+
+Works on the packed wall grid and on an index array of dead-end cells.
+``braid`` itself only visits the dead ends it is given, but two inputs
+cost a pass over every cell: the distance fields used to favour
+shortcuts, and ``dead_end_cells`` when no dead ends were recorded.
+"""
+
+import random
+from array import array
+from typing import Container, Iterable, MutableSequence, Sequence
+
+from mazegen.canvas import OFFSETS
+
+# Share of dead ends opened when a maze is not perfect and BRAID is unset.
+DEFAULT_RATIO = 0.2
+
+# How many times more likely a wall whose opening shortens the solution
+# is picked than any other wall.
+SHORTEN_WEIGHT = 4.0
+
+# Wall value -> number of open sides.
+OPEN_SIDES = bytes(4 - bin(value & 15).count("1") for value in range(256))
+
+# Wall bit of a cell -> wall bit of the neighbour facing it.
+OPPOSITE = {1: 4, 2: 8, 4: 1, 8: 2}
+
+
+def dead_end_indexes(
+        cells: Iterable[tuple[int, int]],
+        width: int
+) -> "array[int]":
+    """Turn dead-end coordinates into unique row-major indexes.
+
+    Args:
+        cells: (x, y) coordinates, possibly repeated.
+        width: Maze width in cells.
+
+    Returns:
+        Indexes in first-seen order.
+    """
+    return array("I", dict.fromkeys(y * width + x for x, y in cells))
+
+
+def dead_end_cells(walls: bytes | bytearray) -> "array[int]":
+    """Find the dead ends of a wall grid in one pass.
+
+    For canvases whose dead ends were not recorded while carving, e.g.
+    loaded from a file.
+
+    Args:
+        walls: Wall values in row-major order.
+
+    Returns:
+        Indexes of the cells with exactly one open side, in order.
+    """
+    sides = walls.translate(OPEN_SIDES)
+    cells = array("I")
+    index = sides.find(1)
+    while index >= 0:
+        cells.append(index)
+        index = sides.find(1, index + 1)
+    return cells
+
+
+def neighbour_index(index: int, side: int, width: int, size: int) -> int:
+    """Get the index of the cell behind a wall, -1 if outside the grid."""
+    dx, dy = OFFSETS[side]
+    x = index % width + dx
+    neighbour = index + dy * width + dx
+    if not 0 <= x < width or not 0 <= neighbour < size:
+        return -1
+    return neighbour
+
+
+def openings(walls: Sequence[int], index: int) -> int:
+    """Count the open sides of a cell."""
+    return 4 - bin(walls[index]).count("1")
+
+
+def opens_block(
+        walls: Sequence[int],
+        width: int,
+        height: int,
+        index: int,
+        side: int
+) -> bool:
+    """Check whether opening a wall would leave a 3x3 area fully open.
+
+    Only the 3x3 windows containing both cells of the wall are checked.
+
+    Args:
+        walls: Wall values in row-major order.
+        width: Maze width in cells.
+        height: Maze height in cells.
+        index: Row-major index of the cell owning the wall.
+        side: Wall bit to open.
+
+    Returns:
+        True if some window would have all its inner walls open.
+    """
+    x, y = index % width, index // width
+    dx, dy = OFFSETS[side]
+    low_x, high_x = min(x, x + dx), max(x, x + dx)
+    low_y, high_y = min(y, y + dy), max(y, y + dy)
+
+    for top in range(max(high_y - 2, 0), min(low_y, height - 3) + 1):
+        for left in range(max(high_x - 2, 0), min(low_x, width - 3) + 1):
+            window_open = True
+            for row in range(top, top + 3):
+                for column in range(left, left + 3):
+                    cell = row * width + column
+                    value = walls[cell]
+                    if cell == index:
+                        value &= ~side
+                    elif cell == index + dy * width + dx:
+                        value &= ~OPPOSITE[side]
+                    if ((column < left + 2 and value & 2)
+                            or (row < top + 2 and value & 4)):
+                        window_open = False
+                        break
+                if not window_open:
+                    break
+            if window_open:
+                return True
+    return False
+
+
+def braid(
+        walls: MutableSequence[int],
+        width: int,
+        height: int,
+        dead_ends: Sequence[int],
+        ratio: float,
+        rng: random.Random,
+        blocked: Container[int] = (),
+        from_entry: Sequence[int] = (),
+        to_exit: Sequence[int] = (),
+        solution_length: int = 0
+) -> list[tuple[int, int]]:
+    """Open walls at dead ends, in place.
+
+    Candidates that are not dead ends (cells with a single opening) are
+    dropped. The dead ends are visited in random order and each one
+    still being a dead end gets one of its walls opened, until ``ratio``
+    of them have been handled; a positive ratio handles at least one, so
+    small mazes do not stay perfect. A dead end fixed by an earlier
+    opening is skipped, so no wall is opened twice. Walls that would
+    leave a 3x3 open area are never chosen; when the distance fields are
+    given, walls creating a shortcut between entry and exit are
+    ``SHORTEN_WEIGHT`` times more likely to be picked.
+    The distances are not updated while braiding.
+
+    Args:
+        walls: Wall values in row-major order, updated in place.
+        width: Maze width in cells.
+        height: Maze height in cells.
+        dead_ends: Row-major indexes of candidate dead-end cells.
+        ratio: Share of dead ends to open, between 0 and 1.
+        rng: Random number generator.
+        blocked: Indexes of the cells that must stay closed, e.g. a
+            ``Mask``.
+        from_entry: Steps from the entry per cell (-1 if unreachable).
+        to_exit: Steps to the exit per cell (-1 if unreachable).
+        solution_length: Steps from entry to exit before braiding, 0 to
+            ignore the distance fields.
+
+    Returns:
+        Opened walls as (cell index, wall bit) pairs, in opening order.
+    """
+    size = width * height
+    order = [index for index in dead_ends if openings(walls, index) == 1]
+    rng.shuffle(order)
+    target = max(1, round(ratio * len(order))) if ratio > 0 else 0
+
+    opened: list[tuple[int, int]] = []
+    for index in order:
+        if len(opened) >= target:
+            break
+        if openings(walls, index) != 1:
+            continue
+
+        sides: list[int] = []
+        weights: list[float] = []
+        for side in (1, 2, 4, 8):
+            if not walls[index] & side:
+                continue
+            neighbour = neighbour_index(index, side, width, size)
+            if neighbour < 0 or neighbour in blocked:
+                continue
+            if opens_block(walls, width, height, index, side):
+                continue
+            weight = 1.0
+            if solution_length and min(
+                    shortcut(from_entry, to_exit, index, neighbour),
+                    shortcut(from_entry, to_exit, neighbour, index)
+            ) < solution_length:
+                weight = SHORTEN_WEIGHT
+            sides.append(side)
+            weights.append(weight)
+
+        if not sides:
+            continue
+        side = rng.choices(sides, weights)[0]
+        walls[index] &= ~side
+        neighbour = neighbour_index(index, side, width, size)
+        walls[neighbour] &= ~OPPOSITE[side]
+        opened.append((index, side))
+
+    return opened
+
+
+def shortcut(
+        from_entry: Sequence[int],
+        to_exit: Sequence[int],
+        first: int,
+        second: int
+) -> int:
+    """Length of the entry-exit path through an opened wall.
+
+    Returns:
+        Steps from the entry to ``first``, across the wall to ``second``
+        and on to the exit, or a large number if either part is missing.
+    """
+    if from_entry[first] < 0 or to_exit[second] < 0:
+        return len(from_entry) + 1
+    return from_entry[first] + 1 + to_exit[second]
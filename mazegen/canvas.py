@@ -2,6 +2,18 @@
 
 from mazegen.cell import Cell
 from mazegen.direction import Direction
+from mazegen.mask import Mask
+
+# Wall bit of a cell -> (dx, dy) offset of the cell behind that wall.
+OFFSETS: dict[int, tuple[int, int]] = {
+    1: (0, -1),
+    2: (1, 0),
+    4: (0, 1),
+    8: (-1, 0),
+}
+SIDES: dict[tuple[int, int], int] = {
+    offset: side for side, offset in OFFSETS.items()
+}
 
 
 class Canvas():
@@ -25,16 +37,88 @@ class Canvas():
         self.width: int = width
         self.height: int = height
         self.cells: list[Cell] = []
-        self.ft_cells: list[Cell] = []
+        self.mask = Mask(width, height)
         self.entry: tuple[int, int] = entry
         self.exit: tuple[int, int] = exit
         self.dead_ends: list[tuple[Cell, Cell]] = []
         self.solution: str = ""
 
-        for x in range(width):
-            for y in range(height):
+        # Row-major storage: the cell at (x, y) lives at y * width + x.
+        for y in range(height):
+            for x in range(width):
                 self.cells.append(Cell(x, y))
 
+    def reset(self) -> None:
+        """Restore the canvas to its freshly created state in place.
+
+        Closes every wall and clears visited flags, dead ends and the
+        solution without allocating new cells. Cells blocked in
+        ``mask`` stay reserved and are marked as visited again.
+        """
+        for cell in self.cells:
+            cell.direction = Direction.CLOSED
+            cell.is_visited = False
+        for index in self.mask:
+            self.cells[index].is_visited = True
+        self.dead_ends.clear()
+        self.solution = ""
+
+    @property
+    def ft_cells(self) -> tuple[Cell, ...]:
+        """Blocked cells, in row-major order.
+
+        A read-only snapshot built from ``mask`` on every access, so
+        ``append`` and ``remove`` fail instead of doing nothing: use
+        ``block`` to reserve a cell and ``is_blocked`` to test one.
+        """
+        return tuple(self.cells[index] for index in self.mask)
+
+    def is_blocked(self, cell: Cell) -> bool:
+        """Check whether a cell is reserved and must stay closed.
+
+        Args:
+            cell: Cell of this canvas.
+
+        Returns:
+            True if the cell is set in ``mask``.
+        """
+        x, y = cell.coordinate
+        return y * self.width + x in self.mask
+
+    def block(self, cell: Cell) -> None:
+        """Reserve a cell: it stays closed and is never visited.
+
+        Args:
+            cell: Cell of this canvas.
+        """
+        x, y = cell.coordinate
+        self.mask.add(y * self.width + x)
+        cell.is_visited = True
+
+    def wall_grid(self) -> bytearray:
+        """Get the wall values of all cells.
+
+        Returns:
+            One byte per cell in row-major order.
+        """
+        return bytearray(cell.direction.value for cell in self.cells)
+
+    def set_walls(self, walls: bytes | bytearray) -> None:
+        """Set the wall values of all cells from a packed grid.
+
+        Args:
+            walls: One byte per cell in row-major order, as returned by
+                ``wall_grid``.
+
+        Raises:
+            ValueError: If the grid size does not match the canvas.
+        """
+        if len(walls) != len(self.cells):
+            raise ValueError("Wall grid size does not match the canvas")
+        directions = list(Direction)
+        for cell, value in zip(self.cells, walls):
+            cell.direction = directions[value]
+
     def get_cell(self, x: int, y: int) -> Cell | None:
         """Get cell at coordinates.
 
@@ -45,9 +129,8 @@ class Canvas():
         Returns:
             Cell at coordinates or None if not found.
         """
-        for cell in self.cells:
-            if cell.coordinate == (x, y):
-                return cell
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.cells[y * self.width + x]
         return None
 
     def get_neighbours(self, cell: Cell) -> list[Cell]:
@@ -116,6 +199,37 @@ class Canvas():
 
         return accessible
 
+    @staticmethod
+    def wall_side(cell: Cell, neighbour: Cell) -> int:
+        """Get the wall bit of a cell that faces a neighbouring cell.
+
+        Args:
+            cell: The cell owning the wall.
+            neighbour: Adjacent cell behind the wall.
+
+        Returns:
+            1 (N), 2 (E), 4 (S), 8 (W), or 0 if the cells are not adjacent.
+        """
+        dx = neighbour.coordinate[0] - cell.coordinate[0]
+        dy = neighbour.coordinate[1] - cell.coordinate[1]
+        return SIDES.get((dx, dy), 0)
+
+    def get_neighbour(self, cell: Cell, side: int) -> Cell | None:
+        """Get the cell on the other side of a wall.
+
+        Args:
+            cell: The cell owning the wall.
+            side: Wall bit, 1 (N), 2 (E), 4 (S) or 8 (W).
+
+        Returns:
+            Neighbouring cell or None if outside the canvas.
+        """
+        offset = OFFSETS.get(side)
+        if not offset:
+            return None
+        x, y = cell.coordinate
+        return self.get_cell(x + offset[0], y + offset[1])
+
     def remove_wall(self, cell: Cell, neighbour: Cell) -> None:
         """Remove wall between two neighbouring cells.
 
@@ -123,7 +237,7 @@ class Canvas():
             cell: First cell.
             neighbour: Neighbouring cell to remove wall to.
         """
-        if neighbour in self.ft_cells:
+        if self.is_blocked(neighbour):
             return
 
         x, y = cell.coordinate[0], cell.coordinate[1]
@@ -155,3 +269,41 @@ class Canvas():
                 cell.direction = Direction(cell.direction.value - 4)
             if neighbour.direction.value & 1:
                 neighbour.direction = Direction(neighbour.direction.value - 1)
+
+    def open_wall(self, cell: Cell, side: int) -> bool:
+        """Open a wall and the matching wall of the cell behind it.
+
+        Args:
+            cell: The cell owning the wall.
+            side: Wall bit, 1 (N), 2 (E), 4 (S) or 8 (W).
+
+        Returns:
+            True if the wall was closed and is now open; False if it was
+            already open, is on the border or leads to a blocked cell.
+        """
+        neighbour = self.get_neighbour(cell, side)
+        if (not neighbour or not cell.direction.value & side
+                or self.is_blocked(cell) or self.is_blocked(neighbour)):
+            return False
+        opposite = self.wall_side(neighbour, cell)
+        cell.direction = Direction(cell.direction.value & ~side)
+        neighbour.direction = Direction(neighbour.direction.value & ~opposite)
+        return True
+
+    def close_wall(self, cell: Cell, side: int) -> bool:
+        """Close a wall and the matching wall of the cell behind it.
+
+        Args:
+            cell: The cell owning the wall.
+            side: Wall bit, 1 (N), 2 (E), 4 (S) or 8 (W).
+
+        Returns:
+            True if the wall was open and is now closed.
+        """
+        neighbour = self.get_neighbour(cell, side)
+        if not neighbour or cell.direction.value & side:
+            return False
+        opposite = self.wall_side(neighbour, cell)
+        cell.direction = Direction(cell.direction.value | side)
+        neighbour.direction = Direction(neighbour.direction.value | opposite)
+        return True
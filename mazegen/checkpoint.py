@@ -0,0 +1,349 @@
+"""Checkpoints of a maze generation in progress.
+
+A checkpoint holds everything a resumable algorithm needs to finish a
+maze: the wall grid, the visited flags as a bitset, the algorithm state
+(the dfs stack, or the current cell and cursor of hunt and kill), the
+dead ends found so far and the state of the random generator. Resuming
+from it produces the same maze as a run that was never interrupted.
+
+File layout: a little-endian header (magic, version, width, height,
+number of steps, fingerprint, and the lengths of the algorithm name,
+the state and the dead ends), followed by a zlib-compressed body: the
+algorithm name, one wall byte per cell, the visited bitset, the state,
+the dead ends as pairs of cell indexes and the random generator state.
+"""
+
+import os
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Generator, Iterator, NamedTuple
+
+from mazegen.algorithms import Algorithm
+from mazegen.canvas import Canvas
+from mazegen.cell import Cell
+from mazegen.events import Event
+
+if TYPE_CHECKING:
+    import random
+
+MAGIC = b"MZCP"
+VERSION = 1
+HEADER = struct.Struct("<4sHIIQIIII")
+# Random generator state: version, whether a gaussian is pending, and
+# its value; followed by the Mersenne Twister words.
+RANDOM = struct.Struct("<I?d")
+TWISTER_WORDS = 625
+
+# Steps between two checkpoints when none is configured.
+DEFAULT_EVERY = 1_000_000
+
+# Real paths of the checkpoint files claimed by generations running in
+# this process.
+IN_USE: set[str] = set()
+IN_USE_LOCK = threading.Lock()
+
+# Visited flags <-> '0' and '1' digits, to pack flags through int().
+FLAG_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+DIGIT_FLAGS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+class Checkpoint(NamedTuple):
+    """State of an interrupted generation."""
+    algorithm: str
+    fingerprint: int
+    width: int
+    height: int
+    steps: int
+    walls: bytes
+    visited: bytes
+    state: "array[int]"
+    dead_ends: "array[int]"
+    random_state: tuple[Any, ...]
+
+
+def fingerprint(canvas: Canvas, algorithm: str, seed: int | None) -> int:
+    """Identify the inputs of a generation.
+
+    A checkpoint is only resumed by a generation with the same
+    algorithm, seed, size and blocked cells.
+
+    Args:
+        canvas: Canvas about to be carved.
+        algorithm: Algorithm name.
+        seed: Configured seed.
+
+    Returns:
+        A 32-bit checksum.
+    """
+    key = f"{algorithm} {seed} {canvas.width}x{canvas.height} ".encode()
+    return zlib.crc32(canvas.mask.bits, zlib.crc32(key))
+
+
+def pack_flags(flags: bytes) -> bytes:
+    """Pack one flag byte (0 or 1) per cell into a bitset.
+
+    Cell ``i`` is bit ``i % 8`` of byte ``i // 8``, as in ``Mask``.
+    """
+    if not flags:
+        return b""
+    bits = int(flags.translate(FLAG_DIGITS)[::-1], 2)
+    return bits.to_bytes((len(flags) + 7) // 8, "little")
+
+
+def unpack_flags(bits: bytes, count: int) -> bytes:
+    """Unpack a bitset from ``pack_flags`` into one byte per cell."""
+    if not count:
+        return b""
+    digits = format(int.from_bytes(bits, "little"), "b").zfill(count)
+    return digits[::-1][:count].encode().translate(DIGIT_FLAGS)
+
+
+def capture(
+        canvas: Canvas,
+        algorithm: str,
+        key: int,
+        steps: int,
+        state: "array[int]",
+        rng: "random.Random"
+) -> Checkpoint:
+    """Take a checkpoint between two steps of a resumable algorithm.
+
+    Args:
+        canvas: Canvas being carved.
+        algorithm: Algorithm name.
+        key: Result of ``fingerprint``.
+        steps: Number of events generated so far.
+        state: State array of the algorithm.
+        rng: Random generator of the carving.
+
+    Returns:
+        The checkpoint.
+    """
+    width = canvas.width
+    dead_ends = array("i")
+    for cell, neighbour in canvas.dead_ends:
+        for x, y in (cell.coordinate, neighbour.coordinate):
+            dead_ends.append(y * width + x)
+    return Checkpoint(
+        algorithm, key, width, canvas.height, steps,
+        bytes(canvas.wall_grid()),
+        pack_flags(bytes(cell.is_visited for cell in canvas.cells)),
+        array("i", state), dead_ends, rng.getstate()
+    )
+
+
+def restore(
+        checkpoint: Checkpoint,
+        canvas: Canvas,
+        rng: "random.Random"
+) -> None:
+    """Put a canvas and a random generator back in a checkpointed state.
+
+    Args:
+        checkpoint: Checkpoint of a generation on a canvas of this size.
+        canvas: Canvas to update in place.
+        rng: Random generator to update.
+
+    Raises:
+        ValueError: If the canvas size does not match the checkpoint.
+    """
+    if (canvas.width, canvas.height) != (checkpoint.width, checkpoint.height):
+        raise ValueError("Canvas size does not match the checkpoint")
+    cells = canvas.cells
+    canvas.set_walls(checkpoint.walls)
+    visited = unpack_flags(checkpoint.visited, len(cells))
+    for cell, flag in zip(cells, visited):
+        cell.is_visited = bool(flag)
+    pairs = checkpoint.dead_ends
+    canvas.dead_ends[:] = [
+        (cells[pairs[i]], cells[pairs[i + 1]])
+        for i in range(0, len(pairs), 2)
+    ]
+    rng.setstate(checkpoint.random_state)
+
+
+def save(checkpoint: Checkpoint, path: str) -> None:
+    """Write a checkpoint to a binary file.
+
+    The file is written under a temporary name and renamed, so a killed
+    process leaves either the previous checkpoint or the new one.
+
+    Args:
+        checkpoint: Checkpoint to store.
+        path: Destination path.
+    """
+    version, words, gauss = checkpoint.random_state
+    twister = array("I", words)
+    state = array("i", checkpoint.state)
+    dead_ends = array("i", checkpoint.dead_ends)
+    if sys.byteorder == "big":
+        for values in (twister, state, dead_ends):
+            values.byteswap()
+    name = checkpoint.algorithm.encode()
+    body = b"".join((
+        name, checkpoint.walls, checkpoint.visited, state.tobytes(),
+        dead_ends.tobytes(),
+        RANDOM.pack(version, gauss is not None, gauss or 0.0),
+        twister.tobytes(),
+    ))
+
+    temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(HEADER.pack(
+            MAGIC, VERSION, checkpoint.width, checkpoint.height,
+            checkpoint.steps, checkpoint.fingerprint, len(name),
+            len(state), len(dead_ends) // 2
+        ))
+        file.write(zlib.compress(body, 1))
+    os.replace(temporary, path)
+
+
+def load(path: str) -> Checkpoint:
+    """Read a checkpoint written by ``save``.
+
+    Args:
+        path: Path to the checkpoint file.
+
+    Returns:
+        The stored checkpoint.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not a valid checkpoint.
+    """
+    with open(path, "rb") as file:
+        header = file.read(HEADER.size)
+        compressed = file.read()
+
+    if len(header) != HEADER.size:
+        raise ValueError("Checkpoint file is truncated")
+    (magic, version, width, height, steps, key, name_length,
+     state_length, dead_end_pairs) = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a maze checkpoint file")
+    try:
+        body = zlib.decompress(compressed)
+    except zlib.error:
+        raise ValueError("Checkpoint file is corrupted")
+
+    size = width * height
+    lengths = (
+        name_length, size, (size + 7) // 8, 4 * state_length,
+        8 * dead_end_pairs, RANDOM.size, 4 * TWISTER_WORDS,
+    )
+    if len(body) != sum(lengths):
+        raise ValueError("Checkpoint file is truncated")
+    parts = []
+    position = 0
+    for length in lengths:
+        parts.append(body[position:position + length])
+        position += length
+    (name, walls, visited, state_bytes, dead_end_bytes, random_bytes,
+     words) = parts
+
+    state = array("i", state_bytes)
+    dead_ends = array("i", dead_end_bytes)
+    twister = array("I", words)
+    if sys.byteorder == "big":
+        for values in (twister, state, dead_ends):
+            values.byteswap()
+    random_version, has_gauss, gauss = RANDOM.unpack(random_bytes)
+    return Checkpoint(
+        name.decode(), key, width, height, steps, walls, visited, state,
+        dead_ends,
+        (random_version, tuple(twister), gauss if has_gauss else None)
+    )
+
+
+@contextmanager
+def claim(path: str) -> Iterator[None]:
+    """Reserve a checkpoint file for one generation of this process.
+
+    Two generations sharing a file would overwrite, reject or remove
+    each other's checkpoints.
+
+    Args:
+        path: Checkpoint file.
+
+    Raises:
+        ValueError: If another generation of this process holds it.
+    """
+    key = os.path.realpath(path)
+    with IN_USE_LOCK:
+        if key in IN_USE:
+            raise ValueError(
+                f"Checkpoint '{path}' is used by another generation"
+            )
+        IN_USE.add(key)
+    try:
+        yield
+    finally:
+        with IN_USE_LOCK:
+            IN_USE.discard(key)
+
+
+def checkpointed(
+        canvas: Canvas,
+        algorithm: Algorithm,
+        start_cell: Cell,
+        rng: "random.Random",
+        path: str,
+        seed: int | None,
+        every: int = DEFAULT_EVERY
+) -> Generator[Event, None, None]:
+    """Run a resumable algorithm, saving a checkpoint periodically.
+
+    If ``path`` holds a checkpoint of the same generation, carving
+    resumes from it instead of starting over; the events generated
+    before it was taken are not repeated. A last checkpoint is saved
+    when carving ends: remove the file once the maze is complete.
+
+    Args:
+        canvas: The maze canvas to generate on.
+        algorithm: Registry entry of an algorithm with the
+            ``checkpoint`` capability.
+        start_cell: Starting cell for a new generation.
+        rng: Random number generator, restored when resuming.
+        path: Checkpoint file.
+        seed: Configured seed, part of the fingerprint.
+        every: Number of steps between two checkpoints.
+
+    Yields:
+        The events of the algorithm.
+
+    Raises:
+        ValueError: If the algorithm cannot be checkpointed, or the
+            file is not a checkpoint of this generation.
+    """
+    start, resume = algorithm.load_resume()
+    key = fingerprint(canvas, algorithm.name, seed)
+    if os.path.exists(path):
+        try:
+            checkpoint = load(path)
+        except OSError as e:
+            raise ValueError(f"Cannot read checkpoint: {e}")
+        if (checkpoint.fingerprint != key
+                or checkpoint.algorithm != algorithm.name):
+            raise ValueError(
+                f"Checkpoint '{path}' belongs to another generation"
+            )
+        restore(checkpoint, canvas, rng)
+        state = checkpoint.state
+        steps = checkpoint.steps
+    else:
+        state = start(canvas, start_cell)
+        steps = 0
+
+    for event in resume(canvas, state, rng):
+        yield event
+        steps += 1
+        if not steps % every:
+            save(
+                capture(canvas, algorithm.name, key, steps, state, rng),
+                path
+            )
+    save(capture(canvas, algorithm.name, key, steps, state, rng), path)
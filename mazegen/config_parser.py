@@ -2,6 +2,48 @@
 
 from typing import Any
 
+from mazegen.algorithms import lookup
+
+
+class ConfigError(ValueError):
+    """Raised when configuration values are missing or invalid.
+
+    Attributes:
+        key: Key whose value is invalid, or None when the error is not
+            about a single value, e.g. missing keys.
+    """
+
+    def __init__(self, message: str, key: str | None = None) -> None:
+        """Initialize the error.
+
+        Args:
+            message: What is wrong.
+            key: Key whose value is invalid, if any.
+        """
+        super().__init__(message)
+        self.key = key
+
+    def __reduce__(self) -> tuple[type, tuple[Any, ...]]:
+        """Keep the key when the error crosses a process boundary."""
+        return type(self), (str(self), self.key)
+
+
+def to_raw_config(values: dict[str, Any]) -> dict[str, str]:
+    """Turn JSON config values into the ``KEY=VALUE`` string form.
+
+    Args:
+        values: Config mapping; coordinates may be given as lists.
+
+    Returns:
+        Mapping of upper-case keys to strings.
+    """
+    raw: dict[str, str] = {}
+    for key, value in values.items():
+        if isinstance(value, (list, tuple)):
+            value = ",".join(map(str, value))
+        raw[str(key).upper()] = str(value)
+    return raw
+
 
 class ConfigParser:
     """Parse and validate maze configuration file."""
@@ -28,66 +70,109 @@ class ConfigParser:
             raise ValueError
         return (int(parts[0].strip()), int(parts[1].strip()))
 
-    def convert_values(self, raw: dict[str, str]) -> dict[str, Any]:
+    def validate(self, raw: dict[str, str]) -> dict[str, Any]:
         """Convert raw string values to appropriate types.
 
+        Unlike ``convert_values`` this never prints; it is meant for
+        callers that build configurations in memory. ``OUTPUT_FILE`` is
+        optional here and defaults to None.
+
         Args:
             raw: Dictionary of raw key-value string pairs.
 
         Returns:
-            Dictionary with converted values, or empty dict on error.
+            Dictionary with converted values.
+
+        Raises:
+            ConfigError: If a value is missing or invalid; its ``key``
+                names the invalid value.
         """
+        missing = self.required_keys - {"OUTPUT_FILE"} - raw.keys()
+        if missing:
+            raise ConfigError(
+                f"Missing required keys: {', '.join(sorted(missing))}"
+            )
+
         config: dict[str, Any] = {}
 
         # Height/width -> int
-        try:
-            config["WIDTH"] = int(raw["WIDTH"])
-            config["HEIGHT"] = int(raw["HEIGHT"])
-        except ValueError:
-            print("Error: WIDTH and HEIGHT must be integers.")
-            return {}
-
-        if config["WIDTH"] <= 0 or config["HEIGHT"] <= 0:
-            print("Error: WIDTH and HEIGHT must be positive integers.")
-            return {}
+        for key in ("WIDTH", "HEIGHT"):
+            try:
+                config[key] = int(raw[key])
+            except ValueError:
+                raise ConfigError("WIDTH and HEIGHT must be integers.", key)
+        for key in ("WIDTH", "HEIGHT"):
+            if config[key] <= 0:
+                raise ConfigError(
+                    "WIDTH and HEIGHT must be positive integers.", key
+                )
 
         # Entry/exit -> int tuple
-        try:
-            config["ENTRY"] = self.parse_coordinates(raw["ENTRY"])
-            config["EXIT"] = self.parse_coordinates(raw["EXIT"])
-        except ValueError:
-            print("Error: ENTRY and EXIT must be in format 'x,y' with "
-                  "integers.")
-            return {}
+        for key in ("ENTRY", "EXIT"):
+            try:
+                config[key] = self.parse_coordinates(raw[key])
+            except ValueError:
+                raise ConfigError("ENTRY and EXIT must be in format 'x,y' "
+                                  "with integers.", key)
 
         if config["ENTRY"] == config["EXIT"]:
-            print("Error: ENTRY and EXIT must be different.")
-            return {}
+            raise ConfigError("ENTRY and EXIT must be different.", "EXIT")
 
         entry_x, entry_y = config["ENTRY"]
         if not (0 <= entry_x < config["WIDTH"]
                 and 0 <= entry_y < config["HEIGHT"]):
-            print("Error: ENTRY is out of bounds.")
-            return {}
+            raise ConfigError("ENTRY is out of bounds.", "ENTRY")
 
         exit_x, exit_y = config["EXIT"]
         if not (0 <= exit_x < config["WIDTH"]
                 and 0 <= exit_y < config["HEIGHT"]):
-            print("Error: EXIT is out of bounds.")
-            return {}
+            raise ConfigError("EXIT is out of bounds.", "EXIT")
 
         # Perfect -> bool
         if raw["PERFECT"].lower() not in ("true", "false"):
-            print("Error: PERFECT must be 'True' or 'False'.")
-            return {}
+            raise ConfigError("PERFECT must be 'True' or 'False'.", "PERFECT")
         config["PERFECT"] = raw["PERFECT"].lower() == "true"
 
-        # Output file name -> str
-        config["OUTPUT_FILE"] = raw["OUTPUT_FILE"]
+        # Braid ratio -> float | None
+        if raw.get("BRAID"):
+            try:
+                config["BRAID"] = float(raw["BRAID"])
+            except ValueError:
+                raise ConfigError("BRAID must be a number.", "BRAID")
+            if not 0 <= config["BRAID"] <= 1:
+                raise ConfigError("BRAID must be between 0 and 1.", "BRAID")
+            if config["PERFECT"] and config["BRAID"]:
+                raise ConfigError("BRAID requires PERFECT=False.", "BRAID")
+        else:
+            config["BRAID"] = None
 
-        if not config["OUTPUT_FILE"]:
-            print("Error: Output file name is missing")
-            return {}
+        # Stencil file name -> str | None
+        config["STENCIL"] = raw.get("STENCIL") or None
+
+        # Checkpoint file name -> str | None, steps between checkpoints
+        config["CHECKPOINT"] = raw.get("CHECKPOINT") or None
+        if raw.get("CHECKPOINT_EVERY"):
+            try:
+                config["CHECKPOINT_EVERY"] = int(raw["CHECKPOINT_EVERY"])
+            except ValueError:
+                raise ConfigError(
+                    "CHECKPOINT_EVERY must be an integer.", "CHECKPOINT_EVERY"
+                )
+            if config["CHECKPOINT_EVERY"] <= 0:
+                raise ConfigError(
+                    "CHECKPOINT_EVERY must be positive.", "CHECKPOINT_EVERY"
+                )
+        else:
+            config["CHECKPOINT_EVERY"] = None
+
+        # Output file name -> str | None
+        if "OUTPUT_FILE" in raw:
+            config["OUTPUT_FILE"] = raw["OUTPUT_FILE"]
+            if not config["OUTPUT_FILE"]:
+                raise ConfigError("Output file name is missing",
+                                  "OUTPUT_FILE")
+        else:
+            config["OUTPUT_FILE"] = None
 
         # Seed -> int | None
         if raw.get("SEED"):
@@ -102,14 +187,30 @@ class ConfigParser:
         algorithm = raw.get("ALGORITHM")
         if not algorithm:
             config["ALGORITHM"] = "dfs"
-        elif algorithm not in ("dfs", "hunt_and_kill"):
-            print("Error: ALGORITHM must be 'dfs' or 'hunt_and_kill'.")
-            return {}
         else:
+            try:
+                lookup(algorithm)
+            except ValueError as e:
+                raise ConfigError(str(e), "ALGORITHM")
             config["ALGORITHM"] = algorithm
 
         return config
 
+    def convert_values(self, raw: dict[str, str]) -> dict[str, Any]:
+        """Convert raw string values to appropriate types.
+
+        Args:
+            raw: Dictionary of raw key-value string pairs.
+
+        Returns:
+            Dictionary with converted values, or empty dict on error.
+        """
+        try:
+            return self.validate(raw)
+        except ConfigError as e:
+            print(f"Error: {e}")
+            return {}
+
     def parse_config(self, filepath: str) -> dict[str, Any]:
         """Parse a maze configuration file.
 
@@ -0,0 +1,80 @@
+"""Typed events emitted by the maze generation algorithms."""
+
+from array import array
+from enum import IntEnum
+from typing import Iterable, Iterator, NamedTuple
+
+EVENT_SIZE = 4
+
+
+class EventKind(IntEnum):
+    """Kinds of generation steps."""
+    CARVE = 0
+    BACKTRACK = 1
+    HUNT_SCAN = 2
+
+
+class Event(NamedTuple):
+    """A single generation step.
+
+    Attributes:
+        kind: The ``EventKind`` of the step.
+        x: X coordinate of the cell the step happened at.
+        y: Y coordinate of the cell the step happened at.
+        side: Wall bit opened by a carve (1 N, 2 E, 4 S, 8 W), else 0.
+    """
+    kind: int
+    x: int
+    y: int
+    side: int = 0
+
+
+def carve(x: int, y: int, side: int) -> Event:
+    """Create an event for a wall opened from (x, y) towards ``side``."""
+    return Event(EventKind.CARVE, x, y, side)
+
+
+def backtrack(x: int, y: int) -> Event:
+    """Create an event for leaving the exhausted cell (x, y)."""
+    return Event(EventKind.BACKTRACK, x, y)
+
+
+def hunt_scan(x: int, y: int) -> Event:
+    """Create an event for a hunt that resumed carving at (x, y)."""
+    return Event(EventKind.HUNT_SCAN, x, y)
+
+
+def batched(events: Iterable[Event], size: int) -> Iterator["array[int]"]:
+    """Group events into flat integer arrays.
+
+    Each event takes ``EVENT_SIZE`` consecutive items (kind, x, y, side).
+
+    Args:
+        events: Events to group.
+        size: Maximum number of events per array.
+
+    Yields:
+        Arrays holding up to ``size`` events each.
+    """
+    batch: array[int] = array("i")
+    limit = size * EVENT_SIZE
+    for event in events:
+        batch.extend(event)
+        if len(batch) >= limit:
+            yield batch
+            batch = array("i")
+    if batch:
+        yield batch
+
+
+def unbatched(batch: "array[int]") -> Iterator[Event]:
+    """Turn a flat event array back into events.
+
+    Args:
+        batch: Array produced by ``batched``.
+
+    Yields:
+        The events stored in the array.
+    """
+    for i in range(0, len(batch), EVENT_SIZE):
+        yield Event(batch[i], batch[i + 1], batch[i + 2], batch[i + 3])
@@ -0,0 +1,432 @@
+"""Multi-level mazes: floors stacked on top of each other.
+
+A level canvas stores six wall bits per cell in one byte: the four of a
+flat maze (1 N, 2 E, 4 S, 8 W) plus 16 for the ceiling (up) and 32 for
+the floor (down). Cells are stored floor by floor, each floor in
+row-major order, so the cell at (x, y, z) lives at
+``(z * height + y) * width + x``.
+
+Generation and solving work on that byte array directly. Besides the
+walls, depth-first generation needs a stack of cell indexes, Kruskal's
+algorithm a parent index per cell and the solver a queue of indexes and
+one byte per cell: at most six bytes per cell in total.
+"""
+
+import argparse
+import os
+import random
+import sys
+from array import array
+from typing import Callable, Iterator
+
+from mazegen.streams import CARVE, substream
+
+NORTH, EAST, SOUTH, WEST, UP, DOWN = 1, 2, 4, 8, 16, 32
+CLOSED = 63
+
+# Set on visited cells while carving, cleared afterwards.
+VISITED = 64
+
+OPPOSITE = {
+    NORTH: SOUTH, EAST: WEST, SOUTH: NORTH, WEST: EAST, UP: DOWN, DOWN: UP,
+}
+LETTERS = {NORTH: "N", EAST: "E", SOUTH: "S", WEST: "W", UP: "U", DOWN: "D"}
+
+# Byte value -> hex digit of its four flat walls.
+HEX_DIGITS = bytes(ord(f"{value & 15:X}") for value in range(256))
+# Byte value -> digit of its vertical walls: 1 up open, 2 down open.
+STAIR_DIGITS = bytes(
+    ord(str((not value & UP) + 2 * (not value & DOWN)))
+    for value in range(256)
+)
+
+
+class LevelCanvas:
+    """A multi-floor maze grid with all walls in one byte array."""
+
+    def __init__(
+            self,
+            width: int,
+            height: int,
+            depth: int,
+            entry: tuple[int, int, int],
+            exit: tuple[int, int, int]
+    ) -> None:
+        """Initialize a canvas with every wall closed.
+
+        Args:
+            width: Width of a floor in cells.
+            height: Height of a floor in cells.
+            depth: Number of floors.
+            entry: Entry coordinates (x, y, z).
+            exit: Exit coordinates (x, y, z).
+
+        Raises:
+            ValueError: If a size is not positive, or the entry or exit
+                is outside the canvas or they are the same cell.
+        """
+        if width <= 0 or height <= 0 or depth <= 0:
+            raise ValueError("WIDTH, HEIGHT and DEPTH must be positive.")
+        self.width = width
+        self.height = height
+        self.depth = depth
+        self.plane = width * height
+        for name, point in (("ENTRY", entry), ("EXIT", exit)):
+            if not all(0 <= value < limit for value, limit in zip(
+                    point, (width, height, depth))):
+                raise ValueError(f"{name} is out of bounds.")
+        if entry == exit:
+            raise ValueError("ENTRY and EXIT must be different.")
+        self.entry = entry
+        self.exit = exit
+        self.walls = bytearray([CLOSED]) * (self.plane * depth)
+        self.solution = ""
+        self.steps = {
+            NORTH: -width, EAST: 1, SOUTH: width, WEST: -1,
+            UP: self.plane, DOWN: -self.plane,
+        }
+
+    def index(self, x: int, y: int, z: int) -> int:
+        """Get the index of the cell at coordinates."""
+        return (z * self.height + y) * self.width + x
+
+    def coordinates(self, index: int) -> tuple[int, int, int]:
+        """Get the coordinates (x, y, z) of the cell at an index."""
+        z, rest = divmod(index, self.plane)
+        y, x = divmod(rest, self.width)
+        return x, y, z
+
+    def sides(self, index: int) -> Iterator[int]:
+        """Iterate over the walls of a cell that have a cell behind."""
+        x, y, z = self.coordinates(index)
+        if y > 0:
+            yield NORTH
+        if x < self.width - 1:
+            yield EAST
+        if y < self.height - 1:
+            yield SOUTH
+        if x > 0:
+            yield WEST
+        if z < self.depth - 1:
+            yield UP
+        if z > 0:
+            yield DOWN
+
+    def open_wall(self, index: int, side: int) -> int:
+        """Open a wall of a cell and the facing wall of its neighbour.
+
+        Args:
+            index: Index of the cell.
+            side: Wall bit; the neighbour must exist.
+
+        Returns:
+            Index of the neighbour.
+        """
+        neighbour = index + self.steps[side]
+        self.walls[index] &= ~side
+        self.walls[neighbour] &= ~OPPOSITE[side]
+        return neighbour
+
+    def floor_visits(self) -> dict[int, list[tuple[int, int, str]]]:
+        """Split the solution into the parts spent on each floor.
+
+        Returns:
+            For each floor the solution goes through, its visits in
+            order: start coordinates (x, y) and the N/E/S/W moves made
+            before taking the stairs or reaching the exit.
+        """
+        visits: dict[int, list[tuple[int, int, str]]] = {}
+        x, y, z = self.entry
+        moves: list[str] = []
+        offsets = {"N": (0, -1), "E": (1, 0), "S": (0, 1), "W": (-1, 0)}
+        start = (x, y)
+        for letter in self.solution + "U":
+            if letter in offsets:
+                moves.append(letter)
+                dx, dy = offsets[letter]
+                x, y = x + dx, y + dy
+                continue
+            visits.setdefault(z, []).append((*start, "".join(moves)))
+            z += 1 if letter == "U" else -1
+            start = (x, y)
+            moves = []
+        return visits
+
+    def floor_hex(
+            self,
+            z: int,
+            visits: dict[int, list[tuple[int, int, str]]] | None = None
+    ) -> str:
+        """Encode one floor in the ``fill_output`` format.
+
+        The hex grid, entry and exit lines are read by
+        ``maze_io.from_hex``. The solution line holds the moves made on
+        this floor, every visit in order with no separator, and is
+        empty when the solution does not go through the floor.
+        ``from_hex`` ignores the lines after it:
+
+        - ``FLOOR z/depth ENTRY ez EXIT xz``: the floors of the entry
+          and the exit;
+        - ``PATH x,y:n ...``: the start cell of each visit and the
+          number of solution line moves made during it;
+        - one row of digits per grid row for the stairs: 1 when the
+          ceiling is open, 2 when the floor is, 3 for both.
+
+        Args:
+            z: Floor number, 0 for the bottom floor.
+            visits: Result of ``floor_visits``, to avoid computing it
+                again for every floor.
+
+        Returns:
+            Text of the floor.
+        """
+        if visits is None:
+            visits = self.floor_visits()
+        floor_visits = visits.get(z, [])
+        start = z * self.plane
+        floor = self.walls[start:start + self.plane]
+        hex_rows = floor.translate(HEX_DIGITS).decode()
+        stair_rows = floor.translate(STAIR_DIGITS).decode()
+        rows = range(0, self.plane, self.width)
+        return (
+            "\n".join(hex_rows[row:row + self.width] for row in rows)
+            + "\n\n"
+            f"{self.entry[0]}, {self.entry[1]}\n"
+            f"{self.exit[0]}, {self.exit[1]}\n"
+            + "".join(moves for _, _, moves in floor_visits) + "\n"
+            f"FLOOR {z}/{self.depth} ENTRY {self.entry[2]} "
+            f"EXIT {self.exit[2]}\n"
+            + " ".join(
+                ["PATH"] + [
+                    f"{x},{y}:{len(moves)}" for x, y, moves in floor_visits
+                ]
+            ) + "\n"
+            + "\n".join(stair_rows[row:row + self.width] for row in rows)
+            + "\n"
+        )
+
+
+def generate_dfs(canvas: LevelCanvas, rng: random.Random) -> None:
+    """Carve a perfect maze with a depth-first search from the entry.
+
+    Visited cells are flagged in the wall bytes themselves, so the only
+    extra memory is the stack.
+
+    Args:
+        canvas: Canvas with every wall closed.
+        rng: Random number generator.
+    """
+    walls = canvas.walls
+    steps = canvas.steps
+    start = canvas.index(*canvas.entry)
+    walls[start] |= VISITED
+    stack = array("I", [start])
+
+    while stack:
+        cell = stack[-1]
+        options = [
+            side for side in canvas.sides(cell)
+            if not walls[cell + steps[side]] & VISITED
+        ]
+        if not options:
+            stack.pop()
+            continue
+        neighbour = canvas.open_wall(cell, rng.choice(options))
+        walls[neighbour] |= VISITED
+        stack.append(neighbour)
+
+    walls[:] = walls.translate(bytes(value & CLOSED for value in range(256)))
+
+
+def shuffled_range(count: int, rng: random.Random) -> Iterator[int]:
+    """Iterate over ``range(count)`` in a random order without storing it.
+
+    Uses a four-round Feistel network, a bijection on the smallest even
+    power of two covering ``count``, and skips the values past the end.
+
+    Args:
+        count: Number of values.
+        rng: Random number generator for the round keys.
+
+    Yields:
+        Every value below ``count`` exactly once.
+    """
+    half = max(1, ((count - 1).bit_length() + 1) // 2)
+    mask = (1 << half) - 1
+    keys = [rng.getrandbits(32) for _ in range(4)]
+    for value in range(1 << (2 * half)):
+        left, right = value >> half, value & mask
+        for key in keys:
+            mixed = ((right ^ key) * 0x9E3779B1) & 0xFFFFFFFF
+            left, right = right, left ^ ((mixed ^ (mixed >> 15)) & mask)
+        value = (left << half) | right
+        if value < count:
+            yield value
+
+
+def generate_kruskal(canvas: LevelCanvas, rng: random.Random) -> None:
+    """Carve a perfect maze with Kruskal's algorithm.
+
+    Walls are visited in a random order generated on the fly and opened
+    when they separate two unconnected regions, tracked by a union-find
+    forest with one parent index per cell.
+
+    Args:
+        canvas: Canvas with every wall closed.
+        rng: Random number generator.
+    """
+    size = len(canvas.walls)
+    width, height, depth = canvas.width, canvas.height, canvas.depth
+    parent = array("I", range(size))
+    remaining = size - 1
+
+    # Wall 3 * cell + axis is the east (0), south (1) or up (2) wall.
+    for wall in shuffled_range(3 * size, rng):
+        if not remaining:
+            break
+        cell, axis = divmod(wall, 3)
+        x, y, z = canvas.coordinates(cell)
+        if axis == 0:
+            if x == width - 1:
+                continue
+            side = EAST
+        elif axis == 1:
+            if y == height - 1:
+                continue
+            side = SOUTH
+        else:
+            if z == depth - 1:
+                continue
+            side = UP
+
+        roots = []
+        for node in (cell, cell + canvas.steps[side]):
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            roots.append(node)
+        if roots[0] != roots[1]:
+            parent[roots[1]] = roots[0]
+            canvas.open_wall(cell, side)
+            remaining -= 1
+
+
+ALGORITHMS: dict[str, Callable[[LevelCanvas, random.Random], None]] = {
+    "dfs": generate_dfs,
+    "kruskal": generate_kruskal,
+}
+
+
+def solve_levels(canvas: LevelCanvas) -> str:
+    """Find the shortest path from the entry to the exit with a BFS.
+
+    Args:
+        canvas: Generated canvas.
+
+    Returns:
+        Path as a string of directions (N, E, S, W, U, D), or an empty
+        string if the exit cannot be reached.
+    """
+    walls = canvas.walls
+    steps = canvas.steps
+    entry = canvas.index(*canvas.entry)
+    exit = canvas.index(*canvas.exit)
+
+    # Wall crossed to reach each cell; VISITED marks the entry.
+    arrival = bytearray(len(walls))
+    arrival[entry] = VISITED
+    queue = array("I", [entry])
+    head = 0
+    while head < len(queue) and not arrival[exit]:
+        cell = queue[head]
+        head += 1
+        for side in canvas.sides(cell):
+            neighbour = cell + steps[side]
+            if not walls[cell] & side and not arrival[neighbour]:
+                arrival[neighbour] = side
+                queue.append(neighbour)
+
+    if not arrival[exit]:
+        return ""
+    moves: list[str] = []
+    cell = exit
+    while cell != entry:
+        side = arrival[cell]
+        moves.append(LETTERS[side])
+        cell -= steps[side]
+    return "".join(reversed(moves))
+
+
+def floor_path(path: str, z: int) -> str:
+    """Get the output file name of a floor: 'maze.txt' -> 'maze.3.txt'."""
+    root, extension = os.path.splitext(path)
+    return f"{root}.{z}{extension}"
+
+
+def write_floors(canvas: LevelCanvas, path: str) -> list[str]:
+    """Write every floor to its own file, see ``LevelCanvas.floor_hex``.
+
+    Args:
+        canvas: Generated canvas.
+        path: Output file name; floor z goes to ``floor_path(path, z)``.
+
+    Returns:
+        The file names, bottom floor first.
+    """
+    names = []
+    visits = canvas.floor_visits()
+    for z in range(canvas.depth):
+        name = floor_path(path, z)
+        with open(name, "w") as file:
+            file.write(canvas.floor_hex(z, visits))
+        names.append(name)
+    return names
+
+
+def parse_point(value: str) -> tuple[int, int, int]:
+    """Parse 'x,y,z' into a tuple of three integers."""
+    parts = value.split(",")
+    if len(parts) != 3:
+        raise argparse.ArgumentTypeError("expected 'x,y,z'")
+    try:
+        x, y, z = (int(part) for part in parts)
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected integers")
+    return x, y, z
+
+
+def main() -> None:
+    """Parse command line arguments, then generate, solve and write."""
+    parser = argparse.ArgumentParser(description="Multi-level maze generator")
+    parser.add_argument("--width", type=int, required=True)
+    parser.add_argument("--height", type=int, required=True)
+    parser.add_argument("--depth", type=int, required=True,
+                        help="number of floors")
+    parser.add_argument("--entry", type=parse_point, default=(0, 0, 0),
+                        help="entry cell 'x,y,z' (default: 0,0,0)")
+    parser.add_argument("--exit", type=parse_point, default=None,
+                        help="exit cell 'x,y,z' (default: opposite corner)")
+    parser.add_argument("--algorithm", choices=sorted(ALGORITHMS),
+                        default="dfs")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", required=True,
+                        help="output file name, numbered per floor")
+    args = parser.parse_args()
+
+    exit = args.exit or (args.width - 1, args.height - 1, args.depth - 1)
+    try:
+        canvas = LevelCanvas(
+            args.width, args.height, args.depth, args.entry, exit
+        )
+        ALGORITHMS[args.algorithm](canvas, substream(args.seed, CARVE))
+        canvas.solution = solve_levels(canvas)
+        names = write_floors(canvas, args.output)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"{len(names)} floors written, solution length "
+          f"{len(canvas.solution)}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""Bulk job manifests: many maze configurations in one file.
+
+Two formats are read, both in a single streaming pass:
+
+JSON Lines, one configuration object per line::
+
+    {"NAME": "small", "WIDTH": 10, "HEIGHT": 8, "ENTRY": [0, 0],
+     "EXIT": [9, 7], "PERFECT": true, "SEED": 1}
+
+Sections of ``KEY=VALUE`` lines, as in a single configuration file.
+Keys given before the first section apply to every section::
+
+    PERFECT=True
+    OUTPUT_FILE=mazes/{name}.txt
+
+    [small]
+    WIDTH=10
+    HEIGHT=8
+    ENTRY=0,0
+    EXIT=9,7
+
+In both formats, ``{name}`` in ``OUTPUT_FILE`` and ``CHECKPOINT`` is
+replaced by the name of the configuration: the section name, or
+``NAME`` for JSON Lines, which defaults to the line number.
+
+Each configuration is validated with ``ConfigParser.validate`` and must
+set ``OUTPUT_FILE``, as every entry is written out. Errors are raised as
+``ManifestError`` with the line number they refer to: the line of the
+invalid key, or else the line where the configuration starts.
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import (
+    Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+)
+from typing import Any, Iterable, Iterator, NamedTuple
+
+from mazegen.config_parser import ConfigError, ConfigParser, to_raw_config
+
+FORMATS = ("jsonl", "sections")
+
+# Builds submitted ahead of the results being read, per worker.
+IN_FLIGHT_PER_WORKER = 2
+
+
+class ManifestError(ConfigError):
+    """Raised when a manifest line or configuration is invalid."""
+
+    def __init__(
+            self,
+            reason: str,
+            line: int,
+            name: str | None = None
+    ) -> None:
+        """Initialize the error.
+
+        Args:
+            reason: What is wrong.
+            line: Line number the error refers to, starting at 1. For
+                an invalid configuration, the line of the key at fault,
+                or the line where it starts.
+            name: Name of the configuration, if known.
+        """
+        where = f"line {line}" if name is None else f"line {line} ({name})"
+        super().__init__(f"{where}: {reason}")
+        self.reason = reason
+        self.line = line
+        self.name = name
+
+    def __reduce__(self) -> tuple[type, tuple[str, int, str | None]]:
+        """Keep the fields when the error crosses a process boundary."""
+        return ManifestError, (self.reason, self.line, self.name)
+
+
+class ManifestEntry(NamedTuple):
+    """A validated configuration read from a manifest."""
+    name: str
+    line: int
+    config: dict[str, Any]
+
+
+def detect_format(line: str) -> str:
+    """Guess the manifest format from its first significant line."""
+    return "jsonl" if line.lstrip().startswith("{") else "sections"
+
+
+def parse_manifest(
+        lines: Iterable[str],
+        fmt: str | None = None
+) -> Iterator[ManifestEntry]:
+    """Parse manifest lines into validated configurations.
+
+    Lines are consumed as entries are requested, so the whole manifest
+    is never held in memory. Blank lines and lines starting with '#'
+    are ignored.
+
+    Args:
+        lines: Manifest lines, e.g. an open file.
+        fmt: 'jsonl' or 'sections'; detected from the first significant
+            line when None.
+
+    Yields:
+        Entries in manifest order.
+
+    Raises:
+        ManifestError: On the first invalid line or configuration.
+        ValueError: If the format is unknown.
+    """
+    if fmt is not None and fmt not in FORMATS:
+        raise ValueError(f"Unknown manifest format '{fmt}'")
+
+    parser = ConfigParser()
+    names: set[str] = set()
+    checkpoints: set[str] = set()
+    defaults: dict[str, str] = {}
+    section: tuple[str, int] | None = None
+    raw: dict[str, str] = {}
+    default_lines: dict[str, int] = {}
+    key_lines: dict[str, int] = {}
+
+    def entry(
+            name: str,
+            line: int,
+            values: dict[str, str],
+            lines: dict[str, int] | None = None
+    ) -> ManifestEntry:
+        if name in names:
+            raise ManifestError(f"Duplicate name '{name}'", line, name)
+        names.add(name)
+        for key in ("OUTPUT_FILE", "CHECKPOINT"):
+            if key in values:
+                values[key] = values[key].replace("{name}", name)
+        checkpoint = values.get("CHECKPOINT")
+        if checkpoint:
+            if checkpoint in checkpoints:
+                raise ManifestError(
+                    f"CHECKPOINT '{checkpoint}' is shared with another "
+                    "entry; use {name} in it",
+                    (lines or {}).get("CHECKPOINT", line), name
+                )
+            checkpoints.add(checkpoint)
+        try:
+            config = parser.validate(values)
+        except ConfigError as e:
+            key_line = (lines or {}).get(e.key or "", line)
+            raise ManifestError(str(e), key_line, name)
+        if config["OUTPUT_FILE"] is None:
+            raise ManifestError(
+                "Missing required keys: OUTPUT_FILE", line, name
+            )
+        return ManifestEntry(name, line, config)
+
+    for line_num, line in enumerate(lines, start=1):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if fmt is None:
+            fmt = detect_format(stripped)
+
+        if fmt == "jsonl":
+            try:
+                values = json.loads(stripped)
+            except ValueError as e:
+                raise ManifestError(f"Invalid JSON: {e}", line_num)
+            if not isinstance(values, dict):
+                raise ManifestError("Expected a JSON object", line_num)
+            values = {
+                key: value for key, value in values.items()
+                if value is not None
+            }
+            raw = to_raw_config(values)
+            yield entry(raw.pop("NAME", str(line_num)), line_num, raw)
+
+        elif stripped.startswith("["):
+            if not stripped.endswith("]") or not stripped[1:-1].strip():
+                raise ManifestError(
+                    f"Invalid section header '{stripped}'", line_num
+                )
+            if section:
+                yield entry(
+                    *section, {**defaults, **raw},
+                    {**default_lines, **key_lines}
+                )
+            section = (stripped[1:-1].strip(), line_num)
+            raw = {}
+            key_lines = {}
+
+        else:
+            if "=" not in stripped:
+                raise ManifestError(
+                    f"Invalid syntax '{stripped}'", line_num,
+                    section[0] if section else None
+                )
+            key, value = stripped.split("=", 1)
+            if not key.strip():
+                raise ManifestError(
+                    "Missing key", line_num, section[0] if section else None
+                )
+            if section:
+                raw[key.strip()] = value.strip()
+                key_lines[key.strip()] = line_num
+            else:
+                defaults[key.strip()] = value.strip()
+                default_lines[key.strip()] = line_num
+
+    if section:
+        yield entry(
+            *section, {**defaults, **raw}, {**default_lines, **key_lines}
+        )
+    elif defaults:
+        raise ManifestError(
+            "Keys without any section: start each configuration with a "
+            "[name] header", min(default_lines.values())
+        )
+
+
+def read_manifest(
+        path: str,
+        fmt: str | None = None
+) -> Iterator[ManifestEntry]:
+    """Read a manifest file, see ``parse_manifest``.
+
+    Args:
+        path: Manifest file path.
+        fmt: 'jsonl' or 'sections', or None to detect it.
+
+    Yields:
+        Entries in manifest order.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ManifestError: On the first invalid line or configuration.
+    """
+    with open(path, "r") as file:
+        yield from parse_manifest(file, fmt)
+
+
+def build_entry(entry: ManifestEntry) -> tuple[str, int]:
+    """Generate, solve and write the maze of an entry.
+
+    Runs in a worker process or thread: generators share no state.
+
+    Args:
+        entry: Manifest entry with an ``OUTPUT_FILE``.
+
+    Returns:
+        The entry name and the length of its solution.
+    """
+    # Imported here so validating a manifest does not load the generator.
+    from mazegen.maze_generator import MazeGenerator
+
+    generator = MazeGenerator(config=entry.config)
+    generator.set_canvas()
+    generator.generate_maze()
+    generator.solve_maze()
+    generator.fill_output()
+    return entry.name, len(generator.canvas.solution)
+
+
+def build_all(
+        executor: Executor,
+        entries: Iterable[ManifestEntry],
+        window: int
+) -> Iterator[tuple[str, int]]:
+    """Build entries in an executor, reading them as workers free up.
+
+    Unlike ``Executor.map``, at most ``window`` builds are submitted
+    ahead of the results, so a manifest is parsed as it is built and an
+    invalid entry stops it without parsing the rest. Builds not yet
+    started are cancelled when an error is raised.
+
+    Args:
+        executor: Thread or process pool.
+        entries: Entries, e.g. from ``read_manifest``.
+        window: Largest number of builds submitted and not yet read.
+
+    Yields:
+        The result of ``build_entry`` for each entry, in order.
+    """
+    pending: deque[Future[tuple[str, int]]] = deque()
+    try:
+        for entry in entries:
+            if len(pending) >= window:
+                yield pending.popleft().result()
+            pending.append(executor.submit(build_entry, entry))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def main() -> None:
+    """Parse command line arguments and build every maze of a manifest."""
+    parser = argparse.ArgumentParser(
+        description="Generate the mazes listed in a manifest"
+    )
+    parser.add_argument("manifest", help="manifest file")
+    parser.add_argument("--format", choices=FORMATS, default=None,
+                        help="manifest format (default: detected)")
+    parser.add_argument("--check", action="store_true",
+                        help="only validate the manifest")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of workers (default: CPU count)")
+    parser.add_argument("--threads", action="store_true",
+                        help="use worker threads instead of processes")
+    args = parser.parse_args()
+
+    try:
+        if args.check:
+            count = sum(1 for _ in read_manifest(args.manifest, args.format))
+            print(f"{count} valid configurations.")
+            return
+        workers = args.workers or os.cpu_count() or 1
+        executor: Executor
+        if args.threads:
+            executor = ThreadPoolExecutor(max_workers=workers)
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers)
+        with executor:
+            for name, length in build_all(
+                    executor, read_manifest(args.manifest, args.format),
+                    IN_FLIGHT_PER_WORKER * workers
+            ):
+                print(f"{name}: solution length {length}")
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""Blocked-cell masks: cells that stay closed while a maze is carved.
+
+A mask is a bitmap over the grid, one bit per cell in row-major order,
+so testing a cell is O(1) whatever the number of blocked cells. Masks
+are built from the '42' pattern or loaded from a stencil, either text
+(``#``, ``X``, ``@`` or ``1`` for blocked cells) or a PBM image, and
+stretched to the maze size.
+"""
+
+from typing import Iterator
+
+# Characters marking a blocked cell in a text stencil.
+BLOCKED_CHARS = "#X@1█"
+
+# The '42' pattern, placed around the center of the maze.
+FT_PATTERN = (
+    "#...###",
+    "#.....#",
+    "###.###",
+    "..#.#..",
+    "..#.###",
+)
+
+
+class Mask:
+    """Set of blocked cells stored as a bitmap."""
+
+    def __init__(self, width: int, height: int) -> None:
+        """Initialize an empty mask.
+
+        Args:
+            width: Width of the grid in cells.
+            height: Height of the grid in cells.
+        """
+        self.width = width
+        self.height = height
+        self.bits = bytearray((width * height + 7) // 8)
+
+    def __contains__(self, index: object) -> bool:
+        """Check whether the cell at a row-major index is blocked."""
+        if not isinstance(index, int) or index < 0:
+            return False
+        byte = index >> 3
+        return byte < len(self.bits) and bool(
+            self.bits[byte] >> (index & 7) & 1
+        )
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over the indexes of the blocked cells, in order."""
+        for byte_index, byte in enumerate(self.bits):
+            while byte:
+                low = byte & -byte
+                yield byte_index * 8 + low.bit_length() - 1
+                byte ^= low
+
+    def __len__(self) -> int:
+        """Get the number of blocked cells."""
+        return sum(bin(byte).count("1") for byte in self.bits)
+
+    def add(self, index: int) -> None:
+        """Block the cell at a row-major index."""
+        self.bits[index >> 3] |= 1 << (index & 7)
+
+    def clear(self) -> None:
+        """Unblock every cell."""
+        self.bits[:] = bytes(len(self.bits))
+
+    def to_bytes(self) -> bytearray:
+        """Get one byte per cell, non-zero for blocked cells.
+
+        This is the layout taken by the packed-grid kernels and
+        ``braid.braid``.
+        """
+        flags = bytearray(self.width * self.height)
+        for index in self:
+            flags[index] = 1
+        return flags
+
+    def fill(self, start: int) -> bytearray:
+        """Flood fill the unblocked cells reachable from a cell.
+
+        Walls are ignored: only blocked cells stop the fill, so the
+        cells left over can never be carved from ``start``.
+
+        Args:
+            start: Row-major index of an unblocked cell.
+
+        Returns:
+            One byte per cell, zero for the unblocked cells that cannot
+            be reached from ``start``.
+        """
+        width = self.width
+        filled = self.to_bytes()
+        filled[start] = 1
+        stack = [start]
+        while stack:
+            index = stack.pop()
+            x = index % width
+            for neighbour, inside in (
+                    (index - width, index >= width),
+                    (index + width, index + width < len(filled)),
+                    (index - 1, x > 0),
+                    (index + 1, x < width - 1),
+            ):
+                if inside and not filled[neighbour]:
+                    filled[neighbour] = 1
+                    stack.append(neighbour)
+        return filled
+
+    def place(
+            self,
+            rows: list[list[bool]],
+            left: int,
+            top: int
+    ) -> None:
+        """Block the cells of a pattern placed at a position, unscaled.
+
+        Parts of the pattern outside the grid are ignored.
+
+        Args:
+            rows: Pattern rows, True for blocked cells.
+            left: X coordinate of the top-left pattern cell.
+            top: Y coordinate of the top-left pattern cell.
+        """
+        for dy, row in enumerate(rows):
+            y = top + dy
+            if not 0 <= y < self.height:
+                continue
+            for dx, blocked in enumerate(row):
+                x = left + dx
+                if blocked and 0 <= x < self.width:
+                    self.add(y * self.width + x)
+
+    @classmethod
+    def from_stencil(
+            cls,
+            rows: list[list[bool]],
+            width: int,
+            height: int
+    ) -> "Mask":
+        """Build a mask by stretching a stencil over the whole grid.
+
+        Uses nearest-neighbour scaling. Each stencil row is converted
+        once, and the time spent per maze row only depends on how many
+        of its cells are blocked.
+
+        Args:
+            rows: Stencil rows, True for blocked cells.
+            width: Width of the grid in cells.
+            height: Height of the grid in cells.
+
+        Returns:
+            The scaled mask.
+
+        Raises:
+            ValueError: If the stencil is empty.
+        """
+        stencil_width = max((len(row) for row in rows), default=0)
+        if not stencil_width:
+            raise ValueError("Stencil is empty")
+        stencil_height = len(rows)
+
+        mask = cls(width, height)
+        scale = [x * stencil_width // width for x in range(width)]
+        columns: dict[int, list[int]] = {}
+        for y in range(height):
+            source = y * stencil_height // height
+            if source not in columns:
+                row = rows[source]
+                columns[source] = [
+                    x for x, column in enumerate(scale)
+                    if column < len(row) and row[column]
+                ]
+            base = y * width
+            for x in columns[source]:
+                mask.add(base + x)
+        return mask
+
+
+def ft_mask(width: int, height: int) -> Mask:
+    """Build the mask of the '42' pattern around the center of a grid.
+
+    Args:
+        width: Width of the grid in cells.
+        height: Height of the grid in cells.
+
+    Returns:
+        The mask, clipped to the grid.
+    """
+    mask = Mask(width, height)
+    mask.place(
+        parse_text(FT_PATTERN), width // 2 - 3, height // 2 - 2
+    )
+    return mask
+
+
+def parse_text(lines: "list[str] | tuple[str, ...]") -> list[list[bool]]:
+    """Read a text stencil.
+
+    Args:
+        lines: Stencil lines; ``BLOCKED_CHARS`` mark blocked cells and
+            any other character an open one.
+
+    Returns:
+        Stencil rows, True for blocked cells. Trailing blank lines are
+        dropped.
+    """
+    rows = [line.rstrip("\r\n") for line in lines]
+    while rows and not rows[-1].strip():
+        rows.pop()
+    return [[char in BLOCKED_CHARS for char in row] for row in rows]
+
+
+def parse_pbm(data: bytes) -> list[list[bool]]:
+    """Read a PBM image, plain (P1) or raw (P4). Black pixels block.
+
+    Args:
+        data: Contents of the image file.
+
+    Returns:
+        Stencil rows, True for blocked cells.
+
+    Raises:
+        ValueError: If the data is not a valid PBM image.
+    """
+    magic = data[:2]
+    if magic not in (b"P1", b"P4"):
+        raise ValueError("Not a PBM image")
+
+    # Header: magic, width and height, separated by whitespace or
+    # comments; raw data starts after a single whitespace byte.
+    fields: list[int] = []
+    position = 2
+    while len(fields) < 2:
+        while position < len(data) and data[position:position + 1] in (
+                b" ", b"\t", b"\r", b"\n"):
+            position += 1
+        if data[position:position + 1] == b"#":
+            position = data.find(b"\n", position)
+            if position < 0:
+                raise ValueError("Truncated PBM header")
+            continue
+        start = position
+        while position < len(data) and data[position:position + 1].isdigit():
+            position += 1
+        if start == position:
+            raise ValueError("Invalid PBM header")
+        fields.append(int(data[start:position]))
+    width, height = fields
+
+    if magic == b"P1":
+        pixels = [
+            char == ord("1") for char in data[position:]
+            if char in b"01"
+        ]
+        if len(pixels) < width * height:
+            raise ValueError("Truncated PBM image")
+        return [
+            pixels[row * width:(row + 1) * width] for row in range(height)
+        ]
+
+    position += 1
+    stride = (width + 7) // 8
+    if len(data) - position < stride * height:
+        raise ValueError("Truncated PBM image")
+    rows: list[list[bool]] = []
+    for row in range(height):
+        line = data[position + row * stride:position + (row + 1) * stride]
+        rows.append([
+            bool(line[x >> 3] >> (7 - (x & 7)) & 1) for x in range(width)
+        ])
+    return rows
+
+
+def load_stencil(path: str, width: int, height: int) -> Mask:
+    """Load a text or PBM stencil and stretch it over a grid.
+
+    Args:
+        path: Stencil file; PBM images are recognized by their header.
+        width: Width of the grid in cells.
+        height: Height of the grid in cells.
+
+    Returns:
+        The scaled mask.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the stencil is invalid or empty.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    if data[:2] in (b"P1", b"P4"):
+        rows = parse_pbm(data)
+    else:
+        rows = parse_text(data.decode().splitlines())
+    return Mask.from_stencil(rows, width, height)
@@ -1,40 +1,80 @@
 """Maze generator module with generation, solving and rendering."""
 
-import random
-import sys
+import os
 import time
 from collections import deque
-
-from mazegen.cell import Cell
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any
+
+from mazegen.algorithms import EVENTS, Algorithm, lookup
+from mazegen.braid import (
+    DEFAULT_RATIO, braid, dead_end_cells, dead_end_indexes
+)
+from mazegen.checkpoint import DEFAULT_EVERY, checkpointed, claim
 from mazegen.direction import Direction
 from mazegen.canvas import Canvas
-from mazegen.config_parser import ConfigParser
-from mazegen.renderer import Renderer
+from mazegen.config_parser import ConfigError, ConfigParser
+from mazegen.events import EventKind, carve
+from mazegen.mask import Mask, ft_mask, load_stencil
+from mazegen.maze_io import to_hex
+from mazegen.recorder import TraceRecorder
+from mazegen.solver import distance_field, path_coordinates, solve
+from mazegen.stats import bfs
+from mazegen.streams import BRAID, CARVE, substream
+
+if TYPE_CHECKING:
+    from mazegen.renderer import Renderer
 
 
 class MazeGenerator():
     """Generates, solves and renders mazes."""
 
-    def __init__(self, config_file: str) -> None:
-        """Initialize maze generator from config file.
+    def __init__(
+            self,
+            config_file: str | None = None,
+            *,
+            config: dict[str, Any] | None = None
+    ) -> None:
+        """Initialize maze generator from config file or config object.
+
+        When ``config`` is given, no file is read. Generation and
+        solving never print or exit and keep their state in the
+        instance, so generators can run in long-running processes and
+        in several threads at once.
 
         Args:
             config_file: Path to configuration file.
+            config: Already validated configuration, as returned by
+                ``ConfigParser.validate``.
+
+        Raises:
+            ValueError: If neither a file nor a config is given.
+            ConfigError: If the configuration file cannot be loaded.
         """
-        config = ConfigParser().parse_config(config_file)
-        if not config:
-            print("Failed to load configuration. Exiting.")
-            sys.exit(0)
+        if config is None:
+            if config_file is None:
+                raise ValueError("Either config_file or config is required")
+            config = ConfigParser().parse_config(config_file)
+            if not config:
+                raise ConfigError("Failed to load configuration")
         self.width = config["WIDTH"]
         self.height = config["HEIGHT"]
         self.entry = config["ENTRY"]
         self.exit = config["EXIT"]
         self.perfect = config["PERFECT"]
+        self.braid: float | None = config.get("BRAID")
+        self.stencil: str | None = config.get("STENCIL")
         self.seed = config["SEED"]
         self.algorithm = config["ALGORITHM"]
-        self.output_file = config["OUTPUT_FILE"]
-        self.rng = random.Random(self.seed)
-        self.renderer: Renderer | None = None
+        self.output_file: str | None = config.get("OUTPUT_FILE")
+        self.checkpoint: str | None = config.get("CHECKPOINT")
+        self.checkpoint_every: int = (
+            config.get("CHECKPOINT_EVERY") or DEFAULT_EVERY
+        )
+        self.rng = substream(self.seed, CARVE)
+        self.braid_rng = substream(self.seed, BRAID)
+        self.renderer: "Renderer | None" = None
+        self.recorder: TraceRecorder | None = None
 
     def is_size_suitable_ft(self) -> bool:
         """Check whether the current dimensions meet
@@ -54,151 +94,267 @@ class MazeGenerator():
     def set_canvas(self) -> None:
         """Initialize maze canvas.
 
+        Cells covered by ``STENCIL``, or else by the '42' pattern when
+        the maze is large enough, are blocked.
+
         Raises:
-            ValueError: If entry/exit overlaps with '42' pattern.
+            ValueError: If the stencil cannot be loaded, entry/exit
+                overlaps with a blocked cell, or blocked cells cut off
+                the exit or any other cell from the entry.
         """
         self.canvas = Canvas(self.width, self.height, self.entry, self.exit)
-        if self.is_size_suitable_ft():
+        if self.stencil:
+            try:
+                self.put_mask(
+                    load_stencil(self.stencil, self.width, self.height)
+                )
+            except OSError as e:
+                raise ValueError(f"Cannot read stencil: {e}")
+            pattern = "the stencil"
+        elif self.is_size_suitable_ft():
             self.put_ft_cells()
+            pattern = "'42' pattern"
+        else:
+            return
 
-            entry_cell = self.canvas.get_cell(self.entry[0], self.entry[1])
-            if entry_cell in self.canvas.ft_cells:
-                raise ValueError(
-                    "Please change entry coordinates. "
-                    "It is reserved for '42' pattern"
-                )
+        entry_index = self.entry[1] * self.width + self.entry[0]
+        exit_index = self.exit[1] * self.width + self.exit[0]
+        if entry_index in self.canvas.mask:
+            raise ValueError(
+                "Please change entry coordinates. "
+                f"It is reserved for {pattern}"
+            )
+        if exit_index in self.canvas.mask:
+            raise ValueError(
+                "Please change exit coordinates. "
+                f"It is reserved for {pattern}"
+            )
 
-            exit_cell = self.canvas.get_cell(self.exit[0], self.exit[1])
-            if exit_cell in self.canvas.ft_cells:
-                raise ValueError(
-                    "Please change exit coordinates. "
-                    "It is reserved for '42' pattern"
-                )
+        filled = self.canvas.mask.fill(entry_index)
+        if not filled[exit_index]:
+            raise ValueError(
+                "Please change entry or exit coordinates. "
+                f"They are separated by {pattern}"
+            )
+        cut_off = filled.find(0)
+        if cut_off >= 0:
+            raise ValueError(
+                f"Cell ({cut_off % self.width}, {cut_off // self.width}) "
+                f"is cut off from the entry by {pattern}"
+            )
 
     def set_renderer(self, color_index: int = 0) -> None:
         """Initialize maze renderer.
 
+        The renderer shares the canvas cell storage, so later in-place
+        updates of the canvas are visible to it without rebuilding.
+
         Args:
             color_index: Starting color index for walls.
         """
+        # Imported here so headless use does not load terminal modules.
+        from mazegen.renderer import Renderer
+
         self.renderer = Renderer(
             self.canvas.width,
             self.canvas.height,
             self.canvas.entry,
             self.canvas.exit,
-            [],
-            "",
-            color_index
+            self.canvas.cells,
+            self.canvas.solution,
+            color_index,
+            path_coordinates(self.canvas.entry, self.canvas.solution)
         )
-        for y in range(self.canvas.height):
-            for x in range(self.canvas.width):
-                cell = self.canvas.get_cell(x, y)
-                if cell:
-                    self.renderer.cells.append(cell)
 
     def generate_maze(self) -> None:
-        """Generate maze using selected algorithm."""
-        try:
-            if self.algorithm == "dfs":
-                from mazegen.algorithms.dfs import generate_maze
-            elif self.algorithm == "hunt_and_kill":
-                from mazegen.algorithms.hunt_and_kill import generate_maze
-
-            for _ in generate_maze(
-                self.canvas, self.canvas.cells[0], self.rng
-            ):
-                if self.renderer:
-                    self.renderer.render_maze()
-                    time.sleep(0.01)
+        """Generate maze using selected algorithm.
+
+        Algorithms that emit events are animated when a renderer is set
+        and recorded when a recorder is set. Otherwise the algorithm runs
+        without any per-step work, through its kernel when it has one.
+
+        With ``CHECKPOINT`` set, the carving is saved to that file every
+        ``CHECKPOINT_EVERY`` steps and resumed from it by the next run;
+        the file is removed once the maze is complete. Generators running
+        at the same time need different files.
+
+        Raises:
+            ValueError: If the algorithm is unknown, a recorder is set
+                for an algorithm that does not emit events, or the
+                checkpoint cannot be used or is used by another
+                generator of this process.
+        """
+        algorithm = lookup(self.algorithm)
+        emits_events = EVENTS in algorithm.capabilities
+        if self.recorder and not emits_events:
+            raise ValueError(
+                f"Algorithm '{algorithm.name}' does not emit events "
+                "and cannot be recorded"
+            )
+
+        animate = self.renderer is not None and emits_events
+        if animate and self.renderer:
+            self.renderer.render_maze()
+
+        claimed = claim(self.checkpoint) if self.checkpoint else (
+            nullcontext()
+        )
+        with claimed:
+            self.carve(algorithm, animate, self.checkpoint is not None)
+
+            if animate and self.renderer:
+                self.renderer.end_drawing()
 
             if not self.perfect:
                 self.remove_dend_walls()
 
             while self.has_forbidden_opened_block():
-                self.set_canvas()
-                generate_maze(self.canvas, self.canvas.cells[0], self.rng)
+                self.canvas.reset()
+                self.carve(algorithm, False)
                 if not self.perfect:
                     self.remove_dend_walls()
 
-        except AttributeError as e:
-            print("Got error:", e)
+            if self.renderer:
+                self.renderer.invalidate()
+            if self.checkpoint:
+                try:
+                    os.remove(self.checkpoint)
+                except FileNotFoundError:
+                    pass
+
+    def carve(
+            self,
+            algorithm: Algorithm,
+            animate: bool,
+            checkpoint: bool = False
+    ) -> None:
+        """Run a generation algorithm over the whole canvas.
+
+        Carving starts from the entry, which is never blocked.
+
+        Args:
+            algorithm: Registry entry of the algorithm.
+            animate: Draw each carve event with the renderer.
+            checkpoint: Save the carving to ``CHECKPOINT``, or resume it
+                from there.
+        """
+        start_cell = self.canvas.cells[
+            self.entry[1] * self.width + self.entry[0]
+        ]
+        if checkpoint and self.checkpoint:
+            steps = checkpointed(
+                self.canvas, algorithm, start_cell, self.rng,
+                self.checkpoint, self.seed, self.checkpoint_every
+            )
+        elif not animate and not self.recorder:
+            kernel = algorithm.load_kernel()
+            if kernel:
+                kernel(self.canvas, start_cell, self.rng)
+            else:
+                deque(algorithm.load()(self.canvas, start_cell, self.rng),
+                      maxlen=0)
+            return
+
+        else:
+            steps = algorithm.load()(self.canvas, start_cell, self.rng)
+        if self.recorder:
+            self.recorder.clear()
+
+        for event in steps:
+            if self.recorder:
+                self.recorder.record(event)
+            if animate and self.renderer and event.kind == EventKind.CARVE:
+                self.renderer.draw_event(event)
+                time.sleep(0.01)
 
     def regenerate_maze(self) -> None:
-        """Regenerate maze with the same settings."""
+        """Regenerate maze with the same settings.
+
+        The existing canvas is reset in place, so neither the cells nor
+        the renderer are rebuilt.
+        """
         if self.renderer:
             self.renderer.show_path = False
-        self.rng = random.Random(self.seed)
-        self.set_canvas()
-        if self.renderer:
-            self.set_renderer(self.renderer.color_index)
+            self.renderer.set_path("", [])
+        self.rng = substream(self.seed, CARVE)
+        self.braid_rng = substream(self.seed, BRAID)
+        if hasattr(self, "canvas"):
+            self.canvas.reset()
+            if self.renderer:
+                self.renderer.invalidate()
+        else:
+            self.set_canvas()
         self.generate_maze()
 
     def remove_dend_walls(self) -> None:
-        """Remove some dead-end walls for imperfect mazes."""
-        if not len(self.canvas.dead_ends):
-            return
-        for _ in range(len(self.canvas.dead_ends) // 5 + 1):
-            cell, neighbour = self.rng.choice(self.canvas.dead_ends)
-            self.canvas.remove_wall(cell, neighbour)
-
-    def put_ft_cells(self) -> None:
-        """Place '42' pattern cells in the center."""
-        x_mid = self.canvas.width // 2
-        y_mid = self.canvas.height // 2
-        cells_to_close = [
-            self.canvas.get_cell(x_mid - 3, y_mid - 2),
-            self.canvas.get_cell(x_mid - 3, y_mid - 1),
-            self.canvas.get_cell(x_mid - 3, y_mid),
-            self.canvas.get_cell(x_mid - 2, y_mid),
-            self.canvas.get_cell(x_mid - 1, y_mid),
-            self.canvas.get_cell(x_mid - 1, y_mid + 1),
-            self.canvas.get_cell(x_mid - 1, y_mid + 2),
-
-            self.canvas.get_cell(x_mid + 1, y_mid - 2),
-            self.canvas.get_cell(x_mid + 2, y_mid - 2),
-            self.canvas.get_cell(x_mid + 3, y_mid - 2),
-            self.canvas.get_cell(x_mid + 3, y_mid - 1),
-            self.canvas.get_cell(x_mid + 3, y_mid),
-            self.canvas.get_cell(x_mid + 2, y_mid),
-            self.canvas.get_cell(x_mid + 1, y_mid),
-            self.canvas.get_cell(x_mid + 1, y_mid + 1),
-            self.canvas.get_cell(x_mid + 1, y_mid + 2),
-            self.canvas.get_cell(x_mid + 2, y_mid + 2),
-            self.canvas.get_cell(x_mid + 3, y_mid + 2)
-        ]
-        for cell in [cell for cell in cells_to_close if cell]:
-            cell.is_visited = True
-            self.canvas.ft_cells.append(cell)
-
-    def solve_maze(self) -> None:
-        """Solve maze using BFS and store the solution."""
-        for cell in self.canvas.cells:
-            cell.is_visited = False
-
-        entry = self.canvas.entry
-        entry_cell = self.canvas.get_cell(entry[0], entry[1])
-        if not entry_cell:
+        """Open walls at dead ends for imperfect mazes.
+
+        Braids ``BRAID`` (by default ``DEFAULT_RATIO``) of the dead ends
+        found while carving, preferring walls that shorten the solution.
+        Draws from its own random stream, so the choices do not depend
+        on how many numbers the carving consumed.
+
+        Braiding itself is O(dead ends), but favouring shortcuts needs
+        the distance of every cell from the entry and to the exit: this
+        packs the wall grid and runs two BFS passes over it, O(cells),
+        which is most of the time spent here. Nothing is done when
+        ``BRAID`` is 0. A canvas without recorded dead ends (e.g. loaded
+        from a file) has them collected by one scan of the wall grid.
+        """
+        ratio = DEFAULT_RATIO if self.braid is None else self.braid
+        if ratio <= 0:
             return
+        canvas = self.canvas
+        width = canvas.width
+        walls = canvas.wall_grid()
+        if canvas.dead_ends:
+            dead_ends = dead_end_indexes(
+                (cell.coordinate for cell, _ in canvas.dead_ends), width
+            )
+        else:
+            dead_ends = dead_end_cells(walls)
 
-        queue = deque([(entry_cell, [entry_cell])])
+        entry = self.entry[1] * width + self.entry[0]
+        exit = self.exit[1] * width + self.exit[0]
+        from_entry, _ = bfs(walls, width, entry)
+        to_exit, _ = bfs(walls, width, exit)
 
-        while queue:
-            cell, path = queue.popleft()
+        opened = braid(
+            walls, width, canvas.height, dead_ends, ratio, self.braid_rng,
+            canvas.mask, from_entry, to_exit, max(from_entry[exit], 0)
+        )
+        for index, side in opened:
+            cell = canvas.cells[index]
+            neighbour = canvas.get_neighbour(cell, side)
+            if neighbour:
+                canvas.remove_wall(cell, neighbour)
+            if self.recorder:
+                self.recorder.record(carve(*cell.coordinate, side))
 
-            if not cell or cell.is_visited:
-                continue
+    def put_ft_cells(self) -> None:
+        """Place '42' pattern cells in the center."""
+        self.put_mask(ft_mask(self.canvas.width, self.canvas.height))
 
-            cell.is_visited = True
+    def put_mask(self, mask: Mask) -> None:
+        """Block the cells of a mask, replacing the current one.
 
-            if cell.coordinate == self.canvas.exit:
-                self.canvas.solution = self.convert_path_to_str(path)
-                if self.renderer:
-                    self.renderer.solution = self.canvas.solution
-                return
+        Args:
+            mask: Mask of the canvas size.
+        """
+        for index in self.canvas.mask:
+            self.canvas.cells[index].is_visited = False
+        self.canvas.mask = mask
+        for index in mask:
+            self.canvas.cells[index].is_visited = True
 
-            for neighbour in self.canvas.get_accessible_neighbours(cell):
-                if not neighbour.is_visited:
-                    queue.append((neighbour, path + [neighbour]))
+    def solve_maze(self) -> None:
+        """Solve maze using BFS and store the solution."""
+        self.canvas.solution = solve(self.canvas)
+        if self.renderer:
+            self.renderer.set_path(
+                self.canvas.solution,
+                path_coordinates(self.canvas.entry, self.canvas.solution)
+            )
 
     def has_forbidden_opened_block(self) -> bool:
         """Check for forbidden 3x3 open areas.
@@ -250,50 +406,20 @@ class MazeGenerator():
 
         return False
 
-    def fill_output(self) -> None:
-        """Write maze data to the output file."""
-        with open(self.output_file, "w") as file:
-            output = ""
-
-            for y in range(self.canvas.height):
-                for x in range(self.canvas.width):
-                    cell = self.canvas.get_cell(x, y)
-                    if cell:
-                        output += f"{cell.direction.value:X}"
-                output += "\n"
-
-            entry_txt = ", ".join(map(str, self.canvas.entry))
-            exit_txt = ", ".join(map(str, self.canvas.exit))
-
-            output += (
-                f"\n{entry_txt}\n"
-                f"{exit_txt}\n"
-                f"{self.canvas.solution}\n"
-            )
-
-            file.write(output)
-
-    @staticmethod
-    def convert_path_to_str(path: list[Cell]) -> str:
-        """Convert path of cells to direction string.
+    def fill_output(self, distances: bool = False) -> None:
+        """Write maze data to the output file.
 
         Args:
-            path: List of cells in the path.
+            distances: Also write the distance of every cell from the
+                entry to the output file name with a '.dist' suffix.
 
-        Returns:
-            String of directions (N, E, S, W).
+        Raises:
+            ValueError: If no output file is configured.
         """
-        directions: list[str] = []
-        dir_map = {
-            (0, -1): "N",
-            (0,  1): "S",
-            (-1, 0): "W",
-            (1,  0): "E",
-        }
-
-        for cur_cell, nxt_cell in zip(path, path[1:]):
-            dx = nxt_cell.coordinate[0] - cur_cell.coordinate[0]
-            dy = nxt_cell.coordinate[1] - cur_cell.coordinate[1]
-            directions.append(dir_map.get((dx, dy), ""))
-
-        return "".join(directions)
+        if not self.output_file:
+            raise ValueError("No output file configured")
+        with open(self.output_file, "w") as file:
+            file.write(to_hex(self.canvas))
+        if distances:
+            with open(f"{self.output_file}.dist", "w") as file:
+                file.write(distance_field(self.canvas).to_text())
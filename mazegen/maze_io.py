@@ -0,0 +1,139 @@
+"""Encoding and loading of mazes in the output file formats."""
+
+from mazegen.canvas import Canvas
+from mazegen.direction import Direction
+
+# Wall value -> its hexadecimal digit.
+HEX_DIGITS = bytes.maketrans(bytes(range(16)), b"0123456789ABCDEF")
+
+
+def to_hex(canvas: Canvas) -> str:
+    """Encode a canvas in the hexadecimal output file format.
+
+    Args:
+        canvas: The maze canvas to encode.
+
+    Returns:
+        Hex grid (one row per line), a blank line, entry and exit
+        coordinates and the solution path.
+    """
+    digits = canvas.wall_grid().translate(HEX_DIGITS).decode()
+    rows = [
+        digits[y * canvas.width:(y + 1) * canvas.width]
+        for y in range(canvas.height)
+    ]
+
+    entry_txt = ", ".join(map(str, canvas.entry))
+    exit_txt = ", ".join(map(str, canvas.exit))
+
+    return (
+        "\n".join(rows) + "\n"
+        f"\n{entry_txt}\n"
+        f"{exit_txt}\n"
+        f"{canvas.solution}\n"
+    )
+
+
+def from_hex(text: str) -> Canvas:
+    """Load a canvas from the hexadecimal output file format.
+
+    Fully closed cells are registered as reserved ('42' pattern) cells.
+
+    Args:
+        text: Content written by ``to_hex`` or ``fill_output``.
+
+    Returns:
+        Canvas with walls, entry, exit and solution restored.
+
+    Raises:
+        ValueError: If the text is not a valid maze encoding.
+    """
+    lines = text.splitlines()
+    try:
+        blank = lines.index("")
+    except ValueError:
+        raise ValueError("Missing blank line after the hex grid")
+
+    rows = lines[:blank]
+    meta = lines[blank + 1:]
+    if not rows or len(meta) < 2:
+        raise ValueError("Missing hex grid or entry/exit lines")
+
+    width = len(rows[0])
+    if any(len(row) != width for row in rows):
+        raise ValueError("Hex grid rows have different lengths")
+
+    try:
+        entry_x, entry_y = (int(v) for v in meta[0].split(","))
+        exit_x, exit_y = (int(v) for v in meta[1].split(","))
+    except ValueError:
+        raise ValueError("Entry and exit must be in format 'x, y'")
+
+    canvas = Canvas(width, len(rows), (entry_x, entry_y), (exit_x, exit_y))
+    for cell, char in zip(canvas.cells, "".join(rows)):
+        try:
+            cell.direction = Direction(int(char, 16))
+        except ValueError:
+            raise ValueError(f"Invalid hex digit '{char}'")
+        if cell.direction == Direction.CLOSED:
+            canvas.block(cell)
+
+    canvas.solution = meta[2].strip() if len(meta) > 2 else ""
+    return canvas
+
+
+def read_hex(filepath: str) -> Canvas:
+    """Load a canvas from a file written by ``fill_output``.
+
+    Args:
+        filepath: Path to the maze output file.
+
+    Returns:
+        The loaded canvas.
+    """
+    with open(filepath, "r") as file:
+        return from_hex(file.read())
+
+
+def pack_walls(canvas: Canvas) -> bytes:
+    """Encode the wall grid in a compact binary form.
+
+    Cells are stored row-major, two per byte with the first cell in the
+    high nibble. An odd cell count leaves the last low nibble zero.
+
+    Args:
+        canvas: The maze canvas to encode.
+
+    Returns:
+        Packed wall nibbles.
+    """
+    values = list(canvas.wall_grid())
+    if len(values) % 2:
+        values.append(0)
+    return bytes(
+        (values[i] << 4) | values[i + 1] for i in range(0, len(values), 2)
+    )
+
+
+def unpack_walls(data: bytes, width: int, height: int) -> list[int]:
+    """Decode a wall grid produced by ``pack_walls``.
+
+    Args:
+        data: Packed wall nibbles.
+        width: Maze width in cells.
+        height: Maze height in cells.
+
+    Returns:
+        Wall values in row-major order.
+
+    Raises:
+        ValueError: If the data is too short for the given size.
+    """
+    count = width * height
+    if len(data) * 2 < count:
+        raise ValueError("Packed wall data is too short")
+    values: list[int] = []
+    for byte in data:
+        values.append(byte >> 4)
+        values.append(byte & 15)
+    return values[:count]
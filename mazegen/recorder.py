@@ -0,0 +1,124 @@
+"""Recording and replaying of maze generation traces."""
+
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator
+
+from mazegen.canvas import Canvas
+from mazegen.events import Event, EventKind, unbatched
+
+MAGIC = b"MZTR"
+VERSION = 1
+HEADER = struct.Struct("<4sHII")
+
+
+class TraceRecorder:
+    """Collects generation events and persists them as a binary trace.
+
+    A trace stores every event as four little-endian 32-bit integers,
+    so a maze can be rebuilt later without re-running the RNG.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        """Initialize an empty trace.
+
+        Args:
+            width: Width of the recorded maze in cells.
+            height: Height of the recorded maze in cells.
+        """
+        self.width = width
+        self.height = height
+        self.events: array[int] = array("i")
+
+    def record(self, event: Event) -> None:
+        """Append an event to the trace.
+
+        Args:
+            event: Event to store.
+        """
+        self.events.extend(event)
+
+    def clear(self) -> None:
+        """Drop all recorded events."""
+        del self.events[:]
+
+    def save(self, filepath: str) -> None:
+        """Write the trace to a binary file.
+
+        Args:
+            filepath: Destination path.
+        """
+        data = array("i", self.events)
+        if sys.byteorder == "big":
+            data.byteswap()
+        with open(filepath, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, self.width, self.height))
+            file.write(data.tobytes())
+
+    @classmethod
+    def load(cls, filepath: str) -> "TraceRecorder":
+        """Read a trace written by ``save``.
+
+        Args:
+            filepath: Path to the trace file.
+
+        Returns:
+            Recorder holding the stored events.
+
+        Raises:
+            ValueError: If the file is not a valid trace.
+        """
+        with open(filepath, "rb") as file:
+            header = file.read(HEADER.size)
+            body = file.read()
+
+        if len(header) != HEADER.size:
+            raise ValueError("Trace file is truncated")
+        magic, version, width, height = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a maze trace file")
+
+        recorder = cls(width, height)
+        try:
+            recorder.events.frombytes(body)
+        except ValueError:
+            raise ValueError("Trace file is truncated")
+        if sys.byteorder == "big":
+            recorder.events.byteswap()
+        return recorder
+
+    def __iter__(self) -> Iterator[Event]:
+        """Iterate over the recorded events."""
+        return unbatched(self.events)
+
+    def replay(self, canvas: Canvas) -> None:
+        """Rebuild the recorded maze on a canvas.
+
+        Args:
+            canvas: Canvas of the recorded size, usually freshly reset.
+
+        Raises:
+            ValueError: If the canvas size does not match the trace.
+        """
+        if (canvas.width, canvas.height) != (self.width, self.height):
+            raise ValueError("Canvas size does not match the trace")
+        replay(canvas, self)
+
+
+def replay(canvas: Canvas, events: Iterable[Event]) -> None:
+    """Apply the carve events of a trace to a canvas.
+
+    Args:
+        canvas: Canvas to carve on.
+        events: Events of a recorded generation.
+    """
+    for event in events:
+        if event.kind != EventKind.CARVE:
+            continue
+        cell = canvas.get_cell(event.x, event.y)
+        if not cell:
+            continue
+        neighbour = canvas.get_neighbour(cell, event.side)
+        if neighbour:
+            canvas.remove_wall(cell, neighbour)
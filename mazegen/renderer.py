@@ -1,5 +1,6 @@
 """Terminal maze renderer using block characters."""
 
+import os
 import select
 import shutil
 import signal
@@ -9,6 +10,7 @@ from enum import Enum
 from types import FrameType
 
 from mazegen.cell import Cell
+from mazegen.events import Event, EventKind
 
 
 class Presets(Enum):
@@ -44,6 +46,22 @@ class Renderer():
 
     wall_colors = [Presets.WHITE, Presets.YELLOW, Presets.GREY, Presets.CYAN]
 
+    # Terminal lines kept free below the maze for the menu.
+    menu_lines = 8
+
+    # Key -> viewport move in cells, or in pages for the paging keys.
+    scroll_keys = {
+        "w": (0, -1), "k": (0, -1), "\033[A": (0, -1),
+        "s": (0, 1), "j": (0, 1), "\033[B": (0, 1),
+        "a": (-1, 0), "h": (-1, 0), "\033[D": (-1, 0),
+        "d": (1, 0), "l": (1, 0), "\033[C": (1, 0),
+    }
+    page_keys = {
+        " ": (0, 1), "\033[6~": (0, 1),
+        "b": (0, -1), "\033[5~": (0, -1),
+        ">": (1, 0), "<": (-1, 0),
+    }
+
     def __init__(
             self,
             width: int,
@@ -52,7 +70,8 @@ class Renderer():
             exit: tuple[int, int],
             cells: list[Cell],
             solution: str,
-            color_index: int = 0
+            color_index: int = 0,
+            path: list[tuple[int, int]] | None = None
     ) -> None:
         """Initialize the renderer.
 
@@ -61,14 +80,16 @@ class Renderer():
             height: Maze height in cells.
             entry: Entry coordinates (x, y).
             exit: Exit coordinates (x, y).
-            cells: List of maze cells.
+            cells: Maze cells in row-major order. The list is shared
+                with the canvas, not copied.
             solution: Solution path as direction string.
             color_index: Starting wall color index.
+            path: Cell coordinates (x, y) along the solution, from
+                ``solver.path_coordinates``.
         """
         self.width = width
         self.height = height
         self.cells = cells
-        self.solution = solution
 
         self.color_index = color_index
         self.show_path = False
@@ -80,6 +101,25 @@ class Renderer():
         self.exit_y = exit[1] * 2 + 1
         self.exit_x = exit[0] * 2 + 1
 
+        # Visible window of the grid, in grid squares.
+        self.view_x = 0
+        self.view_y = 0
+        self.view_width = self.grid_width
+        self.view_height = self.grid_height
+
+        # Maze without the solution path, see ``static_layer``.
+        self.layer: list[list[str]] = []
+        self.layer_rows: list[str] = []
+        self.layer_color = color_index
+
+        self.set_path(solution, path or [])
+
+    def install_signal_handlers(self) -> None:
+        """Say goodbye and exit on SIGTERM, SIGQUIT and SIGINT.
+
+        Signal handlers are process-wide and can only be installed from
+        the main thread, so this is left to the interactive program.
+        """
         signal.signal(signal.SIGTERM, self.signal_handler)
         signal.signal(signal.SIGQUIT, self.signal_handler)
         signal.signal(signal.SIGINT, self.signal_handler)
@@ -104,33 +144,136 @@ class Renderer():
             return True
         return False
 
-    def check_terminal_size(self) -> None:
-        """Ensure the terminal window is wide enough to render the maze.
+    def check_terminal_size(self) -> bool:
+        """Fit the viewport to the current terminal size.
 
-        Continuously checks the current terminal width against the required
-        width derived from the maze grid. If the terminal is too narrow,
-        prompts the user to resize the window or exit the program.
+        Never blocks: when the maze is larger than the terminal, only
+        the part inside the viewport is rendered.
 
-        The program terminates if the user chooses not to retry.
+        Returns:
+            True if the whole maze fits in the terminal.
         """
-        required_width = self.grid_width * 2
+        size = shutil.get_terminal_size()
+        self.view_width = max(1, min(self.grid_width, size.columns // 2))
+        self.view_height = max(
+            1, min(self.grid_height, size.lines - self.menu_lines)
+        )
+        self.scroll(0, 0)
+        return (
+            self.view_width == self.grid_width
+            and self.view_height == self.grid_height
+        )
+
+    def scroll(self, columns: int, rows: int) -> None:
+        """Move the viewport, keeping it inside the maze.
 
-        while True:
-            term_width = shutil.get_terminal_size().columns
-
-            if term_width < required_width:
-                print(
-                    "\nYour terminal is not wide enough to display the maze "
-                    "correctly.\nPlease resize your window or change "
-                    "initial width value in the configuration file, and "
-                    "then restart the program."
+        Args:
+            columns: Grid squares to move right (negative: left).
+            rows: Grid squares to move down (negative: up).
+        """
+        self.view_x = max(0, min(
+            self.view_x + columns, self.grid_width - self.view_width
+        ))
+        self.view_y = max(0, min(
+            self.view_y + rows, self.grid_height - self.view_height
+        ))
+
+    def render_view(self) -> None:
+        """Render only the part of the maze inside the viewport.
+
+        Takes time proportional to the viewport, not to the maze. The
+        solution path is included when shown.
+        """
+        path = self.path_set if self.show_path else set()
+        blue = (
+            f"{Presets.BLUE.value}{Presets.WALL.value}{Presets.RESET.value}"
+        )
+        lines = [
+            "".join(
+                blue if (grid_y, grid_x) in path
+                else self.square(grid_y, grid_x)
+                for grid_x in range(
+                    self.view_x, self.view_x + self.view_width
                 )
-                user_choice = input("\nTry again? (y/n): ").lower().strip()
-                if user_choice not in ("y", "yes"):
-                    print("\nBye!")
-                    sys.exit(0)
-            else:
-                break
+            )
+            for grid_y in range(self.view_y, self.view_y + self.view_height)
+        ]
+        print("\033c", end="")
+        print("\n".join(lines))
+        last_x = min(
+            self.width - 1, (self.view_x + self.view_width - 2) // 2
+        )
+        last_y = min(
+            self.height - 1, (self.view_y + self.view_height - 2) // 2
+        )
+        print(
+            f"Cells {self.view_x // 2}-{last_x} x "
+            f"{self.view_y // 2}-{last_y} of {self.width}x{self.height}"
+        )
+
+    def browse(self) -> None:
+        """Scroll the viewport with the keyboard until 'q' is pressed.
+
+        Arrow keys, WASD or HJKL move by one cell; space/b and Page
+        Down/Up page vertically, '>' and '<' horizontally.
+        """
+        import termios
+        import tty
+
+        self.check_terminal_size()
+        self.render_view()
+        print("Arrows/WASD: scroll, space/b/</>: page, q: back")
+
+        stdin = sys.stdin.fileno()
+        saved = termios.tcgetattr(stdin)
+        try:
+            tty.setcbreak(stdin)
+            while True:
+                # An escape sequence arrives in a single read.
+                key = os.read(stdin, 8).decode(errors="ignore")
+                if not key or key == "q":
+                    break
+                if key in self.scroll_keys:
+                    columns, rows = self.scroll_keys[key]
+                    self.scroll(columns * 2, rows * 2)
+                elif key in self.page_keys:
+                    columns, rows = self.page_keys[key]
+                    self.scroll(
+                        columns * (self.view_width - 1),
+                        rows * (self.view_height - 1)
+                    )
+                else:
+                    continue
+                self.render_view()
+                print("Arrows/WASD: scroll, space/b/</>: page, q: back")
+        finally:
+            termios.tcsetattr(stdin, termios.TCSADRAIN, saved)
+
+    def set_path(
+            self,
+            solution: str,
+            path: list[tuple[int, int]]
+    ) -> None:
+        """Set the solution to draw.
+
+        The path is turned into grid squares once, so frames only look
+        them up.
+
+        Args:
+            solution: Solution path as direction string.
+            path: Cell coordinates (x, y) along the solution, entry
+                first, as returned by ``solver.path_coordinates``.
+        """
+        self.solution = solution
+        self.path_grid: list[tuple[int, int]] = []
+        for (x, y), (next_x, next_y) in zip(path, path[1:]):
+            # Wall unit between the cells, then the next cell unit
+            self.path_grid.append((y + next_y + 1, x + next_x + 1))
+            self.path_grid.append((next_y * 2 + 1, next_x * 2 + 1))
+        if self.path_grid and self.path_grid[-1] == (self.exit_y,
+                                                     self.exit_x):
+            self.path_grid.pop()
+        self.path_set = set(self.path_grid)
 
     def draw_grid(self, grid: list[list[str]]) -> None:
         """Clear screen and draw the grid.
@@ -142,99 +285,252 @@ class Renderer():
         for row_printed in grid:
             print("".join(row_printed))
 
-    def render_maze(self) -> None:
-        """Render maze to the terminal."""
-        try:
-            self.check_terminal_size()
+    def square(self, grid_y: int, grid_x: int) -> str:
+        """Compute what a single grid square shows.
 
-            print("\033c", end="")
-            colored_wall = (
-                f"{self.wall_colors[self.color_index].value}"
-                f"{Presets.WALL.value}{Presets.RESET.value}"
-            )
+        Follows the same rules as ``render_maze`` without the solution
+        path, so single squares can be redrawn after a change.
 
-            # Build grid
-            grid: list[list[str]] = [
-                [Presets.PATH.value for _ in range(self.grid_width)]
-                for _ in range(self.grid_height)
-            ]
-
-            for row in range(self.height):
-                for col in range(self.width):
-                    cell = self.cells[row * self.width + col].direction.value
-                    y = row * 2 + 1
-                    x = col * 2 + 1
-
-                    for bit, wall_y, wall_x, corner_y, corner_x in self.walls:
-                        if cell & bit:
-                            grid[y + wall_y][x + wall_x] = colored_wall
-                            grid[y + corner_y][x + corner_x] = colored_wall
-
-                    # Fully closed cell (42 pattern)
-                    if cell == 15:
-                        grid[y][x] = (
-                            f"{Presets.GREEN.value}"
-                            f"{Presets.WALL.value}"
-                            f"{Presets.RESET.value}"
-                        )
-
-            # Entry and exit markers
-            grid[self.entry_y][self.entry_x] = (
+        Args:
+            grid_y: Row in the grid.
+            grid_x: Column in the grid.
+
+        Returns:
+            Colored block or empty path for the square.
+        """
+        if (grid_y, grid_x) == (self.entry_y, self.entry_x):
+            return (
                 f"{Presets.MAGENTA.value}"
                 f"{Presets.WALL.value}"
                 f"{Presets.RESET.value}"
             )
-            grid[self.exit_y][self.exit_x] = (
+        if (grid_y, grid_x) == (self.exit_y, self.exit_x):
+            return (
                 f"{Presets.RED.value}"
                 f"{Presets.WALL.value}"
                 f"{Presets.RESET.value}"
             )
 
-            # Solution path
-            if self.show_path:
-                sol_y = self.entry_y
-                sol_x = self.entry_x
-                skip_animation = False
+        row, col = grid_y // 2, grid_x // 2
+        owners: tuple[tuple[int, int, int], ...]
+        if grid_y % 2 and grid_x % 2:
+            # Cell unit, fully closed cells belong to the 42 pattern
+            if self.cell_value(row, col) == 15:
+                return (
+                    f"{Presets.GREEN.value}"
+                    f"{Presets.WALL.value}"
+                    f"{Presets.RESET.value}"
+                )
+            return Presets.PATH.value
+
+        if grid_x % 2:
+            # Horizontal wall: south of the cell above, north of below
+            owners = ((row - 1, col, 4), (row, col, 1))
+        elif grid_y % 2:
+            # Vertical wall: east of the cell left, west of the right one
+            owners = ((row, col - 1, 2), (row, col, 8))
+        else:
+            # Corner: drawn by the walls listed in ``walls``
+            owners = (
+                (row, col - 1, 1),
+                (row - 1, col - 1, 2),
+                (row - 1, col, 4),
+                (row, col, 8),
+            )
+
+        for owner_row, owner_col, bit in owners:
+            if self.cell_value(owner_row, owner_col) & bit:
+                return (
+                    f"{self.wall_colors[self.color_index].value}"
+                    f"{Presets.WALL.value}{Presets.RESET.value}"
+                )
+        return Presets.PATH.value
+
+    def cell_value(self, row: int, col: int) -> int:
+        """Get the wall value of a cell, or 0 outside the maze.
+
+        Args:
+            row: Cell row.
+            col: Cell column.
+
+        Returns:
+            Wall bits of the cell.
+        """
+        if 0 <= row < self.height and 0 <= col < self.width:
+            return self.cells[row * self.width + col].direction.value
+        return 0
+
+    def draw_event(self, event: Event) -> None:
+        """Redraw only the grid squares changed by a generation event.
 
-                for step in self.solution:
-                    step_x, step_y = self.sol_mov[step]
+        Expects the maze to be on screen already, drawn by
+        ``render_maze``.
 
-                    # Wall unit
-                    sol_y += step_y
-                    sol_x += step_x
-                    grid[sol_y][sol_x] = (
-                        f"{Presets.BLUE.value}"
+        Args:
+            event: Event emitted by a generation algorithm.
+        """
+        if event.kind != EventKind.CARVE:
+            return
+
+        y = event.y * 2 + 1
+        x = event.x * 2 + 1
+        dx, dy = self.sol_mov[
+            {1: "N", 2: "E", 4: "S", 8: "W"}.get(event.side, "N")
+        ]
+        wall_y, wall_x = y + dy, x + dx
+
+        changed = [
+            (y, x),
+            (wall_y + dy, wall_x + dx),
+            (wall_y, wall_x),
+            (wall_y + dx, wall_x + dy),
+            (wall_y - dx, wall_x - dy),
+        ]
+        output = [
+            f"\033[{grid_y - self.view_y + 1};"
+            f"{(grid_x - self.view_x) * 2 + 1}H"
+            f"{self.square(grid_y, grid_x)}"
+            for grid_y, grid_x in changed
+            if (0 <= grid_y - self.view_y < self.view_height
+                and 0 <= grid_x - self.view_x < self.view_width)
+        ]
+        sys.stdout.write("".join(output))
+        sys.stdout.flush()
+
+    def end_drawing(self) -> None:
+        """Move the cursor below the maze after incremental drawing."""
+        sys.stdout.write(f"\033[{self.view_height + 1};1H")
+        sys.stdout.flush()
+
+    def invalidate(self) -> None:
+        """Drop the cached maze layer after the walls changed."""
+        self.layer = []
+        self.layer_rows = []
+
+    def static_layer(self) -> list[list[str]]:
+        """Get the maze grid without the solution path.
+
+        Built once per maze and wall color, then reused by every frame.
+        Call ``invalidate`` when the walls change.
+
+        Returns:
+            2D list of grid squares. Must not be modified.
+        """
+        if self.layer and self.layer_color == self.color_index:
+            return self.layer
+
+        colored_wall = (
+            f"{self.wall_colors[self.color_index].value}"
+            f"{Presets.WALL.value}{Presets.RESET.value}"
+        )
+        grid: list[list[str]] = [
+            [Presets.PATH.value for _ in range(self.grid_width)]
+            for _ in range(self.grid_height)
+        ]
+
+        for row in range(self.height):
+            for col in range(self.width):
+                cell = self.cells[row * self.width + col].direction.value
+                y = row * 2 + 1
+                x = col * 2 + 1
+
+                for bit, wall_y, wall_x, corner_y, corner_x in self.walls:
+                    if cell & bit:
+                        grid[y + wall_y][x + wall_x] = colored_wall
+                        grid[y + corner_y][x + corner_x] = colored_wall
+
+                # Fully closed cell (42 pattern)
+                if cell == 15:
+                    grid[y][x] = (
+                        f"{Presets.GREEN.value}"
                         f"{Presets.WALL.value}"
                         f"{Presets.RESET.value}"
                     )
 
-                    # Cell unit
-                    sol_y += step_y
-                    sol_x += step_x
-                    if not (sol_y == self.exit_y and sol_x == self.exit_x):
-                        grid[sol_y][sol_x] = (
-                            f"{Presets.BLUE.value}"
-                            f"{Presets.WALL.value}"
-                            f"{Presets.RESET.value}"
-                        )
-
-                    # Animate only if the first time and not skipped
-                    if not self.path_animated and not skip_animation:
-                        self.draw_grid(grid)
-                        time.sleep(0.05)
-
-                        if self.check_skip():
-                            skip_animation = True
-
-                if not self.path_animated:
-                    self.path_animated = True
-
-                    if skip_animation:
-                        self.draw_grid(grid)
-                    return
-
-            # Draw maze
-            self.draw_grid(grid)
+        # Entry and exit markers
+        grid[self.entry_y][self.entry_x] = (
+            f"{Presets.MAGENTA.value}"
+            f"{Presets.WALL.value}"
+            f"{Presets.RESET.value}"
+        )
+        grid[self.exit_y][self.exit_x] = (
+            f"{Presets.RED.value}"
+            f"{Presets.WALL.value}"
+            f"{Presets.RESET.value}"
+        )
+
+        self.layer = grid
+        self.layer_rows = ["".join(row) for row in grid]
+        self.layer_color = self.color_index
+        return self.layer
+
+    def compose(self) -> list[str]:
+        """Get the rows to print: the maze layer with the path on top.
+
+        Only the rows crossed by the solution path are rebuilt.
+        """
+        layer = self.static_layer()
+        rows = list(self.layer_rows)
+        if self.show_path:
+            blue = (
+                f"{Presets.BLUE.value}{Presets.WALL.value}"
+                f"{Presets.RESET.value}"
+            )
+            changed: dict[int, list[str]] = {}
+            for grid_y, grid_x in self.path_grid:
+                if grid_y not in changed:
+                    changed[grid_y] = list(layer[grid_y])
+                changed[grid_y][grid_x] = blue
+            for grid_y, row in changed.items():
+                rows[grid_y] = "".join(row)
+        return rows
+
+    def animate_path(self) -> None:
+        """Draw the solution path over the maze on screen, step by step.
+
+        Each frame only writes the two squares added by the step. Enter
+        skips to the end.
+        """
+        blue = (
+            f"{Presets.BLUE.value}{Presets.WALL.value}{Presets.RESET.value}"
+        )
+        squares = [
+            f"\033[{grid_y + 1};{grid_x * 2 + 1}H{blue}"
+            for grid_y, grid_x in self.path_grid
+        ]
+        for step in range(0, len(squares), 2):
+            sys.stdout.write("".join(squares[step:step + 2]))
+            sys.stdout.flush()
+            time.sleep(0.05)
+            if self.check_skip():
+                sys.stdout.write("".join(squares[step + 2:]))
+                break
+        sys.stdout.write(f"\033[{self.grid_height + 1};1H")
+        sys.stdout.flush()
+
+    def render_maze(self) -> None:
+        """Render maze to the terminal.
+
+        The first time the path is shown it is animated over the maze.
+        Mazes larger than the terminal are rendered through the
+        viewport, see ``render_view`` and ``browse``.
+        """
+        try:
+            if not self.check_terminal_size():
+                self.render_view()
+                self.path_animated = self.show_path
+                return
+
+            if self.show_path and not self.path_animated:
+                self.path_animated = True
+                self.static_layer()
+                print("\033c", end="")
+                print("\n".join(self.layer_rows))
+                self.animate_path()
+                return
+
+            print("\033c", end="")
+            print("\n".join(self.compose()))
 
         except Exception as e:
             print(f"Error while rendering: {e}")
@@ -0,0 +1,213 @@
+"""Parallel search for seeds producing mazes with given properties."""
+
+import argparse
+import os
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, NamedTuple
+
+from mazegen.canvas import Canvas
+from mazegen.config_parser import ConfigParser
+from mazegen.maze_generator import MazeGenerator
+from mazegen.stats import canvas_stats
+
+# Metric name -> (minimum, maximum), either bound may be None.
+Criteria = dict[str, tuple[int | None, int | None]]
+
+METRICS = (
+    "open_cells", "dead_ends", "junctions", "max_branching",
+    "diameter", "solution_length",
+)
+
+
+class SeedMatch(NamedTuple):
+    """A seed whose maze satisfies the search criteria."""
+    seed: int
+    metrics: dict[str, int]
+
+
+def maze_metrics(canvas: Canvas) -> dict[str, int]:
+    """Compute the search metrics of a generated maze.
+
+    Args:
+        canvas: Generated canvas.
+
+    Returns:
+        Integer statistics named in ``METRICS``.
+    """
+    stats = canvas_stats(canvas)
+    return {name: getattr(stats, name) for name in METRICS}
+
+
+def matches(metrics: dict[str, int], criteria: Criteria) -> bool:
+    """Check metrics against the criteria bounds (inclusive)."""
+    for name, (low, high) in criteria.items():
+        value = metrics[name]
+        if low is not None and value < low:
+            return False
+        if high is not None and value > high:
+            return False
+    return True
+
+
+def evaluate_seeds(
+        config: dict[str, Any],
+        seeds: range,
+        criteria: Criteria
+) -> list[SeedMatch]:
+    """Generate a maze per seed and keep the matching ones.
+
+    Runs inside a worker process.
+
+    Args:
+        config: Validated configuration; its SEED is replaced.
+        seeds: Seeds to try.
+        criteria: Bounds the metrics must satisfy.
+
+    Returns:
+        Matching seeds in increasing order.
+    """
+    found: list[SeedMatch] = []
+    generator = MazeGenerator(config=dict(config, SEED=seeds.start))
+    generator.set_canvas()
+
+    for seed in seeds:
+        generator.seed = seed
+        generator.regenerate_maze()
+        metrics = maze_metrics(generator.canvas)
+        if matches(metrics, criteria):
+            found.append(SeedMatch(seed, metrics))
+
+    return found
+
+
+def search_seeds(
+        config: dict[str, Any],
+        criteria: Criteria,
+        count: int = 1,
+        start: int = 0,
+        limit: int = 10000,
+        workers: int | None = None,
+        chunk_size: int = 32
+) -> list[SeedMatch]:
+    """Find seeds whose mazes satisfy the criteria.
+
+    Seeds ``start`` to ``start + limit - 1`` are split into chunks and
+    evaluated on a process pool. The result is the first ``count``
+    matching seeds in seed order, independent of the number of workers,
+    and the search stops as soon as they are known. ``CHECKPOINT`` is
+    ignored: the workers would share one file.
+
+    Args:
+        config: Validated configuration.
+        criteria: Bounds per metric name (see ``METRICS``).
+        count: Number of matching seeds to find.
+        start: First seed to try.
+        limit: Maximum number of seeds to try.
+        workers: Worker processes; 1 runs in the current process.
+        chunk_size: Seeds per task.
+
+    Returns:
+        Up to ``count`` matches, ordered by seed.
+
+    Raises:
+        ValueError: If a criteria name is unknown or the configuration
+            cannot produce a maze.
+    """
+    unknown = set(criteria) - set(METRICS)
+    if unknown:
+        raise ValueError(f"Unknown metrics: {', '.join(sorted(unknown))}")
+
+    config = dict(config, CHECKPOINT=None)
+    # Surface configuration problems once instead of in every worker.
+    MazeGenerator(config=config).set_canvas()
+
+    chunks = [
+        range(first, min(first + chunk_size, start + limit))
+        for first in range(start, start + limit, chunk_size)
+    ]
+
+    if workers == 1:
+        found: list[SeedMatch] = []
+        for chunk in chunks:
+            found += evaluate_seeds(config, chunk, criteria)
+            if len(found) >= count:
+                break
+        return found[:count]
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    in_flight = 2 * (workers or os.cpu_count() or 1)
+    futures: list[Future[list[SeedMatch]]] = []
+    found = []
+    try:
+        # Consume chunk results in order so the answer does not depend
+        # on which worker finishes first.
+        for index in range(len(chunks)):
+            while (next_chunk := len(futures)) < min(
+                    len(chunks), index + in_flight):
+                futures.append(executor.submit(
+                    evaluate_seeds, config, chunks[next_chunk], criteria
+                ))
+            found += futures[index].result()
+            if len(found) >= count:
+                break
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+    return found[:count]
+
+
+def parse_criteria(args: argparse.Namespace) -> Criteria:
+    """Build criteria from the command line bounds."""
+    criteria: Criteria = {}
+    for name in METRICS:
+        low = getattr(args, f"min_{name}")
+        high = getattr(args, f"max_{name}")
+        if low is not None or high is not None:
+            criteria[name] = (low, high)
+    return criteria
+
+
+def main() -> None:
+    """Parse command line arguments and print matching seeds."""
+    parser = argparse.ArgumentParser(
+        description="Search seeds for mazes with given properties"
+    )
+    parser.add_argument("config_file", help="maze configuration file")
+    parser.add_argument("--count", type=int, default=1,
+                        help="number of seeds to find")
+    parser.add_argument("--start", type=int, default=0,
+                        help="first seed to try")
+    parser.add_argument("--limit", type=int, default=10000,
+                        help="maximum number of seeds to try")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    for name in METRICS:
+        option = name.replace("_", "-")
+        parser.add_argument(f"--min-{option}", type=int, default=None)
+        parser.add_argument(f"--max-{option}", type=int, default=None)
+    args = parser.parse_args()
+
+    config = ConfigParser().parse_config(args.config_file)
+    if not config:
+        print("Failed to load configuration. Exiting.")
+        sys.exit(1)
+
+    try:
+        found = search_seeds(
+            config, parse_criteria(args), args.count, args.start,
+            args.limit, args.workers
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if not found:
+        print("No matching seed found.")
+    for seed, metrics in found:
+        values = " ".join(f"{name}={value}" for name, value in metrics.items())
+        print(f"SEED={seed} {values}")
+
+
+if __name__ == "__main__":
+    main()
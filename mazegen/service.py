@@ -0,0 +1,336 @@
+"""Asyncio front end for generating and solving mazes.
+
+Requests and responses are JSON objects, sent one per line over a Unix
+socket or passed directly to ``MazeService.handle``.
+
+Generate request::
+
+    {"id": 1, "op": "generate", "format": "hex",
+     "config": {"WIDTH": 20, "HEIGHT": 15, "ENTRY": "0,0",
+                "EXIT": "19,14", "PERFECT": true, "SEED": 42}}
+
+Solve request (``maze`` holds ``fill_output`` formatted text)::
+
+    {"id": 2, "op": "solve", "maze": "F9B3...\\n...\\n\\n0, 0\\n19, 14\\n"}
+
+Responses carry the request ``id`` and ``"ok": true`` with the result,
+or ``"ok": false`` with an ``error`` message.
+
+Keys that make the server touch files (``LOCAL_KEYS``) are refused:
+they belong to trusted local configurations only.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any
+
+from mazegen.config_parser import ConfigParser, to_raw_config
+from mazegen.maze_generator import MazeGenerator
+from mazegen.maze_io import from_hex, pack_walls, to_hex
+from mazegen.solver import solve
+
+FORMATS = ("hex", "binary")
+
+# Config keys naming files on the server, refused in requests: a
+# stencil would let clients read any file the server can.
+LOCAL_KEYS = frozenset({
+    "CHECKPOINT", "CHECKPOINT_EVERY", "OUTPUT_FILE", "STENCIL"
+})
+
+# Largest maze a request may ask for, in cells, unless configured.
+DEFAULT_MAX_CELLS = 4_000_000
+
+
+def generate_job(config: dict[str, Any], fmt: str) -> dict[str, Any]:
+    """Generate and solve a maze. Runs inside a worker process.
+
+    Args:
+        config: Validated configuration.
+        fmt: Output format, 'hex' or 'binary'.
+
+    Returns:
+        Response payload with the encoded maze and its solution.
+    """
+    generator = MazeGenerator(config=config)
+    generator.set_canvas()
+    generator.generate_maze()
+    generator.solve_maze()
+    canvas = generator.canvas
+
+    result: dict[str, Any] = {
+        "width": canvas.width,
+        "height": canvas.height,
+        "entry": list(canvas.entry),
+        "exit": list(canvas.exit),
+        "solution": canvas.solution,
+        "format": fmt,
+    }
+    if fmt == "binary":
+        result["maze"] = base64.b64encode(pack_walls(canvas)).decode()
+    else:
+        result["maze"] = to_hex(canvas)
+    return result
+
+
+def solve_job(maze: str) -> dict[str, Any]:
+    """Solve a maze given in the hex output format.
+
+    Args:
+        maze: Text written by ``fill_output``.
+
+    Returns:
+        Response payload with the solution.
+    """
+    return {"solution": solve(from_hex(maze))}
+
+
+class MazeService:
+    """Runs maze requests on a bounded process pool."""
+
+    def __init__(
+            self,
+            max_workers: int | None = None,
+            max_pending: int = 64,
+            executor: Executor | None = None,
+            max_cells: int = DEFAULT_MAX_CELLS
+    ) -> None:
+        """Initialize the service.
+
+        Args:
+            max_workers: Size of the worker process pool.
+            max_pending: Maximum number of requests in flight. Further
+                requests wait for a free slot, and socket clients stop
+                being read until one frees up.
+            executor: Executor to run jobs on instead of a new process
+                pool. It is not shut down by ``close``.
+            max_cells: Largest maze a generate request may ask for, in
+                cells; larger requests are refused before reaching a
+                worker.
+        """
+        self.max_pending = max_pending
+        self.max_cells = max_cells
+        self.owns_executor = executor is None
+        # Workers are spawned rather than forked so they do not inherit
+        # client sockets accepted before they were started.
+        self.executor: Executor = executor or ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        self.slots = asyncio.Semaphore(max_pending)
+
+    async def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Process a single request.
+
+        Args:
+            request: Decoded request object.
+
+        Returns:
+            Response object.
+        """
+        async with self.slots:
+            return await self.dispatch(request)
+
+    async def dispatch(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Validate a request and run it on the executor.
+
+        Must be called while holding a slot.
+
+        Args:
+            request: Decoded request object.
+
+        Returns:
+            Response object.
+        """
+        response: dict[str, Any] = {"id": request.get("id")}
+        loop = asyncio.get_running_loop()
+        try:
+            op = request.get("op")
+            if op == "generate":
+                fmt = request.get("format", "hex")
+                if fmt not in FORMATS:
+                    raise ValueError(f"Unknown format '{fmt}'")
+                raw = to_raw_config(request.get("config", {}))
+                refused = sorted(LOCAL_KEYS & raw.keys())
+                if refused:
+                    raise ValueError(
+                        f"Keys not accepted by the service: "
+                        f"{', '.join(refused)}"
+                    )
+                config = ConfigParser().validate(raw)
+                cells = config["WIDTH"] * config["HEIGHT"]
+                if cells > self.max_cells:
+                    raise ValueError(
+                        f"Maze of {cells} cells exceeds the limit of "
+                        f"{self.max_cells}"
+                    )
+                result = await loop.run_in_executor(
+                    self.executor, generate_job, config, fmt
+                )
+            elif op == "solve":
+                maze = request.get("maze")
+                if not isinstance(maze, str):
+                    raise ValueError("'maze' must be a string")
+                result = await loop.run_in_executor(
+                    self.executor, solve_job, maze
+                )
+            else:
+                raise ValueError(f"Unknown op '{op}'")
+        except Exception as e:
+            response.update(ok=False, error=str(e))
+            return response
+
+        response.update(ok=True, **result)
+        return response
+
+    async def serve_client(
+            self,
+            reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve JSON Lines requests from one connection.
+
+        Requests from a connection run concurrently and responses are
+        written as they complete, so clients should match them by ``id``.
+
+        Args:
+            reader: Connection reader.
+            writer: Connection writer.
+        """
+        write_lock = asyncio.Lock()
+        tasks: set[asyncio.Task[None]] = set()
+
+        async def run(request: dict[str, Any]) -> None:
+            try:
+                response = await self.dispatch(request)
+            finally:
+                self.slots.release()
+            async with write_lock:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            while True:
+                await self.slots.acquire()
+                try:
+                    line = await reader.readline()
+                except BaseException:
+                    self.slots.release()
+                    raise
+                if not line:
+                    self.slots.release()
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("Request must be a JSON object")
+                except ValueError as e:
+                    self.slots.release()
+                    async with write_lock:
+                        writer.write(json.dumps(
+                            {"id": None, "ok": False, "error": str(e)}
+                        ).encode() + b"\n")
+                    continue
+                task = asyncio.create_task(run(request))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+
+    async def serve_unix(self, path: str) -> asyncio.AbstractServer:
+        """Start listening on a Unix socket.
+
+        Args:
+            path: Socket file path.
+
+        Returns:
+            The running server.
+        """
+        return await asyncio.start_unix_server(self.serve_client, path)
+
+    def close(self) -> None:
+        """Shut down the worker pool if the service created it."""
+        if self.owns_executor:
+            self.executor.shutdown()
+
+
+async def request_unix(
+        path: str,
+        requests: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Send requests to a running service and collect the responses.
+
+    Args:
+        path: Socket file path of the service.
+        requests: Request objects to send.
+
+    Returns:
+        Responses in arrival order.
+    """
+    reader, writer = await asyncio.open_unix_connection(path)
+    try:
+        for request in requests:
+            writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        responses = []
+        for _ in requests:
+            responses.append(json.loads(await reader.readline()))
+        return responses
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def serve(
+        path: str,
+        max_workers: int | None,
+        max_pending: int,
+        max_cells: int = DEFAULT_MAX_CELLS
+) -> None:
+    """Run the service on a Unix socket until cancelled.
+
+    Args:
+        path: Socket file path.
+        max_workers: Size of the worker process pool.
+        max_pending: Maximum number of requests in flight.
+        max_cells: Largest maze a request may ask for, in cells.
+    """
+    service = MazeService(max_workers, max_pending, max_cells=max_cells)
+    try:
+        server = await service.serve_unix(path)
+        print(f"Serving mazes on {path}")
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main() -> None:
+    """Parse command line arguments and run the service."""
+    parser = argparse.ArgumentParser(description="Maze generation service")
+    parser.add_argument("--socket", default="mazegen.sock",
+                        help="Unix socket path")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--max-pending", type=int, default=64,
+                        help="maximum requests in flight")
+    parser.add_argument("--max-cells", type=int, default=DEFAULT_MAX_CELLS,
+                        help="largest maze a request may ask for, in cells "
+                             f"(default: {DEFAULT_MAX_CELLS})")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(
+            args.socket, args.workers, args.max_pending, args.max_cells
+        ))
+    except KeyboardInterrupt:
+        print("\nBye!")
+
+
+if __name__ == "__main__":
+    main()
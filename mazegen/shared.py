@@ -0,0 +1,280 @@
+"""Maze storage shared between processes through a memory-mapped file.
+
+One process writes the wall grid of a generated maze to a file, any
+number of processes map it and query it without copying or building
+cell objects. Put the file on a memory file system (e.g. ``/dev/shm``)
+to keep it off the disk.
+
+File layout: a little-endian header (magic, version, width, height,
+entry and exit coordinates) followed by one wall byte per cell in
+row-major order.
+"""
+
+import mmap
+import os
+import struct
+import threading
+from types import TracebackType
+
+from mazegen import accel
+from mazegen.canvas import Canvas
+from mazegen.cell import Cell
+from mazegen.direction import Direction
+from mazegen.mask import Mask
+
+MAGIC = b"MZGD"
+VERSION = 1
+HEADER = struct.Struct("<4sHIIIIII")
+
+DIRECTIONS = list(Direction)
+
+
+class SharedCell(Cell):
+    """A cell whose walls live in a shared wall grid.
+
+    Reading or setting ``direction`` goes straight to the grid, so all
+    processes mapping the same file see the same walls. ``is_visited``
+    stays local to the process.
+    """
+
+    def __init__(self, walls: memoryview, x: int, y: int, width: int) -> None:
+        """Initialize a view on one cell of the grid.
+
+        Args:
+            walls: Wall grid, one byte per cell.
+            x: X coordinate of the cell.
+            y: Y coordinate of the cell.
+            width: Width of the grid in cells.
+        """
+        self.walls = walls
+        self.index = y * width + x
+        self.coordinate = (x, y)
+        self.is_visited = False
+
+    @property
+    def direction(self) -> Direction:
+        """Wall configuration of the cell."""
+        return DIRECTIONS[self.walls[self.index]]
+
+    @direction.setter
+    def direction(self, value: Direction) -> None:
+        self.walls[self.index] = value.value
+
+
+class SharedCanvas(Canvas):
+    """A canvas whose wall grid is a memory-mapped file.
+
+    Cells are not materialized: ``get_cell`` creates a ``SharedCell``
+    view on first access, and reading ``cells`` raises ``TypeError``
+    rather than listing every cell. The grid itself is available without
+    copying as the ``walls`` memoryview; ``wall_grid`` copies it.
+    """
+
+    def __init__(self, path: str, writable: bool = False) -> None:
+        """Map a file written by ``save_shared`` or ``create``.
+
+        Args:
+            path: Path to the shared maze file.
+            writable: Map the file for writing; otherwise the walls are
+                read-only.
+
+        Raises:
+            ValueError: If the file is not a shared maze file.
+        """
+        with open(path, "r+b" if writable else "rb") as file:
+            self.map = mmap.mmap(
+                file.fileno(), 0,
+                access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+            )
+
+        if len(self.map) < HEADER.size:
+            self.map.close()
+            raise ValueError("Shared maze file is truncated")
+        (magic, version, width, height,
+         entry_x, entry_y, exit_x, exit_y) = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            self.map.close()
+            raise ValueError("Not a shared maze file")
+        if len(self.map) != HEADER.size + width * height:
+            self.map.close()
+            raise ValueError("Shared maze file is truncated")
+
+        self.width = width
+        self.height = height
+        self.entry = (entry_x, entry_y)
+        self.exit = (exit_x, exit_y)
+        self.mask = Mask(width, height)
+        self.dead_ends = []
+        self.solution = ""
+        self.walls = memoryview(self.map)[HEADER.size:]
+        self.views: dict[int, SharedCell] = {}
+
+    @classmethod
+    def create(
+            cls,
+            path: str,
+            width: int,
+            height: int,
+            entry: tuple[int, int],
+            exit: tuple[int, int]
+    ) -> "SharedCanvas":
+        """Create a shared maze file with all walls closed and map it.
+
+        Args:
+            path: Destination path.
+            width: Width of the maze in cells.
+            height: Height of the maze in cells.
+            entry: Entry coordinates (x, y).
+            exit: Exit coordinates (x, y).
+
+        Returns:
+            Writable canvas on the new file.
+        """
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, width, height,
+                                   *entry, *exit))
+            file.write(bytes([Direction.CLOSED.value]) * (width * height))
+        return cls(path, writable=True)
+
+    def close(self) -> None:
+        """Unmap the file. The canvas must not be used afterwards."""
+        self.views.clear()
+        self.walls.release()
+        self.map.close()
+
+    def __enter__(self) -> "SharedCanvas":
+        """Return the canvas for use in a ``with`` block."""
+        return self
+
+    def __exit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc: BaseException | None,
+            traceback: TracebackType | None
+    ) -> None:
+        """Unmap the file when leaving a ``with`` block."""
+        self.close()
+
+    @property
+    def cells(self) -> list[Cell]:  # type: ignore[override]
+        """Not available: a shared canvas has no list of cells.
+
+        Raises:
+            TypeError: Always; use ``get_cell``, ``walls`` or
+                ``wall_grid`` instead.
+        """
+        raise TypeError(
+            "SharedCanvas has no cell list; use get_cell, walls or "
+            "wall_grid"
+        )
+
+    @property
+    def ft_cells(self) -> tuple[Cell, ...]:
+        """Views on the blocked cells, in row-major order."""
+        return tuple(self.view(index) for index in self.mask)
+
+    def block(self, cell: Cell) -> None:
+        """Reserve a cell: it stays closed and is never visited.
+
+        Args:
+            cell: Cell of this canvas.
+        """
+        x, y = cell.coordinate
+        self.mask.add(y * self.width + x)
+        self.view(y * self.width + x).is_visited = True
+
+    def view(self, index: int) -> SharedCell:
+        """Get the view on the cell at a row-major index.
+
+        Args:
+            index: Index of a cell of the canvas.
+
+        Returns:
+            The same ``SharedCell`` on every call.
+        """
+        view = self.views.get(index)
+        if view is None:
+            view = SharedCell(
+                self.walls, index % self.width, index // self.width,
+                self.width
+            )
+            self.views[index] = view
+        return view
+
+    def get_cell(self, x: int, y: int) -> Cell | None:
+        """Get a view on the cell at coordinates.
+
+        Args:
+            x: X coordinate.
+            y: Y coordinate.
+
+        Returns:
+            The same ``SharedCell`` on every call, or None if outside
+            the canvas.
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        return self.view(y * self.width + x)
+
+    def reset(self) -> None:
+        """Close every wall and clear the local visited flags.
+
+        Cells blocked in ``mask`` stay reserved and visited.
+        """
+        self.walls[:] = bytes([Direction.CLOSED.value]) * len(self.walls)
+        for view in self.views.values():
+            view.is_visited = False
+        for index in self.mask:
+            self.view(index).is_visited = True
+        self.dead_ends.clear()
+        self.solution = ""
+
+    def wall_grid(self) -> bytearray:
+        """Get a copy of the wall grid; ``walls`` avoids the copy."""
+        return bytearray(self.walls)
+
+    def set_walls(self, walls: bytes | bytearray) -> None:
+        """Write a packed wall grid into the shared file.
+
+        Args:
+            walls: One byte per cell in row-major order.
+
+        Raises:
+            ValueError: If the grid size does not match the canvas.
+        """
+        if len(walls) != len(self.walls):
+            raise ValueError("Wall grid size does not match the canvas")
+        self.walls[:] = walls
+
+    def solve(self) -> str:
+        """Find the shortest path from entry to exit on the shared grid.
+
+        Returns:
+            Path as a string of directions (N, E, S, W), or an empty
+            string if the exit cannot be reached.
+        """
+        return accel.solve_grid(
+            self.walls, self.width,
+            self.entry[1] * self.width + self.entry[0],
+            self.exit[1] * self.width + self.exit[0]
+        )
+
+
+def save_shared(canvas: Canvas, path: str) -> None:
+    """Write the walls of a canvas to a shared maze file.
+
+    The file is written under a temporary name and renamed, so readers
+    never map a partially written maze.
+
+    Args:
+        canvas: Generated canvas.
+        path: Destination path.
+    """
+    temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(HEADER.pack(
+            MAGIC, VERSION, canvas.width, canvas.height,
+            *canvas.entry, *canvas.exit
+        ))
+        file.write(canvas.wall_grid())
+    os.replace(temporary, path)
@@ -0,0 +1,218 @@
+"""Breadth-first search solver for maze canvases."""
+
+from array import array
+from collections import deque
+
+from mazegen import accel
+from mazegen.canvas import Canvas
+from mazegen.cell import Cell
+
+
+def solve(canvas: Canvas) -> str:
+    """Find the shortest path from the canvas entry to its exit.
+
+    The solver keeps its own visited bookkeeping, so it does not touch
+    the ``is_visited`` flags of the cells. Unless ``accel.enabled`` is
+    cleared, the search runs on the packed wall grid, with the same
+    result.
+
+    Args:
+        canvas: The maze canvas to solve.
+
+    Returns:
+        Path as a string of directions (N, E, S, W), or an empty string
+        if the exit cannot be reached.
+    """
+    entry_cell = canvas.get_cell(canvas.entry[0], canvas.entry[1])
+    if not entry_cell:
+        return ""
+
+    if accel.enabled:
+        if not canvas.get_cell(canvas.exit[0], canvas.exit[1]):
+            return ""
+        return accel.solve_grid(
+            canvas.wall_grid(), canvas.width,
+            canvas.entry[1] * canvas.width + canvas.entry[0],
+            canvas.exit[1] * canvas.width + canvas.exit[0]
+        )
+
+    parents: dict[Cell, Cell | None] = {entry_cell: None}
+    queue = deque([entry_cell])
+
+    while queue:
+        cell = queue.popleft()
+
+        if cell.coordinate == canvas.exit:
+            return path_to_str(parents, cell)
+
+        for neighbour in canvas.get_accessible_neighbours(cell):
+            if neighbour not in parents:
+                parents[neighbour] = cell
+                queue.append(neighbour)
+
+    return ""
+
+
+def path_to_str(parents: dict[Cell, Cell | None], cell: Cell) -> str:
+    """Walk parent links back to the start and encode the path.
+
+    Args:
+        parents: Mapping of each reached cell to the cell it came from.
+        cell: Last cell of the path.
+
+    Returns:
+        String of directions (N, E, S, W) from the start to ``cell``.
+    """
+    dir_map = {
+        (0, -1): "N",
+        (0,  1): "S",
+        (-1, 0): "W",
+        (1,  0): "E",
+    }
+    directions: list[str] = []
+    parent = parents[cell]
+
+    while parent:
+        dx = cell.coordinate[0] - parent.coordinate[0]
+        dy = cell.coordinate[1] - parent.coordinate[1]
+        directions.append(dir_map.get((dx, dy), ""))
+        cell, parent = parent, parents[parent]
+
+    return "".join(reversed(directions))
+
+
+def path_coordinates(
+        start: tuple[int, int],
+        solution: str
+) -> list[tuple[int, int]]:
+    """Turn a direction string into the cells it visits.
+
+    Computed once per solution, so renderers can draw the path without
+    re-parsing the string on every frame.
+
+    Args:
+        start: Coordinates (x, y) the path starts from.
+        solution: Path as a string of directions (N, E, S, W).
+
+    Returns:
+        Coordinates (x, y) of every cell on the path, ``start`` first.
+    """
+    moves = {"N": (0, -1), "E": (1, 0), "S": (0, 1), "W": (-1, 0)}
+    x, y = start
+    path = [start]
+    for step in solution:
+        dx, dy = moves[step]
+        x, y = x + dx, y + dy
+        path.append((x, y))
+    return path
+
+
+class DistanceField:
+    """Distances from the entry to every cell, from a single BFS.
+
+    Stores one distance (``array('I')``) and one predecessor
+    (``array('i')``) per cell, so the path to any cell is recovered in
+    time proportional to its length.
+    """
+
+    def __init__(
+            self,
+            width: int,
+            height: int,
+            entry: tuple[int, int],
+            distances: "array[int]",
+            parents: "array[int]"
+    ) -> None:
+        """Initialize the field.
+
+        Args:
+            width: Maze width in cells.
+            height: Maze height in cells.
+            entry: Entry coordinates (x, y).
+            distances: Steps from the entry per cell in row-major order,
+                ``accel.UNREACHABLE`` for unreachable cells.
+            parents: Predecessor index per cell, -1 if unreachable.
+        """
+        self.width = width
+        self.height = height
+        self.entry = entry
+        self.distances = distances
+        self.parents = parents
+
+    def distance(self, x: int, y: int) -> int | None:
+        """Get the number of steps from the entry to a cell.
+
+        Args:
+            x: X coordinate.
+            y: Y coordinate.
+
+        Returns:
+            The distance, or None if the cell is unreachable or outside
+            the maze.
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        distance = self.distances[y * self.width + x]
+        return None if distance == accel.UNREACHABLE else distance
+
+    def path_to(self, x: int, y: int) -> str:
+        """Get the shortest path from the entry to a cell.
+
+        Args:
+            x: X coordinate.
+            y: Y coordinate.
+
+        Returns:
+            Path as a string of directions (N, E, S, W), or an empty
+            string if the cell is unreachable or outside the maze.
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return ""
+        return accel.path_to(
+            self.parents, self.width,
+            self.entry[1] * self.width + self.entry[0],
+            y * self.width + x
+        )
+
+    def to_text(self) -> str:
+        """Encode the distances as text.
+
+        Returns:
+            One line per maze row with space separated distances, -1
+            for unreachable cells.
+        """
+        width = self.width
+        rows = (
+            " ".join(
+                "-1" if distance == accel.UNREACHABLE else str(distance)
+                for distance in self.distances[y * width:(y + 1) * width]
+            )
+            for y in range(self.height)
+        )
+        return "\n".join(rows) + "\n"
+
+
+def distance_field(canvas: Canvas) -> DistanceField:
+    """Run one BFS from the canvas entry over the whole maze.
+
+    Paths recovered from the field are the ones ``solve`` would return
+    for the same target.
+
+    Args:
+        canvas: The maze canvas.
+
+    Returns:
+        Distances and predecessors of every cell.
+
+    Raises:
+        ValueError: If the entry is outside the canvas.
+    """
+    if not canvas.get_cell(canvas.entry[0], canvas.entry[1]):
+        raise ValueError("Entry is outside the canvas")
+    distances, parents = accel.bfs_tree(
+        canvas.wall_grid(), canvas.width,
+        canvas.entry[1] * canvas.width + canvas.entry[0]
+    )
+    return DistanceField(
+        canvas.width, canvas.height, canvas.entry, distances, parents
+    )
@@ -0,0 +1,273 @@
+"""Maze statistics computed in linear time over the wall grid."""
+
+import sys
+from array import array
+from collections import deque
+from typing import NamedTuple, Sequence
+
+from mazegen.canvas import Canvas
+from mazegen.maze_io import read_hex
+
+
+class MazeStats(NamedTuple):
+    """Structural statistics of a maze.
+
+    Attributes:
+        width: Maze width in cells.
+        height: Maze height in cells.
+        open_cells: Cells with at least one opening.
+        dead_ends: Cells with exactly one opening.
+        junctions: Cells with three or more openings.
+        max_branching: Highest number of openings of a single cell.
+        corridor_lengths: Corridor length (in steps between two cells
+            that are not plain corridor cells) -> number of corridors.
+        diameter: Longest shortest path between two cells. Exact for
+            perfect mazes, a lower bound otherwise.
+        solution_length: Steps from entry to exit, 0 if unreachable.
+        solution_coverage: Share of open cells lying on the solution.
+        solution_detour: Solution length over the Manhattan distance
+            between entry and exit.
+    """
+    width: int
+    height: int
+    open_cells: int
+    dead_ends: int
+    junctions: int
+    max_branching: int
+    corridor_lengths: dict[int, int]
+    diameter: int
+    solution_length: int
+    solution_coverage: float
+    solution_detour: float
+
+
+def neighbours(
+        walls: Sequence[int],
+        width: int,
+        index: int
+) -> list[int]:
+    """Get the indexes of cells reachable from a cell in one step.
+
+    A passage needs the wall to be open on both sides.
+
+    Args:
+        walls: Wall values in row-major order.
+        width: Maze width in cells.
+        index: Row-major index of the cell.
+
+    Returns:
+        Indexes of the accessible neighbours, in N, E, S, W order.
+    """
+    value = walls[index]
+    result = []
+    if not value & 1 and index >= width and not walls[index - width] & 4:
+        result.append(index - width)
+    if (not value & 2 and (index + 1) % width
+            and not walls[index + 1] & 8):
+        result.append(index + 1)
+    if (not value & 4 and index + width < len(walls)
+            and not walls[index + width] & 1):
+        result.append(index + width)
+    if not value & 8 and index % width and not walls[index - 1] & 2:
+        result.append(index - 1)
+    return result
+
+
+def bfs(
+        walls: Sequence[int],
+        width: int,
+        start: int
+) -> tuple["array[int]", int]:
+    """Compute step distances from a start cell to every cell.
+
+    Args:
+        walls: Wall values in row-major order.
+        width: Maze width in cells.
+        start: Row-major index of the start cell.
+
+    Returns:
+        Distances (-1 for unreachable cells) and the index of a
+        farthest reachable cell.
+    """
+    distances = array("i", [-1]) * len(walls)
+    distances[start] = 0
+    queue = deque([start])
+    farthest = start
+
+    while queue:
+        index = queue.popleft()
+        farthest = index
+        step = distances[index] + 1
+        for neighbour in neighbours(walls, width, index):
+            if distances[neighbour] < 0:
+                distances[neighbour] = step
+                queue.append(neighbour)
+
+    return distances, farthest
+
+
+def corridor_lengths(
+        walls: Sequence[int],
+        width: int,
+        degrees: Sequence[int]
+) -> dict[int, int]:
+    """Measure corridors between cells that are not corridor cells.
+
+    A corridor cell has exactly two openings. Every corridor is walked
+    once from one of its ends, so the whole pass is linear. Loops made
+    only of corridor cells are reported with their cell count.
+
+    Args:
+        walls: Wall values in row-major order.
+        width: Maze width in cells.
+        degrees: Number of openings per cell.
+
+    Returns:
+        Corridor length -> number of corridors.
+    """
+    lengths: dict[int, int] = {}
+    walked = bytearray(len(walls))
+
+    for start, degree in enumerate(degrees):
+        if degree == 0 or degree == 2:
+            continue
+        for step in neighbours(walls, width, start):
+            if walked[step] or (degrees[step] != 2 and step < start):
+                continue
+            previous, current, length = start, step, 1
+            while degrees[current] == 2 and not walked[current]:
+                walked[current] = 1
+                following = [
+                    n for n in neighbours(walls, width, current)
+                    if n != previous
+                ]
+                previous, current = current, following[0]
+                length += 1
+            lengths[length] = lengths.get(length, 0) + 1
+
+    for start, degree in enumerate(degrees):
+        if degree == 2 and not walked[start]:
+            size = 0
+            stack = [start]
+            walked[start] = 1
+            while stack:
+                size += 1
+                for n in neighbours(walls, width, stack.pop()):
+                    if not walked[n]:
+                        walked[n] = 1
+                        stack.append(n)
+            lengths[size] = lengths.get(size, 0) + 1
+
+    return lengths
+
+
+def compute_stats(
+        walls: Sequence[int],
+        width: int,
+        height: int,
+        entry: tuple[int, int],
+        exit: tuple[int, int]
+) -> MazeStats:
+    """Compute maze statistics from a wall grid.
+
+    Uses one pass over the cells for degrees and corridors, a BFS from
+    the entry (solution length and farthest cell) and a second BFS from
+    that farthest cell for the diameter.
+
+    Args:
+        walls: Wall values in row-major order.
+        width: Maze width in cells.
+        height: Maze height in cells.
+        entry: Entry coordinates (x, y).
+        exit: Exit coordinates (x, y).
+
+    Returns:
+        The computed statistics.
+    """
+    degrees = bytearray(len(neighbours(walls, width, i))
+                        for i in range(len(walls)))
+    open_cells = sum(1 for degree in degrees if degree)
+
+    start = entry[1] * width + entry[0]
+    from_entry, farthest = bfs(walls, width, start)
+    from_farthest, _ = bfs(walls, width, farthest)
+
+    solution_length = max(from_entry[exit[1] * width + exit[0]], 0)
+    manhattan = abs(exit[0] - entry[0]) + abs(exit[1] - entry[1])
+
+    return MazeStats(
+        width=width,
+        height=height,
+        open_cells=open_cells,
+        dead_ends=degrees.count(1),
+        junctions=len(degrees) - sum(
+            degrees.count(d) for d in (0, 1, 2)
+        ),
+        max_branching=max(degrees, default=0),
+        corridor_lengths=corridor_lengths(walls, width, degrees),
+        diameter=max(from_farthest),
+        solution_length=solution_length,
+        solution_coverage=(
+            (solution_length + 1) / open_cells
+            if solution_length and open_cells else 0.0
+        ),
+        solution_detour=solution_length / manhattan if manhattan else 0.0,
+    )
+
+
+def canvas_stats(canvas: Canvas) -> MazeStats:
+    """Compute statistics of a live canvas.
+
+    Args:
+        canvas: Generated canvas.
+
+    Returns:
+        The computed statistics.
+    """
+    return compute_stats(
+        canvas.wall_grid(), canvas.width, canvas.height,
+        canvas.entry, canvas.exit
+    )
+
+
+def format_stats(stats: MazeStats) -> str:
+    """Render statistics as human readable lines.
+
+    Args:
+        stats: Statistics to render.
+
+    Returns:
+        One ``name: value`` line per statistic.
+    """
+    corridors = ", ".join(
+        f"{length}x{count}"
+        for length, count in sorted(stats.corridor_lengths.items())
+    )
+    return (
+        f"Size: {stats.width}x{stats.height}\n"
+        f"Open cells: {stats.open_cells}\n"
+        f"Dead ends: {stats.dead_ends}\n"
+        f"Junctions: {stats.junctions}\n"
+        f"Max branching: {stats.max_branching}\n"
+        f"Corridor lengths (length x count): {corridors}\n"
+        f"Diameter: {stats.diameter}\n"
+        f"Solution length: {stats.solution_length}\n"
+        f"Solution coverage: {stats.solution_coverage:.1%}\n"
+        f"Solution detour: {stats.solution_detour:.2f}"
+    )
+
+
+def main() -> None:
+    """Print statistics of a maze output file."""
+    if len(sys.argv) != 2:
+        print("Usage: python3 -m mazegen.stats <maze_output_file>")
+        sys.exit(1)
+    try:
+        print(format_stats(canvas_stats(read_hex(sys.argv[1]))))
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
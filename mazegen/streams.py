@@ -0,0 +1,182 @@
+"""Seed-stable random streams.
+
+Each generation phase, and each tile or row of a parallel generator,
+draws from its own stream. A stream only depends on the maze seed and
+its stream id, so changing the number of draws in one phase, or the
+order in which tiles are processed, leaves the other streams untouched.
+
+Stream ids are hashed together with the seed: ``random.Random`` seeds
+from a string through SHA-512, which is stable across platforms and
+Python versions.
+"""
+
+import random
+import sys
+from array import array
+
+# Stream ids of the generation phases.
+CARVE = "carve"
+BRAID = "braid"
+
+choice_checked: bool | None = None
+
+
+def stream_key(seed: int, *stream: str | int) -> str:
+    """Build the string a stream is seeded from.
+
+    Args:
+        seed: Maze seed.
+        stream: Stream id parts, e.g. ``(CARVE,)`` or ``("row", 12)``.
+
+    Returns:
+        The seed and the stream id joined with slashes.
+    """
+    return "/".join(["mazegen", str(seed), *map(str, stream)])
+
+
+def substream(seed: int | None, *stream: str | int) -> random.Random:
+    """Create the random generator of a stream.
+
+    Args:
+        seed: Maze seed, or None for a non-reproducible stream.
+        stream: Stream id parts.
+
+    Returns:
+        A generator seeded from the seed and the stream id.
+    """
+    if seed is None:
+        return random.Random()
+    return random.Random(stream_key(seed, *stream))
+
+
+def derive_seed(seed: int, *stream: str | int) -> int:
+    """Derive a 64-bit integer seed for a stream.
+
+    Useful to hand a stream to another process or library.
+
+    Args:
+        seed: Maze seed.
+        stream: Stream id parts.
+
+    Returns:
+        Seed in the range [0, 2**64).
+    """
+    return substream(seed, *stream).getrandbits(64)
+
+
+def draw_words(rng: random.Random, count: int) -> "array[int]":
+    """Draw 32-bit words from a generator in ``getrandbits(32)`` order.
+
+    Args:
+        rng: Random number generator to draw from.
+        count: Number of words.
+
+    Returns:
+        The words, the first drawn first.
+    """
+    words = array("I")
+    if count:
+        words.frombytes(rng.getrandbits(32 * count).to_bytes(
+            4 * count, "little"
+        ))
+        if sys.byteorder == "big":
+            words.byteswap()
+    return words
+
+
+def word_choice(words: "array[int]", used: int, size: int) -> tuple[int, int]:
+    """Pick an index like ``Random.choice`` does from pre-drawn words.
+
+    Args:
+        words: Words drawn with ``draw_words``.
+        used: Number of words already consumed.
+        size: Number of items to choose from, below 2**32.
+
+    Returns:
+        The chosen index and the new number of consumed words, or -1 as
+        index when the words run out.
+    """
+    shift = 32 - size.bit_length()
+    while used < len(words):
+        index = words[used] >> shift
+        used += 1
+        if index < size:
+            return index, used
+    return -1, used
+
+
+def choice_compatible() -> bool:
+    """Check that ``word_choice`` reproduces ``Random.choice``.
+
+    The emulation relies on how CPython maps raw bits to choices, so it
+    is verified once against the running interpreter.
+    """
+    global choice_checked
+    if choice_checked is None:
+        reference = random.Random(42)
+        words = draw_words(random.Random(42), 1000)
+        used = 0
+        compatible = True
+        for step in range(200):
+            size = step % 4 + 1
+            index, used = word_choice(words, used, size)
+            if index != reference.choice(range(size)):
+                compatible = False
+                break
+        # Set once the check is over: other threads may be reading it.
+        choice_checked = compatible
+    return choice_checked
+
+
+def draw_indices(rng: random.Random, size: int, count: int) -> "array[int]":
+    """Draw many random indices below ``size`` at once.
+
+    The result and the final generator state are the same as calling
+    ``rng.choice(range(size))`` ``count`` times, but the random bits are
+    drawn in blocks.
+
+    Args:
+        rng: Random number generator to draw from.
+        size: Number of items to choose from.
+        count: Number of indices.
+
+    Returns:
+        The indices, in draw order, as unsigned 32-bit integers.
+
+    Raises:
+        IndexError: If ``size`` is not positive and ``count`` is.
+        ValueError: If ``size`` is above ``2 ** 32``.
+    """
+    if count <= 0:
+        return array("I")
+    if size <= 0:
+        raise IndexError("Cannot choose from an empty sequence")
+    if size > 2 ** 32:
+        raise ValueError("Cannot draw indices of more than 2 ** 32 items")
+    if size == 2 ** 32 or not choice_compatible():
+        return array("I", (rng.choice(range(size)) for _ in range(count)))
+
+    bits = size.bit_length()
+    shift = 32 - bits
+    # Expected number of words, plus a margin, given the rejection rate.
+    budget = count * (1 << bits) // size * 21 // 20 + 16
+
+    state = rng.getstate()
+    values = [word >> shift for word in draw_words(rng, budget)]
+    accepted = [value for value in values if value < size]
+    while len(accepted) < count:
+        more = [word >> shift for word in draw_words(rng, budget // 4)]
+        values += more
+        accepted += [value for value in more if value < size]
+
+    # Give back the words drawn after the last index that is kept.
+    surplus = len(accepted) - count
+    used = len(values)
+    while surplus or values[used - 1] >= size:
+        if values[used - 1] < size:
+            surplus -= 1
+        used -= 1
+
+    rng.setstate(state)
+    draw_words(rng, used)
+    return array("I", accepted[:count])
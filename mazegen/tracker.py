@@ -0,0 +1,162 @@
+"""Keep the entry-to-exit solution up to date while walls are edited.
+
+A full BFS is only run when an edit can change the shortest path:
+
+- Closing a wall that the path does not cross cannot make the path
+  longer or any other path shorter, so nothing is done.
+- Opening a wall can only shorten the path by going through it. The
+  tracker keeps a lower bound of the distance of every cell from the
+  entry and to the exit, lowers it around the opened wall and searches
+  again only if the path through the wall could be shorter.
+
+Closing a wall on the path, or opening a possible shortcut, runs the
+search again and makes the bounds exact.
+"""
+
+from array import array
+from collections import deque
+
+from mazegen import accel
+from mazegen.braid import OPPOSITE, neighbour_index
+from mazegen.canvas import Canvas
+from mazegen.cell import Cell
+
+UNREACHABLE = accel.UNREACHABLE
+
+
+class SolutionTracker:
+    """Edits the walls of a canvas and maintains its solution.
+
+    Walls must be edited through the tracker; after changing the canvas
+    in another way, call ``search``.
+    """
+
+    def __init__(self, canvas: Canvas) -> None:
+        """Solve the canvas and start tracking it.
+
+        Args:
+            canvas: Canvas to edit. ``canvas.solution`` is kept up to
+                date.
+        """
+        self.canvas = canvas
+        self.width = canvas.width
+        self.size = canvas.width * canvas.height
+        self.entry = canvas.entry[1] * canvas.width + canvas.entry[0]
+        self.exit = canvas.exit[1] * canvas.width + canvas.exit[0]
+        self.searches = 0
+        self.search()
+
+    def search(self) -> None:
+        """Solve the canvas from scratch and reset the distance bounds."""
+        self.walls = self.canvas.wall_grid()
+        self.from_entry, parents = accel.bfs_tree(
+            self.walls, self.width, self.entry
+        )
+        self.to_exit, _ = accel.bfs_tree(self.walls, self.width, self.exit)
+        self.searches += 1
+
+        self.path: list[int] = []
+        if self.from_entry[self.exit] != UNREACHABLE:
+            cell = self.exit
+            while cell != self.entry:
+                self.path.append(cell)
+                cell = parents[cell]
+            self.path.append(self.entry)
+            self.path.reverse()
+        self.position = {cell: step for step, cell in enumerate(self.path)}
+        self.canvas.solution = accel.path_to(
+            parents, self.width, self.entry, self.exit
+        ) if self.path else ""
+
+    def on_path(self, first: int, second: int) -> bool:
+        """Check whether the path goes between two adjacent cells."""
+        step = self.position.get(first)
+        other = self.position.get(second)
+        return (step is not None and other is not None
+                and abs(step - other) == 1)
+
+    def open_wall(self, cell: Cell, side: int) -> bool:
+        """Open a wall and update the solution.
+
+        Args:
+            cell: The cell owning the wall.
+            side: Wall bit, 1 (N), 2 (E), 4 (S) or 8 (W).
+
+        Returns:
+            True if the wall was opened, see ``Canvas.open_wall``.
+        """
+        if not self.canvas.open_wall(cell, side):
+            return False
+        first = cell.coordinate[1] * self.width + cell.coordinate[0]
+        second = neighbour_index(first, side, self.width, self.size)
+        self.walls[first] &= ~side
+        self.walls[second] &= ~OPPOSITE[side]
+
+        self.lower(self.from_entry, first, second)
+        self.lower(self.to_exit, first, second)
+        through = min(
+            self.through(first, second), self.through(second, first)
+        )
+        if through < (len(self.path) - 1 if self.path else UNREACHABLE):
+            self.search()
+        return True
+
+    def close_wall(self, cell: Cell, side: int) -> bool:
+        """Close a wall and update the solution.
+
+        Args:
+            cell: The cell owning the wall.
+            side: Wall bit, 1 (N), 2 (E), 4 (S) or 8 (W).
+
+        Returns:
+            True if the wall was closed, see ``Canvas.close_wall``.
+        """
+        if not self.canvas.close_wall(cell, side):
+            return False
+        first = cell.coordinate[1] * self.width + cell.coordinate[0]
+        second = neighbour_index(first, side, self.width, self.size)
+        self.walls[first] |= side
+        self.walls[second] |= OPPOSITE[side]
+
+        # Distances can only grow: the bounds stay valid.
+        if self.on_path(first, second):
+            self.search()
+        return True
+
+    def through(self, first: int, second: int) -> int:
+        """Lower bound of the entry-exit path going from one cell to the
+        other, ``UNREACHABLE`` if either part is unreachable."""
+        before = self.from_entry[first]
+        after = self.to_exit[second]
+        if before == UNREACHABLE or after == UNREACHABLE:
+            return UNREACHABLE
+        return before + 1 + after
+
+    def lower(self, distances: "array[int]", first: int, second: int) -> None:
+        """Lower distance bounds after the wall between two cells opened.
+
+        Only the cells whose bound decreases are visited.
+
+        Args:
+            distances: Bounds to update in place.
+            first: Index of one cell of the wall.
+            second: Index of the other cell.
+        """
+        queue: deque[int] = deque()
+        for cell, neighbour in ((first, second), (second, first)):
+            if (distances[cell] != UNREACHABLE
+                    and distances[cell] + 1 < distances[neighbour]):
+                distances[neighbour] = distances[cell] + 1
+                queue.append(neighbour)
+
+        walls = self.walls
+        while queue:
+            cell = queue.popleft()
+            distance = distances[cell] + 1
+            for side in OPPOSITE:
+                if walls[cell] & side:
+                    continue
+                neighbour = neighbour_index(cell, side, self.width, self.size)
+                if neighbour >= 0 and distance < distances[neighbour]:
+                    distances[neighbour] = distance
+                    queue.append(neighbour)
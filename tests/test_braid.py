@@ -0,0 +1,51 @@
+"""Tests of dead-end braiding."""
+
+from typing import Any
+
+from mazegen.braid import dead_end_cells
+from mazegen.maze_generator import MazeGenerator
+from mazegen.stats import canvas_stats, neighbours
+
+CONFIG: dict[str, Any] = {
+    "WIDTH": 12, "HEIGHT": 9, "ENTRY": (0, 0), "EXIT": (11, 8),
+    "PERFECT": True, "BRAID": None, "SEED": 7, "ALGORITHM": "dfs",
+    "OUTPUT_FILE": None,
+}
+
+
+def generated(**options: Any) -> MazeGenerator:
+    """Generate a maze with configuration overrides."""
+    maze = MazeGenerator(config={**CONFIG, **options})
+    maze.set_canvas()
+    maze.generate_maze()
+    return maze
+
+
+def test_dead_end_cells() -> None:
+    walls = generated().canvas.wall_grid()
+    expected = [
+        index for index in range(len(walls))
+        if len(neighbours(walls, 12, index)) == 1
+    ]
+    assert list(dead_end_cells(walls)) == expected
+
+
+def test_braid_without_recorded_dead_ends() -> None:
+    maze = generated()
+    before = canvas_stats(maze.canvas).dead_ends
+    maze.canvas.dead_ends.clear()
+    maze.braid = 0.5
+    maze.remove_dend_walls()
+    after = canvas_stats(maze.canvas).dead_ends
+    assert before // 4 <= before - after <= before
+
+
+def test_small_imperfect_maze_is_braided() -> None:
+    for seed in range(20):
+        maze = generated(WIDTH=3, HEIGHT=3, EXIT=(2, 2), PERFECT=False,
+                         SEED=seed)
+        stats = canvas_stats(maze.canvas)
+        assert stats.open_cells == 9
+        walls = maze.canvas.wall_grid()
+        passages = sum(len(neighbours(walls, 3, i)) for i in range(9)) // 2
+        assert passages > 8
@@ -0,0 +1,16 @@
+"""Tests of blocked cells on a canvas."""
+
+import pytest
+
+from mazegen.canvas import Canvas
+
+
+def test_ft_cells_is_read_only() -> None:
+    canvas = Canvas(5, 4, (0, 0), (4, 3))
+    cell = canvas.cells[6]
+    canvas.block(cell)
+    assert canvas.ft_cells == (cell,)
+    with pytest.raises(AttributeError):
+        canvas.ft_cells.append(canvas.cells[7])  # type: ignore[attr-defined]
+    with pytest.raises(AttributeError):
+        canvas.ft_cells.remove(cell)  # type: ignore[attr-defined]
@@ -0,0 +1,59 @@
+"""Tests of checkpoint files shared by concurrent generations."""
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from mazegen.checkpoint import claim
+from mazegen.manifest import ManifestError, parse_manifest
+from mazegen.search import search_seeds
+
+CONFIG: dict[str, Any] = {
+    "WIDTH": 8, "HEIGHT": 6, "ENTRY": (0, 0), "EXIT": (7, 5),
+    "PERFECT": True, "BRAID": None, "SEED": 0, "ALGORITHM": "dfs",
+    "OUTPUT_FILE": None, "CHECKPOINT": None, "CHECKPOINT_EVERY": None,
+}
+CRITERIA: dict[str, tuple[int | None, int | None]] = {
+    "solution_length": (20, None),
+}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_search_ignores_checkpoint(tmp_path: Path, workers: int) -> None:
+    # A worker using the file would fail on it, or remove it.
+    path = tmp_path / "search.ckpt"
+    path.write_bytes(b"not a checkpoint")
+    expected = search_seeds(CONFIG, CRITERIA, count=5, limit=200,
+                            workers=1, chunk_size=8)
+    found = search_seeds(
+        dict(CONFIG, CHECKPOINT=str(path), CHECKPOINT_EVERY=5), CRITERIA,
+        count=5, limit=200, workers=workers, chunk_size=8
+    )
+    assert found == expected
+    assert len(found) == 5
+    assert path.read_bytes() == b"not a checkpoint"
+
+
+def test_claim_is_exclusive(tmp_path: Path) -> None:
+    path = str(tmp_path / "maze.ckpt")
+    with claim(path):
+        with pytest.raises(ValueError):
+            with claim(path):
+                pass
+    with claim(path):
+        pass
+
+
+def test_manifest_refuses_shared_checkpoint() -> None:
+    lines = [
+        "PERFECT=True", "CHECKPOINT=shared.ckpt", "OUTPUT_FILE={name}.txt",
+        "[a]", "WIDTH=5", "HEIGHT=5", "ENTRY=0,0", "EXIT=4,4",
+        "[b]", "WIDTH=5", "HEIGHT=5", "ENTRY=0,0", "EXIT=4,4",
+    ]
+    with pytest.raises(ManifestError) as error:
+        list(parse_manifest(lines))
+    assert error.value.name == "b"
+    assert error.value.line == 2
+    lines[1] = "CHECKPOINT={name}.ckpt"
+    assert [entry.name for entry in parse_manifest(lines)] == ["a", "b"]
@@ -0,0 +1,67 @@
+"""Tests of manifest parsing and validation errors."""
+
+import pickle
+
+import pytest
+
+from mazegen.config_parser import ConfigError
+from mazegen.manifest import ManifestError, parse_manifest
+
+SECTION = [
+    "PERFECT=True",
+    "OUTPUT_FILE=/tmp/{name}.txt",
+    "",
+    "[small]",
+    "WIDTH=10",
+    "HEIGHT=8",
+    "ENTRY=0,0",
+    "EXIT=9,7",
+]
+
+
+def error(lines: list[str]) -> ManifestError:
+    """Parse a manifest expected to be invalid."""
+    with pytest.raises(ManifestError) as raised:
+        list(parse_manifest(lines))
+    return raised.value
+
+
+def test_valid_section() -> None:
+    entries = list(parse_manifest(SECTION))
+    assert [entry.name for entry in entries] == ["small"]
+    assert entries[0].config["OUTPUT_FILE"] == "/tmp/small.txt"
+
+
+@pytest.mark.parametrize(
+    "line, value",
+    [(5, "WIDTH=x"), (6, "HEIGHT=0"), (8, "EXIT=99,7"), (1, "PERFECT=no")],
+)
+def test_error_at_key_line(line: int, value: str) -> None:
+    lines = list(SECTION)
+    lines[line - 1] = value
+    assert error(lines).line == line
+
+
+def test_missing_key_at_section_line() -> None:
+    assert error(SECTION[:-1]).line == 4
+
+
+def test_output_file_is_required() -> None:
+    raised = error(SECTION[:1] + SECTION[2:])
+    assert raised.line == 3
+    assert "OUTPUT_FILE" in raised.reason
+
+
+def test_output_file_is_required_in_json_lines() -> None:
+    line = ('{"WIDTH": 4, "HEIGHT": 4, "ENTRY": [0, 0], "EXIT": [3, 3], '
+            '"PERFECT": true}')
+    assert "OUTPUT_FILE" in error([line]).reason
+
+
+def test_keys_without_section() -> None:
+    assert error(SECTION[:2]).line == 1
+
+
+def test_config_error_keeps_key() -> None:
+    copy = pickle.loads(pickle.dumps(ConfigError("bad", "WIDTH")))
+    assert (str(copy), copy.key) == ("bad", "WIDTH")
@@ -0,0 +1,60 @@
+"""Tests of the maze service request handling."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
+
+from mazegen.service import MazeService
+
+CONFIG = {"WIDTH": 6, "HEIGHT": 5, "ENTRY": "0,0", "EXIT": "5,4",
+          "PERFECT": True, "SEED": 1}
+
+
+def handle(request: dict[str, Any], **options: Any) -> dict[str, Any]:
+    """Run one request on a service backed by a thread pool."""
+    with ThreadPoolExecutor(1) as executor:
+        service = MazeService(executor=executor, **options)
+        return asyncio.run(service.handle(request))
+
+
+def test_generate() -> None:
+    response = handle({"id": 1, "op": "generate", "config": CONFIG})
+    assert response["ok"], response
+    assert response["id"] == 1
+    assert response["solution"]
+
+
+@pytest.mark.parametrize(
+    "key, value",
+    [
+        ("CHECKPOINT", "/tmp/service-checkpoint.bin"),
+        ("CHECKPOINT_EVERY", 10),
+        ("OUTPUT_FILE", "/tmp/service-output.txt"),
+        ("checkpoint", "/tmp/service-checkpoint.bin"),
+        ("STENCIL", "/etc/passwd"),
+    ],
+)
+def test_file_keys_are_refused(key: str, value: Any) -> None:
+    response = handle({
+        "id": 2, "op": "generate", "config": {**CONFIG, key: value}
+    })
+    assert not response["ok"]
+    assert key.upper() in response["error"]
+
+
+def test_large_maze_is_refused() -> None:
+    response = handle({
+        "id": 3, "op": "generate",
+        "config": {**CONFIG, "WIDTH": 100000, "HEIGHT": 100000,
+                   "EXIT": "99999,99999"},
+    })
+    assert not response["ok"]
+    assert "exceeds the limit" in response["error"]
+
+
+def test_max_cells_is_configurable() -> None:
+    request = {"id": 4, "op": "generate", "config": CONFIG}
+    assert handle(request, max_cells=30)["ok"]
+    assert not handle(request, max_cells=29)["ok"]
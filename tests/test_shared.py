@@ -0,0 +1,57 @@
+"""Tests of canvases stored in a memory-mapped file."""
+
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from mazegen.maze_generator import MazeGenerator
+from mazegen.maze_io import pack_walls, to_hex
+from mazegen.shared import SharedCanvas, save_shared
+
+
+@pytest.fixture
+def maze() -> MazeGenerator:
+    maze = MazeGenerator(config={
+        "WIDTH": 11, "HEIGHT": 7, "ENTRY": (0, 0), "EXIT": (10, 6),
+        "PERFECT": False, "BRAID": None, "SEED": 5, "ALGORITHM": "dfs",
+        "OUTPUT_FILE": None,
+    })
+    maze.set_canvas()
+    maze.generate_maze()
+    maze.solve_maze()
+    return maze
+
+
+@pytest.fixture
+def shared(maze: MazeGenerator, tmp_path: Path) -> Iterator[SharedCanvas]:
+    path = str(tmp_path / "maze.bin")
+    save_shared(maze.canvas, path)
+    with SharedCanvas(path, writable=True) as canvas:
+        yield canvas
+
+
+def test_to_hex(maze: MazeGenerator, shared: SharedCanvas) -> None:
+    shared.solution = shared.solve()
+    assert to_hex(shared) == to_hex(maze.canvas)
+
+
+def test_pack_walls(maze: MazeGenerator, shared: SharedCanvas) -> None:
+    assert pack_walls(shared) == pack_walls(maze.canvas)
+    assert shared.wall_grid() == maze.canvas.wall_grid()
+
+
+def test_cells_is_not_available(shared: SharedCanvas) -> None:
+    with pytest.raises(TypeError):
+        shared.cells
+
+
+def test_block(shared: SharedCanvas) -> None:
+    cell = shared.get_cell(2, 3)
+    assert cell is not None
+    shared.block(cell)
+    assert shared.is_blocked(cell)
+    assert cell.is_visited
+    assert [view.coordinate for view in shared.ft_cells] == [(2, 3)]
+    shared.reset()
+    assert cell.is_visited